@@ -1,90 +1,142 @@
 #!/usr/bin/env python3
 """
-Fix movie IDs in scanner files.
+Fix and compile scanner files.
 
-This script converts ID formats in scanner files to the standard {tmdb-ID} format.
+This script converts ID formats in scanner files to the standard {tmdb-ID} format,
+removes duplicate entries and writes a compiled sidecar (<list>.compiled.db) that
+Scanly loads instead of re-parsing the text file.
 """
 
+import argparse
 import os
 import re
 import sys
 from pathlib import Path
 
-def fix_scanner_ids(scanner_file):
+# Make the src package importable when run from anywhere
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def fix_scanner_ids(scanner_file, sort_entries=False):
     """
-    Fix IDs in a scanner file to use {tmdb-ID} format.
-    
+    Fix IDs in a scanner file to use {tmdb-ID} format and remove duplicates.
+
     Args:
         scanner_file: Path to the scanner file
-    
+        sort_entries: Sort entries alphabetically. Off by default because the
+            first of several equally good matches wins, so file order matters.
+
     Returns:
-        Tuple of (number of entries processed, number of entries modified)
+        Tuple of (number of entries processed, number of entries modified, number of duplicates removed)
     """
     if not os.path.exists(scanner_file):
         print(f"Scanner file not found: {scanner_file}")
-        return 0, 0
-    
+        return 0, 0, 0
+
     try:
         with open(scanner_file, 'r', encoding='utf-8') as f:
             lines = f.readlines()
-        
+
         total_entries = len(lines)
         modified_count = 0
+        duplicate_count = 0
         corrected_lines = []
-        
+        seen = set()
+
         for line in lines:
             # Skip empty lines
             if not line.strip():
-                corrected_lines.append(line)
                 continue
-            
+
             # Replace different ID formats with {tmdb-ID}
             # Case 1: [movie:ID]
             modified_line = re.sub(r'\[movie:(\d+)\]', r'{tmdb-\1}', line)
-            
+
             # Case 2: [ID] (plain ID without prefix)
             modified_line = re.sub(r'\[(\d+)\](?!\])', r'{tmdb-\1}', modified_line)
-            
+
             if modified_line != line:
                 modified_count += 1
-                
-            corrected_lines.append(modified_line)
-        
+
+            # Keep only the first occurrence of each entry
+            entry = modified_line.strip()
+            if not entry.startswith('#'):
+                if entry in seen:
+                    duplicate_count += 1
+                    continue
+                seen.add(entry)
+
+            corrected_lines.append(entry + '\n')
+
+        if sort_entries:
+            comments = [line for line in corrected_lines if line.startswith('#')]
+            entries = sorted((line for line in corrected_lines if not line.startswith('#')),
+                             key=str.casefold)
+            corrected_lines = comments + entries
+
         # Write the modified content back to file
         with open(scanner_file, 'w', encoding='utf-8') as f:
             f.writelines(corrected_lines)
-        
-        return total_entries, modified_count
-    
+
+        return total_entries, modified_count, duplicate_count
+
     except Exception as e:
         print(f"Error fixing scanner IDs: {e}")
-        return 0, 0
+        return 0, 0, 0
+
+def compile_scanner_file(scanner_file):
+    """
+    Write the compiled sidecar for a scanner file.
+
+    Args:
+        scanner_file: Path to the scanner file
+
+    Returns:
+        Number of compiled entries, or None on failure
+    """
+    from src.utils.scanner_index import compile_scanner_list
+
+    try:
+        return compile_scanner_list(scanner_file)
+    except Exception as e:
+        print(f"Error compiling scanner file: {e}")
+        return None
 
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="Fix IDs, dedupe and compile Scanly scanner lists")
+    parser.add_argument("--sort", action="store_true", help="Sort entries alphabetically")
+    parser.add_argument("--no-compile", action="store_true", help="Don't write compiled sidecars")
+    args = parser.parse_args()
+
     # Use the current working directory to locate the scanners folder
     cwd = Path.cwd()
     scanner_dir = cwd / 'scanners'
-    
+
     # Fix scanner files
     scanner_files = [
         'movies.txt',
         'anime_movies.txt',
         'tv_series.txt',
-        'anime_series.txt'
+        'anime_series.txt',
+        'wrestling.txt'
     ]
-    
+
     print(f"Looking for scanner files in: {scanner_dir}")
-    
+
     for scanner_file in scanner_files:
         file_path = scanner_dir / scanner_file
         if file_path.exists():
             print(f"Processing {scanner_file}...")
-            total, fixed = fix_scanner_ids(str(file_path))
+            total, fixed, duplicates = fix_scanner_ids(str(file_path), sort_entries=args.sort)
             print(f"  - Total entries: {total}")
             print(f"  - Fixed entries: {fixed}")
+            print(f"  - Duplicates removed: {duplicates}")
+            if not args.no_compile:
+                compiled = compile_scanner_file(str(file_path))
+                if compiled is not None:
+                    print(f"  - Compiled entries: {compiled}")
         else:
             print(f"Scanner file not found: {file_path}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
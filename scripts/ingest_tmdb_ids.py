@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Ingest TMDB daily ID exports into Scanly's local ID index.
+
+Download the exports from https://developer.themoviedb.org/docs/daily-id-exports
+(movie_ids_MM_DD_YYYY.json.gz, tv_series_ids_MM_DD_YYYY.json.gz) and pass
+them to this script. Files are streamed, so they're never loaded into memory.
+Each file replaces the previously ingested entries of its media type.
+
+Usage:
+    python scripts/ingest_tmdb_ids.py movie_ids_05_15_2024.json.gz tv_series_ids_05_15_2024.json.gz
+    python scripts/ingest_tmdb_ids.py --type movie my_dump.json.gz
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.api.tmdb_index import MEDIA_TYPES, TMDB_INDEX_DB, TMDBIdIndex, media_type_for_dump
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('files', nargs='+', help='Export files (.json.gz or JSON lines)')
+    parser.add_argument('--type', choices=MEDIA_TYPES,
+                        help='Media type of the files (default: guessed from the file name)')
+    parser.add_argument('--db', default=TMDB_INDEX_DB, help='Index database path')
+    args = parser.parse_args()
+
+    index = TMDBIdIndex(args.db)
+    for path in args.files:
+        media_type = args.type or media_type_for_dump(path)
+        if media_type is None:
+            print(f"Can't tell whether {path} holds movies or TV shows, use --type")
+            return 1
+        start = time.perf_counter()
+        count = index.ingest(path, media_type)
+        print(f"{path}: {count} {media_type} entries in {time.perf_counter() - start:.1f}s")
+    print(f"Index {args.db}: {index.entries('movie')} movies, {index.entries('tv')} TV shows")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
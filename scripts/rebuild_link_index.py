@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Rebuild Scanly's destination link index from the links on disk.
+
+Run this after links in the destination were added, moved or deleted
+outside Scanly. Scanly keeps the index current for the links it creates
+itself, and builds it automatically the first time it's needed.
+
+Usage:
+    python scripts/rebuild_link_index.py
+    python scripts/rebuild_link_index.py /mnt/media/library
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.link_index import LINK_INDEX_DB, LinkIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('destination', nargs='?', default=os.environ.get('DESTINATION_DIRECTORY'),
+                        help='Destination library root (default: $DESTINATION_DIRECTORY)')
+    parser.add_argument('--db', default=LINK_INDEX_DB, help='Index database path')
+    args = parser.parse_args()
+
+    if not args.destination or not os.path.isdir(args.destination):
+        print(f"Destination directory not found: {args.destination!r}")
+        return 1
+    count = LinkIndex(args.db).rebuild(args.destination)
+    print(f"Indexed {count} symlinks under {args.destination} into {args.db}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
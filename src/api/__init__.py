@@ -2,6 +2,6 @@
 API clients for external services used by Scanly.
 """
 
-from .tmdb import TMDB
+from .tmdb import TMDB, get_tmdb
 
-__all__ = ['TMDB']
+__all__ = ['TMDB', 'get_tmdb']
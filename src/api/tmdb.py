@@ -2,31 +2,146 @@
 TMDB API client.
 
 This module provides functionality for interacting with The Movie Database API.
+Requests go through one pooled keep-alive session per client, and
+get_tmdb() returns a shared client so every caller reuses warm connections.
+Identical requests made at the same time from several threads are sent
+once and the response is shared. Every request sent to the network takes a
+token from the client's rate limiter, so all callers together (interactive
+menus, identification pools, the async client) stay within TMDB's quota.
 """
 
+import copy
+import os
+import threading
+import time
 import requests
-from typing import List, Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import List, Dict, Any, Optional, Sequence
 
 from src.config import TMDB_API_KEY, TMDB_BASE_URL
+from src.api.tmdb_cache import TMDBCache, cache_key, get_tmdb_cache
+from src.api.tmdb_index import TMDBIdIndex, get_tmdb_index
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Connection pool and retry settings
+TMDB_POOL_SIZE = int(os.environ.get('TMDB_POOL_SIZE', '10'))
+TMDB_MAX_RETRIES = int(os.environ.get('TMDB_MAX_RETRIES', '3'))
+TMDB_TIMEOUT = float(os.environ.get('TMDB_TIMEOUT', '10'))
+# Requests per second sent to TMDB, with a burst allowance (0 disables the limit)
+TMDB_RATE_LIMIT = float(os.environ.get('TMDB_RATE_LIMIT', '40'))
+TMDB_RATE_BURST = int(os.environ.get('TMDB_RATE_BURST', '10'))
+
+# TMDB accepts at most this many append_to_response items per request
+APPEND_TO_RESPONSE_LIMIT = 20
+
+
+def create_session(pool_size: int = TMDB_POOL_SIZE, max_retries: int = TMDB_MAX_RETRIES) -> requests.Session:
+    """
+    Create an HTTP session with a keep-alive connection pool and retries.
+
+    Connection errors, 429 and 5xx responses are retried with exponential
+    backoff. For 429 and 503 the server's Retry-After header is honored.
+
+    Args:
+        pool_size: Maximum number of pooled connections per host
+        max_retries: Maximum number of retries per request
+
+    Returns:
+        Configured requests.Session
+    """
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET']),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'Accept': 'application/json',
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive',
+    })
+    return session
+
+
+class RateLimiter:
+    """Thread-safe token bucket: `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate: float = TMDB_RATE_LIMIT, capacity: Optional[int] = TMDB_RATE_BURST):
+        """
+        Initialize the bucket, full.
+
+        Args:
+            rate: Tokens added per second (0 or less: never wait)
+            capacity: Maximum number of tokens (burst size). Defaults to rate.
+        """
+        self.rate = rate
+        self.capacity = capacity or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Wait until a token is available and take it."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class _InFlightRequest:
+    """A request being fetched, shared with callers asking for the same thing."""
+
+    __slots__ = ('done', 'result')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = {"results": []}
+
 
 class TMDB:
     """
     Client for The Movie Database API.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[TMDBCache] = None,
+                 index: Optional[TMDBIdIndex] = None, limiter: Optional[RateLimiter] = None):
         """
         Initialize the TMDB client.
         
         Args:
             api_key: TMDB API key. If None, uses the value from settings.
+            cache: Response cache. If None, uses the shared on-disk cache.
+            index: Local ID index. If None, uses the shared index if one was ingested.
+            limiter: Rate limiter for network requests. If None, one is created
+                from TMDB_RATE_LIMIT and TMDB_RATE_BURST.
         """
         self.api_key = api_key or TMDB_API_KEY
         self.base_url = TMDB_BASE_URL
+        self.session = create_session()
+        self.cache = cache if cache is not None else get_tmdb_cache()
+        self.index = index if index is not None else get_tmdb_index()
+        self.limiter = limiter if limiter is not None else RateLimiter()
+        self.requests_sent = 0
+        self.coalesced = 0
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
         
         if not self.api_key:
             logger.warning("TMDB API key not set. API requests will fail.")
@@ -42,22 +157,79 @@ class TMDB:
         Returns:
             JSON response as a dictionary
         """
-        url = f"{self.base_url}/{endpoint}"
-        
         # Ensure params is a dictionary
         if params is None:
             params = {}
         
+        if self.cache is not None:
+            cached = self.cache.get(endpoint, params)
+            if cached is not None:
+                return cached
+        
+        return self._fetch(endpoint, params)
+    
+    def _fetch(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Request an endpoint from the API, bypassing the cache lookup.
+        
+        If the same request is already in flight on another thread, this
+        waits for it and returns a copy of its response instead.
+        Successful responses are stored in the cache.
+        
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
+            
+        Returns:
+            JSON response as a dictionary
+        """
+        key = cache_key(endpoint, params)
+        with self._in_flight_lock:
+            request = self._in_flight.get(key)
+            leader = request is None
+            if leader:
+                request = _InFlightRequest()
+                self._in_flight[key] = request
+                self.requests_sent += 1
+            else:
+                self.coalesced += 1
+        
+        if not leader:
+            request.done.wait()
+            return copy.deepcopy(request.result)
+        
+        try:
+            request.result = self._send(endpoint, params)
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[key]
+            request.done.set()
+        return request.result
+    
+    def _send(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Send one request and cache a successful response."""
+        url = f"{self.base_url}/{endpoint}"
+        
         # Add API key
         params['api_key'] = self.api_key
         
+        self.limiter.acquire()
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=TMDB_TIMEOUT)
+            if response.status_code == 404:
+                # Unknown ID; marked so callers can tell it from a failed request
+                logger.debug(f"TMDB has no {endpoint}")
+                return {"results": [], "not_found": True}
             response.raise_for_status()  # Raise exception for non-200 status codes
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            data = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            # Errors are never cached
             logger.error(f"Error making TMDB API request to {endpoint}: {e}")
             return {"results": []}
+        
+        if self.cache is not None:
+            self.cache.put(endpoint, params, data)
+        return data
     
     def search_movie(self, query: str, year: Optional[str] = None, limit: int = 3) -> List[Dict[str, Any]]:
         """
@@ -155,7 +327,219 @@ class TMDB:
             External IDs (IMDb, TVDb, etc.)
         """
         return self._request(f'tv/{show_id}/external_ids')
+    
+    def find(self, external_id: str, source: str = 'imdb_id') -> Dict[str, Any]:
+        """
+        Find TMDB entries by an external ID.
+        
+        Args:
+            external_id: External ID, e.g. 'tt0113277'
+            source: External source ('imdb_id', 'tvdb_id', ...)
+            
+        Returns:
+            Dictionary with movie_results, tv_results, tv_episode_results, etc.
+        """
+        return self._request(f'find/{external_id}', {'external_source': source})
+    
+    def resolve_id(self, query: str, year: Optional[str] = None, media_type: str = 'movie') -> Optional[int]:
+        """
+        Resolve a title to a TMDB ID.
+        
+        The local ID index is asked first. Only when it has no entry, or
+        several similarly popular ones, is the API searched, and its top
+        result used.
+        
+        Args:
+            query: Title to resolve
+            year: Optional year (ignored unless it is a 4-digit year)
+            media_type: 'movie' or 'tv'
+            
+        Returns:
+            TMDB ID, or None if nothing was found
+        """
+        if not (year and str(year).isdigit()):
+            year = None
+        if self.index is not None:
+            tmdb_id = self.index.resolve(query, year, media_type)
+            if tmdb_id is not None:
+                return tmdb_id
+        
+        if media_type == 'tv':
+            results = self.search_tv(query, year=year)
+        else:
+            results = self.search_movie(query, year=year)
+        return results[0].get('id') if results else None
+    
+    def get_full_movie(self, movie_id: int, external_ids: bool = True) -> Dict[str, Any]:
+        """
+        Get movie details together with its sub-resources in one request.
+        
+        Uses append_to_response. The details and each sub-resource are also
+        cached on their own, so later get_movie_details() and
+        get_movie_external_ids() calls don't hit the network.
+        
+        Args:
+            movie_id: TMDB movie ID
+            external_ids: Include external IDs (IMDb, etc.) under 'external_ids'
+            
+        Returns:
+            Movie details with the appended sub-resources
+        """
+        return self._get_full(f'movie/{movie_id}', ['external_ids'] if external_ids else [])
+    
+    def get_full_tv(self, show_id: int, seasons: Sequence[int] = (), external_ids: bool = True) -> Dict[str, Any]:
+        """
+        Get TV show details together with its sub-resources in one request.
+        
+        Uses append_to_response. Seasons appear under 'season/N' keys.
+        The details, external IDs and each season are also cached on their
+        own, so later get_tv_details(), get_tv_external_ids() and
+        get_tv_season() calls don't hit the network.
+        
+        Args:
+            show_id: TMDB show ID
+            seasons: Season numbers to include (with their episode lists)
+            external_ids: Include external IDs (IMDb, TVDb, etc.) under 'external_ids'
+            
+        Returns:
+            TV show details with the appended sub-resources
+        """
+        appended = ['external_ids'] if external_ids else []
+        appended += [f'season/{int(number)}' for number in dict.fromkeys(seasons)]
+        return self._get_full(f'tv/{show_id}', appended)
+    
+    def _get_full(self, endpoint: str, appended: List[str]) -> Dict[str, Any]:
+        """Fetch an endpoint with appended sub-resources and cache each part."""
+        if not appended:
+            return self._request(endpoint)
+        
+        # Everything may already be cached from earlier calls
+        if self.cache is not None:
+            parts = {item: self.cache.get(f'{endpoint}/{item}') for item in appended}
+            if all(value is not None for value in parts.values()):
+                details = self.cache.get(endpoint)
+                if details is not None:
+                    return {**details, **parts}
+        
+        full = {}
+        for start in range(0, len(appended), APPEND_TO_RESPONSE_LIMIT):
+            chunk = appended[start:start + APPEND_TO_RESPONSE_LIMIT]
+            data = self._request(endpoint, {'append_to_response': ','.join(chunk)})
+            if 'id' not in data:
+                # Request failed; callers get what was fetched so far
+                break
+            full.update(data)
+        
+        if self.cache is not None and 'id' in full:
+            self.cache.put(endpoint, {}, {k: v for k, v in full.items() if k not in appended})
+            for item in appended:
+                if item in full:
+                    self.cache.put(f'{endpoint}/{item}', {}, full[item])
+        return full or {"results": []}
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """
+        Get response cache counters.
+        
+        Returns:
+            Dictionary with hits, misses, expired, evicted and entries (empty if caching is off)
+        """
+        return self.cache.stats() if self.cache is not None else {}
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get request counters.
+        
+        Returns:
+            Dictionary with requests_sent, coalesced (requests saved by sharing
+            an in-flight response), the response cache counters and the
+            local ID index counters
+        """
+        index_stats = self.index.stats() if self.index is not None else {}
+        return {'requests_sent': self.requests_sent, 'coalesced': self.coalesced,
+                **self.cache_stats(), **index_stats}
+    
+    def close(self):
+        """Close the pooled connections."""
+        self.session.close()
+
+
+_tmdb = None
+_tmdb_lock = threading.Lock()
+
+
+def get_tmdb() -> TMDB:
+    """
+    Get the shared TMDB client.
+
+    Returns:
+        TMDB instance using the configured API key
+    """
+    global _tmdb
+    if _tmdb is None:
+        with _tmdb_lock:
+            if _tmdb is None:
+                _tmdb = TMDB()
+    return _tmdb
+
+
+def _env_flag(name: str, default: str = 'false') -> bool:
+    return os.environ.get(name, default).lower() in ('true', 'yes', '1')
+
+
+def fill_tmdb_details(metadata: Dict[str, Any], content_type: str = 'movie',
+                      client: Optional[TMDB] = None) -> Dict[str, Any]:
+    """
+    Look up the IMDb/TVDb IDs and episode title a link name needs in one request.
+
+    IDs are only looked up when IMDB_FOLDER_ID or TVDB_FOLDER_ID is enabled
+    and the ID is missing from the metadata; the episode title when the
+    season and episode of a TV file are known but its title isn't. The
+    details, external IDs and season are cached on their own (see
+    TMDB.get_full_tv), so later episodes of the same season don't repeat
+    the request. Failures are logged and leave the metadata as it was.
+
+    Args:
+        metadata: Dictionary containing tmdb_id and optionally imdb_id/tvdb_id,
+            season, episode and episode_title (updated in place)
+        content_type: Content type ('movie' or 'tv')
+        client: Client to use. Defaults to the shared client.
+
+    Returns:
+        The metadata dictionary
+    """
+    tmdb_id = metadata.get('tmdb_id')
+    season = metadata.get('season')
+    episode = metadata.get('episode')
+    want_imdb = _env_flag('IMDB_FOLDER_ID') and not metadata.get('imdb_id')
+    want_tvdb = content_type == 'tv' and _env_flag('TVDB_FOLDER_ID') and not metadata.get('tvdb_id')
+    want_title = (content_type == 'tv' and season is not None and episode is not None
+                  and not metadata.get('episode_title'))
+    if not tmdb_id or not (want_imdb or want_tvdb or want_title):
+        return metadata
+
+    try:
+        tmdb = client or get_tmdb()
+        if content_type == 'tv':
+            full = tmdb.get_full_tv(tmdb_id, seasons=[int(season)] if want_title else (),
+                                    external_ids=want_imdb or want_tvdb)
+        else:
+            full = tmdb.get_full_movie(tmdb_id)
+    except Exception as e:
+        logger.warning(f"Could not fetch TMDB details for tmdb-{tmdb_id}: {e}")
+        return metadata
 
+    external_ids = full.get('external_ids') or {}
+    if want_imdb and external_ids.get('imdb_id'):
+        metadata['imdb_id'] = external_ids['imdb_id']
+    if want_tvdb and external_ids.get('tvdb_id'):
+        metadata['tvdb_id'] = external_ids['tvdb_id']
+    if want_title:
+        for entry in (full.get(f'season/{int(season)}') or {}).get('episodes') or []:
+            if entry.get('episode_number') == int(episode) and entry.get('name'):
+                metadata['episode_title'] = entry['name']
+                break
+    return metadata
 
 def format_movie_result(movie: Dict[str, Any]) -> str:
     """
@@ -0,0 +1,255 @@
+"""
+Asynchronous TMDB client for bulk lookups.
+
+This module wraps the shared TMDB client for asyncio callers. Requests run
+on a small thread pool over the client's pooled session, so responses are
+cached, coalesced and rate limited exactly as with the synchronous client:
+the client's token bucket (TMDB_RATE_LIMIT, TMDB_RATE_BURST) is shared by
+every caller, so a bulk batch and the interactive menus together stay
+within TMDB's per-second quota. Cache hits don't use up any tokens.
+
+The batch helpers take N queries and return N results in the same order.
+Plain synchronous code can call search_batch() and details_batch().
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from src.api.tmdb import TMDB, get_tmdb
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Keep concurrency at or below TMDB_POOL_SIZE so every worker gets a pooled connection
+TMDB_ASYNC_CONCURRENCY = int(os.environ.get('TMDB_ASYNC_CONCURRENCY', '8'))
+
+# A search query, optionally with a year
+Query = Union[str, Tuple[str, Optional[str]]]
+
+
+class AsyncTMDB:
+    """
+    Asyncio counterpart of the TMDB client.
+
+    Methods mirror TMDB and return the same data. Use as an async context
+    manager, or call close() when done, to release the worker threads.
+    """
+
+    def __init__(self, client: Optional[TMDB] = None, concurrency: int = TMDB_ASYNC_CONCURRENCY):
+        """
+        Initialize the async client.
+
+        Args:
+            client: Synchronous client to run requests with (and whose rate
+                limiter they share). Defaults to the shared client.
+            concurrency: Maximum number of requests in flight
+        """
+        self.client = client or get_tmdb()
+        self.concurrency = max(1, concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='tmdb')
+        self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Shut down the worker threads."""
+        self._executor.shutdown(wait=False)
+
+    async def _request(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        params = dict(params or {})
+        cache = self.client.cache
+        if cache is not None:
+            cached = cache.get(endpoint, params)
+            if cached is not None:
+                return cached
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            # The worker waits for a token of the client's rate limiter in _fetch
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(self._executor, self.client._fetch, endpoint, params)
+
+    async def search_movie(self, query: str, year: Optional[str] = None, limit: int = 3) -> List[Dict[str, Any]]:
+        """
+        Search for movies.
+
+        Args:
+            query: Search query
+            year: Optional year to filter results
+            limit: Maximum number of results to return
+
+        Returns:
+            List of movie results
+        """
+        params = {'query': query}
+        if year:
+            params['year'] = year
+        results = await self._request('search/movie', params)
+        return results.get('results', [])[:limit]
+
+    async def search_tv(self, query: str, year: Optional[str] = None, limit: int = 3) -> List[Dict[str, Any]]:
+        """
+        Search for TV shows.
+
+        Args:
+            query: Search query
+            year: Optional year to filter results (uses first_air_date_year)
+            limit: Maximum number of results to return
+
+        Returns:
+            List of TV show results
+        """
+        params = {'query': query}
+        if year:
+            params['first_air_date_year'] = year
+        results = await self._request('search/tv', params)
+        return results.get('results', [])[:limit]
+
+    async def get_movie_details(self, movie_id: int) -> Dict[str, Any]:
+        """
+        Get details for a movie.
+
+        Args:
+            movie_id: TMDB movie ID
+
+        Returns:
+            Movie details
+        """
+        return await self._request(f'movie/{movie_id}')
+
+    async def get_tv_details(self, show_id: int) -> Dict[str, Any]:
+        """
+        Get details for a TV show.
+
+        Args:
+            show_id: TMDB show ID
+
+        Returns:
+            TV show details
+        """
+        return await self._request(f'tv/{show_id}')
+
+    async def get_tv_season(self, show_id: int, season_number: int) -> Dict[str, Any]:
+        """
+        Get details for a TV season.
+
+        Args:
+            show_id: TMDB show ID
+            season_number: Season number
+
+        Returns:
+            Season details
+        """
+        return await self._request(f'tv/{show_id}/season/{season_number}')
+
+    async def gather(self, coros: Iterable, default: Any = None) -> List[Any]:
+        """
+        Run coroutines concurrently and return their results in order.
+
+        A coroutine that raises is logged and yields `default` instead.
+
+        Args:
+            coros: Coroutines, e.g. from search_movie()
+            default: Result used for failed coroutines
+
+        Returns:
+            Results in the order of `coros`
+        """
+        results = await asyncio.gather(*coros, return_exceptions=True)
+        ordered = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"TMDB batch request failed: {result}")
+                result = default() if callable(default) else default
+            ordered.append(result)
+        return ordered
+
+    async def search_batch(self, queries: Sequence[Query], media_type: str = 'movie',
+                           limit: int = 3) -> List[List[Dict[str, Any]]]:
+        """
+        Run many searches concurrently.
+
+        Args:
+            queries: Query strings or (query, year) tuples
+            media_type: 'movie' or 'tv'
+            limit: Maximum number of results per query
+
+        Returns:
+            One result list per query, in the same order as `queries`
+        """
+        search = self.search_tv if media_type == 'tv' else self.search_movie
+        coros = []
+        for query in queries:
+            title, year = (query, None) if isinstance(query, str) else query
+            coros.append(search(title, year=year, limit=limit))
+        return await self.gather(coros, default=list)
+
+    async def details_batch(self, ids: Sequence[int], media_type: str = 'movie') -> List[Dict[str, Any]]:
+        """
+        Fetch details for many IDs concurrently.
+
+        Args:
+            ids: TMDB IDs
+            media_type: 'movie' or 'tv'
+
+        Returns:
+            One details dictionary per ID, in the same order as `ids`
+        """
+        details = self.get_tv_details if media_type == 'tv' else self.get_movie_details
+        return await self.gather((details(tmdb_id) for tmdb_id in ids), default=dict)
+
+
+def _run(client: Optional[TMDB], batch_method: str, *args, **kwargs):
+    async def runner():
+        async with AsyncTMDB(client) as async_client:
+            return await getattr(async_client, batch_method)(*args, **kwargs)
+    # A private loop rather than asyncio.run(), which needs Python 3.7
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(runner())
+    finally:
+        loop.close()
+
+
+def search_batch(queries: Sequence[Query], media_type: str = 'movie', limit: int = 3,
+                 client: Optional[TMDB] = None) -> List[List[Dict[str, Any]]]:
+    """
+    Run many searches concurrently from synchronous code.
+
+    Must not be called while an event loop is running in this thread.
+
+    Args:
+        queries: Query strings or (query, year) tuples
+        media_type: 'movie' or 'tv'
+        limit: Maximum number of results per query
+        client: Synchronous client to run requests with. Defaults to the shared client.
+
+    Returns:
+        One result list per query, in the same order as `queries`
+    """
+    return _run(client, 'search_batch', queries, media_type=media_type, limit=limit)
+
+
+def details_batch(ids: Sequence[int], media_type: str = 'movie',
+                  client: Optional[TMDB] = None) -> List[Dict[str, Any]]:
+    """
+    Fetch details for many IDs concurrently from synchronous code.
+
+    Must not be called while an event loop is running in this thread.
+
+    Args:
+        ids: TMDB IDs
+        media_type: 'movie' or 'tv'
+        client: Synchronous client to run requests with. Defaults to the shared client.
+
+    Returns:
+        One details dictionary per ID, in the same order as `ids`
+    """
+    return _run(client, 'details_batch', ids, media_type=media_type)
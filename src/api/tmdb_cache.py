@@ -0,0 +1,271 @@
+"""
+Persistent TMDB response cache.
+
+This module stores TMDB API responses in a small SQLite database so repeated
+searches (every menu redraw) and detail lookups (webhooks, symlink creation)
+are answered locally, including after a restart. Entries are keyed by
+endpoint plus canonicalized query parameters and expire after a TTL that
+depends on the kind of request. The cache is trimmed to a maximum number of
+entries, least recently used first.
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlencode
+from typing import Any, Dict, Optional
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+TMDB_CACHE_DB = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'tmdb_cache.db')
+TMDB_CACHE_ENABLED = os.environ.get('TMDB_CACHE_ENABLED', 'true').lower() == 'true'
+TMDB_CACHE_SEARCH_TTL = int(os.environ.get('TMDB_CACHE_SEARCH_TTL', '86400'))
+TMDB_CACHE_DETAIL_TTL = int(os.environ.get('TMDB_CACHE_DETAIL_TTL', '604800'))
+TMDB_CACHE_NEGATIVE_TTL = int(os.environ.get('TMDB_CACHE_NEGATIVE_TTL', '3600'))
+TMDB_CACHE_MAX_ENTRIES = int(os.environ.get('TMDB_CACHE_MAX_ENTRIES', '20000'))
+
+# Parameters that never change the response
+_IGNORED_PARAMS = ('api_key',)
+
+# Access times are written back in batches of this many hits
+_TOUCH_BATCH = 64
+
+
+def cache_key(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Build the cache key for a request.
+
+    Args:
+        endpoint: API endpoint, e.g. 'search/movie'
+        params: Query parameters
+
+    Returns:
+        Endpoint plus sorted, normalized query string
+    """
+    items = sorted(
+        (str(k), str(v).strip().lower() if k == 'query' else str(v))
+        for k, v in (params or {}).items()
+        if k not in _IGNORED_PARAMS and v is not None
+    )
+    endpoint = endpoint.strip('/')
+    return f"{endpoint}?{urlencode(items)}" if items else endpoint
+
+
+def _is_empty(value: Any) -> bool:
+    """True for responses that carry no data (searches without results)."""
+    if not value:
+        return True
+    return isinstance(value, dict) and 'results' in value and not value['results']
+
+
+class TMDBCache:
+    """SQLite-backed cache of TMDB responses with TTLs and LRU trimming."""
+
+    def __init__(self, db_path: str = TMDB_CACHE_DB, search_ttl: int = TMDB_CACHE_SEARCH_TTL,
+                 detail_ttl: int = TMDB_CACHE_DETAIL_TTL, negative_ttl: int = TMDB_CACHE_NEGATIVE_TTL,
+                 max_entries: int = TMDB_CACHE_MAX_ENTRIES):
+        """
+        Open (and create if needed) the cache database.
+
+        Args:
+            db_path: Path to the SQLite database
+            search_ttl: Seconds a search response stays valid
+            detail_ttl: Seconds a detail response stays valid
+            negative_ttl: Seconds an empty response stays valid
+            max_entries: Entries kept before the least recently used are dropped
+        """
+        self.db_path = db_path
+        self.search_ttl = search_ttl
+        self.detail_ttl = detail_ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+        self._touched = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS tmdb_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_tmdb_cache_access ON tmdb_cache (last_access)')
+        self._conn.execute('DELETE FROM tmdb_cache WHERE expires < ?', (time.time(),))
+        self._conn.commit()
+        self._count = self._conn.execute('SELECT COUNT(*) FROM tmdb_cache').fetchone()[0]
+
+    def ttl_for(self, endpoint: str, value: Any) -> int:
+        """
+        Time to live for a response.
+
+        Args:
+            endpoint: API endpoint the response came from
+            value: Decoded response
+
+        Returns:
+            TTL in seconds
+        """
+        if _is_empty(value):
+            return self.negative_ttl
+        if endpoint.strip('/').startswith('search/'):
+            return self.search_ttl
+        return self.detail_ttl
+
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """
+        Look up a cached response.
+
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
+
+        Returns:
+            Decoded response, or None on a miss or expired entry
+        """
+        key = cache_key(endpoint, params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute('SELECT value, expires FROM tmdb_cache WHERE key=?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            if row[1] < now:
+                self.misses += 1
+                self.expired += 1
+                return None
+            self.hits += 1
+            self._touched[key] = now
+            if len(self._touched) >= _TOUCH_BATCH:
+                self._flush_touched_locked()
+        return json.loads(row[0])
+
+    def put(self, endpoint: str, params: Optional[Dict[str, Any]], value: Any):
+        """
+        Store a successful response.
+
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
+            value: Decoded JSON response
+        """
+        key = cache_key(endpoint, params)
+        now = time.time()
+        expires = now + self.ttl_for(endpoint, value)
+        try:
+            encoded = json.dumps(value, separators=(',', ':'))
+        except (TypeError, ValueError):
+            return
+        with self._lock:
+            try:
+                cursor = self._conn.execute(
+                    'INSERT OR IGNORE INTO tmdb_cache (key, value, expires, last_access) VALUES (?, ?, ?, ?)',
+                    (key, encoded, expires, now)
+                )
+                if cursor.rowcount:
+                    self._count += 1
+                else:
+                    self._conn.execute(
+                        'UPDATE tmdb_cache SET value=?, expires=?, last_access=? WHERE key=?',
+                        (encoded, expires, now, key)
+                    )
+                self._flush_touched_locked(commit=False)
+                if self._count > self.max_entries:
+                    self._evict_locked()
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Could not write TMDB cache entry {key}: {e}")
+
+    def _flush_touched_locked(self, commit: bool = True):
+        if not self._touched:
+            return
+        rows = [(last_access, key) for key, last_access in self._touched.items()]
+        self._touched = {}
+        try:
+            self._conn.executemany('UPDATE tmdb_cache SET last_access=? WHERE key=?', rows)
+            if commit:
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.debug(f"Could not update TMDB cache access times: {e}")
+
+    def _evict_locked(self):
+        # Trim to 90% so eviction doesn't run on every insert
+        target = int(self.max_entries * 0.9)
+        now = time.time()
+        removed = self._conn.execute('DELETE FROM tmdb_cache WHERE expires < ?', (now,)).rowcount
+        remaining = self._count - removed
+        if remaining > target:
+            removed += self._conn.execute(
+                'DELETE FROM tmdb_cache WHERE key IN '
+                '(SELECT key FROM tmdb_cache ORDER BY last_access LIMIT ?)',
+                (remaining - target,)
+            ).rowcount
+        self._count = self._conn.execute('SELECT COUNT(*) FROM tmdb_cache').fetchone()[0]
+        self.evicted += removed
+        logger.debug(f"Evicted {removed} TMDB cache entries, {self._count} remain")
+
+    def flush(self):
+        """Write pending access times."""
+        with self._lock:
+            self._flush_touched_locked()
+
+    def clear(self):
+        """Remove every cached response."""
+        with self._lock:
+            self._touched = {}
+            self._conn.execute('DELETE FROM tmdb_cache')
+            self._conn.commit()
+            self._count = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Cache counters.
+
+        Returns:
+            Dictionary with hits, misses, expired, evicted and entries
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'expired': self.expired,
+                'evicted': self.evicted,
+                'entries': self._count,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_tmdb_cache() -> Optional[TMDBCache]:
+    """
+    Get the shared TMDB response cache.
+
+    Returns:
+        TMDBCache instance, or None if caching is disabled or unavailable
+    """
+    global _cache
+    if not TMDB_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    _cache = TMDBCache()
+                    atexit.register(_cache.flush)
+                except sqlite3.Error as e:
+                    logger.warning(f"TMDB cache disabled, could not open {TMDB_CACHE_DB}: {e}")
+                    return None
+    return _cache
@@ -0,0 +1,301 @@
+"""
+Local index of TMDB's daily ID exports.
+
+TMDB publishes daily exports of every movie and TV show ID as gzipped JSON
+lines (id, original title, popularity). This module ingests such a file
+into a SQLite database keyed by normalized title (and year, when the dump
+has one), so titles can be resolved to IDs without calling the API. Dumps
+that also carry the localized title are indexed under both titles.
+Lookups that miss or are ambiguous fall back to the live API in
+TMDB.resolve_id().
+
+Populate the index with scripts/ingest_tmdb_ids.py.
+"""
+
+import gzip
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.logger import get_logger
+from src.utils.scan_logic import normalize_title
+
+logger = get_logger(__name__)
+
+TMDB_INDEX_DB = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'tmdb_ids.db')
+TMDB_INDEX_ENABLED = os.environ.get('TMDB_INDEX_ENABLED', 'true').lower() == 'true'
+# The most popular candidate wins if it is this many times as popular as the next one
+TMDB_INDEX_AMBIGUITY_RATIO = float(os.environ.get('TMDB_INDEX_AMBIGUITY_RATIO', '3'))
+
+MEDIA_TYPES = ('movie', 'tv')
+
+# Rows written per executemany() during ingest
+_INGEST_BATCH = 10000
+
+# Bumped when the table layout changes; older databases are rebuilt empty
+_SCHEMA_VERSION = 2
+
+# The index is filled with the uncached normalizer so a multi-million line
+# ingest doesn't flush the interactive parse cache
+_normalize = getattr(normalize_title, '__wrapped__', normalize_title)
+
+# A candidate: (tmdb_id, title, year, popularity)
+Candidate = Tuple[int, str, Optional[str], float]
+
+
+def media_type_for_dump(path: str) -> Optional[str]:
+    """
+    Guess the media type of an export from its file name.
+
+    Args:
+        path: Path like movie_ids_05_15_2024.json.gz or tv_series_ids_05_15_2024.json.gz
+
+    Returns:
+        'movie', 'tv' or None if the name isn't recognized
+    """
+    name = os.path.basename(path).lower()
+    if name.startswith('movie_ids'):
+        return 'movie'
+    if name.startswith('tv_series_ids'):
+        return 'tv'
+    return None
+
+
+def _dump_rows(path: str):
+    """
+    Stream (tmdb_id, title, norm_title, year, popularity) rows from an export.
+
+    An entry yields one row per distinct normalized title: the original
+    title and, when the dump has it, the localized one.
+    """
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+                tmdb_id = int(entry['id'])
+            except (ValueError, KeyError, TypeError):
+                logger.debug(f"Skipping malformed line {line_number} in {path}")
+                continue
+            # Daily exports carry no dates; other dumps may
+            date = str(entry.get('release_date') or entry.get('first_air_date') or entry.get('year') or '')
+            year = date[:4] if re.match(r'\d{4}', date) else None
+            popularity = float(entry.get('popularity') or 0)
+            seen = set()
+            for key in ('original_title', 'original_name', 'title', 'name'):
+                title = entry.get(key)
+                norm_title = _normalize(title) if title else None
+                if norm_title and norm_title not in seen:
+                    seen.add(norm_title)
+                    yield tmdb_id, title, norm_title, year, popularity
+
+
+class TMDBIdIndex:
+    """SQLite index of TMDB IDs by normalized title and year."""
+
+    def __init__(self, db_path: str = TMDB_INDEX_DB, ambiguity_ratio: float = TMDB_INDEX_AMBIGUITY_RATIO):
+        """
+        Open (and create if needed) the index database.
+
+        Args:
+            db_path: Path to the SQLite database
+            ambiguity_ratio: Popularity ratio between the best and second-best
+                candidate needed to pick the best one
+        """
+        self.db_path = db_path
+        self.ambiguity_ratio = ambiguity_ratio
+        self.hits = 0
+        self.misses = 0
+        self.ambiguous = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        if self._conn.execute('PRAGMA user_version').fetchone()[0] < _SCHEMA_VERSION:
+            # One row per ID and title; older indexes held a single title per ID
+            self._conn.execute('DROP TABLE IF EXISTS tmdb_ids')
+            self._conn.execute('DROP TABLE IF EXISTS tmdb_id_dumps')
+            self._conn.execute(f'PRAGMA user_version={_SCHEMA_VERSION}')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS tmdb_ids (
+                media_type TEXT NOT NULL,
+                tmdb_id INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                norm_title TEXT NOT NULL,
+                year TEXT,
+                popularity REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (media_type, tmdb_id, norm_title)
+            )
+        ''')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS tmdb_id_dumps (
+                media_type TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                entries INTEGER NOT NULL,
+                ingested REAL NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_tmdb_ids_title ON tmdb_ids (media_type, norm_title, year)')
+        self._conn.commit()
+
+    def ingest(self, path: str, media_type: str) -> int:
+        """
+        Replace the entries of one media type with the contents of an export.
+
+        The file is streamed line by line and written in batches inside one
+        transaction, so readers see either the old or the new index.
+
+        Args:
+            path: Export file (.json.gz or plain JSON lines)
+            media_type: 'movie' or 'tv'
+
+        Returns:
+            Number of entries ingested
+        """
+        if media_type not in MEDIA_TYPES:
+            raise ValueError(f"Unknown media type: {media_type}")
+        count = 0
+        with self._lock:
+            try:
+                self._conn.execute('BEGIN')
+                self._conn.execute('DELETE FROM tmdb_ids WHERE media_type=?', (media_type,))
+                batch = []
+                last_id = None
+                for row in _dump_rows(path):
+                    if row[0] != last_id:
+                        count += 1
+                        last_id = row[0]
+                    batch.append((media_type,) + row)
+                    if len(batch) >= _INGEST_BATCH:
+                        self._insert_locked(batch)
+                        batch = []
+                self._insert_locked(batch)
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO tmdb_id_dumps (media_type, source, entries, ingested) VALUES (?, ?, ?, ?)',
+                    (media_type, os.path.abspath(path), count, time.time())
+                )
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+        logger.info(f"Ingested {count} {media_type} IDs from {path}")
+        return count
+
+    def _insert_locked(self, rows):
+        if rows:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO tmdb_ids (media_type, tmdb_id, title, norm_title, year, popularity) '
+                'VALUES (?, ?, ?, ?, ?, ?)', rows
+            )
+
+    def lookup(self, title: str, year: Optional[str] = None, media_type: str = 'movie') -> List[Candidate]:
+        """
+        Find entries whose normalized title matches.
+
+        Args:
+            title: Title to look up
+            year: Optional year; entries with another known year are excluded
+            media_type: 'movie' or 'tv'
+
+        Returns:
+            Candidates as (tmdb_id, title, year, popularity), most popular first
+        """
+        norm_title = normalize_title(title)
+        with self._lock:
+            if year:
+                rows = self._conn.execute(
+                    'SELECT tmdb_id, title, year, popularity FROM tmdb_ids '
+                    'WHERE media_type=? AND norm_title=? AND (year=? OR year IS NULL) '
+                    'ORDER BY popularity DESC',
+                    (media_type, norm_title, str(year))
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    'SELECT tmdb_id, title, year, popularity FROM tmdb_ids '
+                    'WHERE media_type=? AND norm_title=? ORDER BY popularity DESC',
+                    (media_type, norm_title)
+                ).fetchall()
+        return rows
+
+    def resolve(self, title: str, year: Optional[str] = None, media_type: str = 'movie') -> Optional[int]:
+        """
+        Resolve a title to a TMDB ID if the index has an unambiguous answer.
+
+        Several candidates without a year are always ambiguous: the dumps
+        rarely carry years, so popularity alone could pick the wrong one of
+        two same-named titles.
+
+        Args:
+            title: Title to resolve
+            year: Optional year
+            media_type: 'movie' or 'tv'
+
+        Returns:
+            TMDB ID, or None if the title is missing or ambiguous
+        """
+        candidates = self.lookup(title, year, media_type)
+        if not candidates:
+            self.misses += 1
+            return None
+        if len(candidates) > 1 and (not year or candidates[0][3] < self.ambiguity_ratio * candidates[1][3]):
+            self.ambiguous += 1
+            logger.debug(f"Local TMDB index is ambiguous for '{title}' ({year}): {len(candidates)} candidates")
+            return None
+        self.hits += 1
+        return candidates[0][0]
+
+    def entries(self, media_type: Optional[str] = None) -> int:
+        """
+        Number of indexed entries.
+
+        Args:
+            media_type: Count only this media type
+
+        Returns:
+            Entry count
+        """
+        with self._lock:
+            if media_type:
+                return self._conn.execute('SELECT COUNT(DISTINCT tmdb_id) FROM tmdb_ids WHERE media_type=?', (media_type,)).fetchone()[0]
+            return self._conn.execute('SELECT COUNT(*) FROM (SELECT DISTINCT media_type, tmdb_id FROM tmdb_ids)').fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Lookup counters.
+
+        Returns:
+            Dictionary with index_hits, index_misses and index_ambiguous
+        """
+        return {'index_hits': self.hits, 'index_misses': self.misses, 'index_ambiguous': self.ambiguous}
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_tmdb_index() -> Optional[TMDBIdIndex]:
+    """
+    Get the shared local TMDB ID index.
+
+    Returns:
+        TMDBIdIndex instance, or None if disabled or no export has been ingested
+    """
+    global _index
+    if not TMDB_INDEX_ENABLED or not os.path.exists(TMDB_INDEX_DB):
+        return None
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                try:
+                    _index = TMDBIdIndex()
+                except sqlite3.Error as e:
+                    logger.warning(f"Local TMDB index disabled, could not open {TMDB_INDEX_DB}: {e}")
+                    return None
+    return _index
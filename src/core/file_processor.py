@@ -8,7 +8,8 @@ different types of media files.
 import os
 from typing import Optional, List, Dict, Any
 
-from src.api.tmdb import TMDB
+from src.api.tmdb import fill_tmdb_details, get_tmdb
+from src.extractors.release_parser import parse_release
 from src.core.symlink_creator import SymlinkCreator
 from src.utils.logger import get_logger
 from src.config import DESTINATION_DIRECTORY, ALLOWED_EXTENSIONS
@@ -23,7 +24,7 @@ class FileProcessor:
     
     def __init__(self):
         """Initialize the file processor."""
-        self.tmdb = TMDB()
+        self.tmdb = get_tmdb()
         self.symlink_creator = SymlinkCreator()
         
     def is_media_file(self, file_path: str) -> bool:
@@ -71,31 +72,8 @@ class MovieProcessor(FileProcessor):
         Returns:
             Extracted movie name
         """
-        # Simple extraction for now - can be enhanced
         basename = os.path.basename(file_path)
-        name = os.path.splitext(basename)[0]
-        
-        # Remove common patterns
-        patterns = [
-            r'\(\d{4}\)',  # Remove year in parentheses
-            r'\[\w+\]',    # Remove anything in square brackets
-            r'\d{3,4}p',   # Remove resolution
-            r'HDTV',       # Remove HDTV
-            r'BluRay',     # Remove BluRay
-            r'WEB-DL',     # Remove WEB-DL
-            r'x264',       # Remove codec info
-            r'HEVC',       # Remove codec info
-        ]
-        
-        import re
-        for pattern in patterns:
-            name = re.sub(pattern, '', name, flags=re.IGNORECASE)
-        
-        # Clean up the result
-        name = name.replace('.', ' ').replace('_', ' ')
-        name = ' '.join(name.split())  # Normalize whitespace
-        
-        return name
+        return parse_release(basename).title
     
     def search_movie(self, movie_name: str) -> List[Dict[str, Any]]:
         """
@@ -135,11 +113,15 @@ class MovieProcessor(FileProcessor):
         # For now, just use the first result
         movie = results[0]
         
+        # IMDb ID for the folder name, if IMDB_FOLDER_ID is enabled
+        ids = fill_tmdb_details({'tmdb_id': movie['id']}, 'movie', client=self.tmdb)
+        
         # Create symlink
         return self.symlink_creator.create_movie_symlink(
             movie_file=file_path,
             movie_name=movie['title'],
             tmdb_id=str(movie['id']),
+            imdb_id=ids.get('imdb_id'),
             year=movie.get('release_date', '')[:4] if movie.get('release_date') else None
         )
 
@@ -163,53 +145,14 @@ class TVProcessor(FileProcessor):
         Returns:
             Dictionary containing show_name, season, and episode
         """
-        # Simple extraction - can be enhanced
         basename = os.path.basename(file_path)
+        parsed = parse_release(basename)
         
-        # Try to extract season and episode using common patterns
-        import re
-        
-        # Pattern like S01E01 or s01e01
-        se_match = re.search(r'[Ss](\d{1,2})[Ee](\d{1,2})', basename)
-        if se_match:
-            season = se_match.group(1).lstrip('0') or '1'  # Default to season 1 if '00'
-            episode = se_match.group(2).lstrip('0') or '1'  # Default to episode 1 if '00'
-            
-            # Extract show name (everything before the pattern)
-            show_part = basename[:se_match.start()]
-            show_name = show_part.replace('.', ' ').replace('_', ' ').strip()
-            
-            return {
-                'show_name': show_name,
-                'season': season,
-                'episode': episode
-            }
-        
-        # Pattern like 1x01 or 01x01
-        se_match = re.search(r'(\d{1,2})x(\d{1,2})', basename)
-        if se_match:
-            season = se_match.group(1).lstrip('0') or '1'
-            episode = se_match.group(2).lstrip('0') or '1'
-            
-            # Extract show name
-            show_part = basename[:se_match.start()]
-            show_name = show_part.replace('.', ' ').replace('_', ' ').strip()
-            
-            return {
-                'show_name': show_name,
-                'season': season,
-                'episode': episode
-            }
-        
-        # Fallback - assume season 1, episode 1
-        name = os.path.splitext(basename)[0]
-        name = name.replace('.', ' ').replace('_', ' ')
-        name = ' '.join(name.split())  # Normalize whitespace
-        
+        # Season and episode default to 1 when missing (or 0)
         return {
-            'show_name': name,
-            'season': '1',
-            'episode': '1'
+            'show_name': parsed.title,
+            'season': str(parsed.season or 1),
+            'episode': str(parsed.episode or 1)
         }
     
     def search_show(self, show_name: str) -> List[Dict[str, Any]]:
@@ -250,6 +193,9 @@ class TVProcessor(FileProcessor):
         # For now, just use the first result
         show = results[0]
         
+        # TVDb ID for the folder name, if TVDB_FOLDER_ID is enabled
+        ids = fill_tmdb_details({'tmdb_id': show['id']}, 'tv', client=self.tmdb)
+        
         # Create symlink
         return self.symlink_creator.create_tv_symlink(
             episode_file=file_path,
@@ -257,6 +203,7 @@ class TVProcessor(FileProcessor):
             season_num=info['season'],
             episode_num=info['episode'],
             tmdb_id=str(show['id']),
+            tvdb_id=ids.get('tvdb_id'),
             year=show.get('first_air_date', '')[:4] if show.get('first_air_date') else None
         )
 
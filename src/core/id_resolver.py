@@ -0,0 +1,141 @@
+"""
+Resolve ID-tagged releases without searching.
+
+Folders and files named with a TMDB, IMDb or TVDB ID (see
+src/extractors/id_tags.py) are looked up directly: TMDB IDs through the
+details endpoint, IMDb and TVDB IDs through TMDB's /find endpoint. Those
+responses are kept in the TMDB response cache; tags that TMDB doesn't know
+are remembered for the rest of the session.
+"""
+
+import threading
+from typing import Iterable, List, Optional, Tuple
+
+from src.api.tmdb import get_tmdb
+from src.extractors.id_tags import IdTag, find_id_tag
+from src.models.media_metadata import MediaMetadata
+from src.utils.logger import get_logger
+from src.utils.scan_logic import normalize_title
+
+logger = get_logger(__name__)
+
+_FIND_SOURCES = {'imdb': 'imdb_id', 'tvdb': 'tvdb_id'}
+
+# tag -> list of MediaMetadata (empty once TMDB has confirmed the ID is unknown)
+_resolved = {}
+_resolved_lock = threading.Lock()
+
+
+def _lookup(tag: IdTag, tmdb) -> Tuple[List[MediaMetadata], bool]:
+    """
+    Every title an ID tag can refer to.
+
+    Returns:
+        The titles, and whether the answer is definite (False if a request
+        failed, so an empty answer may just be a network problem)
+    """
+    if tag.source == 'tmdb':
+        # Movies and shows have separate ID spaces that overlap, so the same
+        # number usually names both a movie and an unrelated show
+        matches, definite = [], True
+        for tv in (False, True):
+            details = tmdb.get_tv_details(tag.value) if tv else tmdb.get_movie_details(tag.value)
+            if details.get('id'):
+                matches.append(MediaMetadata.from_tmdb(details, tv))
+            elif not details.get('not_found'):
+                definite = False
+        return matches, definite
+
+    found = tmdb.find(tag.value, _FIND_SOURCES[tag.source])
+    if 'movie_results' not in found:
+        return [], False
+    matches = [MediaMetadata.from_tmdb(results[0], tv)
+               for tv, results in ((False, found.get('movie_results')), (True, found.get('tv_results')))
+               if results]
+    if matches:
+        return matches, True
+
+    # An episode or season ID points at its show
+    definite = True
+    for key in ('tv_episode_results', 'tv_season_results'):
+        for result in found.get(key) or []:
+            if result.get('show_id'):
+                details = tmdb.get_tv_details(result['show_id'])
+                if details.get('id'):
+                    return [MediaMetadata.from_tmdb(details, True)], True
+                definite = definite and bool(details.get('not_found'))
+    return [], definite
+
+
+def resolve_id_tag(tag: IdTag, tmdb=None) -> List[MediaMetadata]:
+    """
+    Look up the titles an ID tag can refer to.
+
+    A TMDB ID is looked up as both a movie and a show. Answers are kept for
+    the session; an empty answer only if TMDB said the ID doesn't exist.
+
+    Args:
+        tag: Tag from find_id_tag()
+        tmdb: TMDB client. Defaults to the shared client.
+
+    Returns:
+        MediaMetadata of each title, movies first; empty if the ID is unknown
+    """
+    with _resolved_lock:
+        if tag in _resolved:
+            return list(_resolved[tag])
+    try:
+        matches, definite = _lookup(tag, tmdb or get_tmdb())
+    except Exception as e:
+        logger.warning(f"Could not resolve {tag.source} ID {tag.value}: {e}")
+        return []
+    if matches or definite:
+        with _resolved_lock:
+            _resolved[tag] = matches
+    return list(matches)
+
+
+def _named_in(metadata: MediaMetadata, names: Iterable[str]) -> bool:
+    """True if the metadata's title appears in one of the names."""
+    title = normalize_title(metadata.title or '')
+    return bool(title) and any(title in normalize_title(name) for name in names)
+
+
+def resolve_tagged(names: Iterable[str], is_tv: bool = False, tmdb=None) -> Optional[MediaMetadata]:
+    """
+    Resolve a release from the ID tag in its folder or file names.
+
+    The resolved title must appear in the folder name or the name that
+    carried the tag when the tag is a bare [N] (release names use square
+    brackets for other numbers too) or when the ID names both a movie and a
+    show. Otherwise a show could be linked as whichever unrelated movie
+    shares its TMDB ID.
+
+    Args:
+        names: Folder name first, then file names
+        is_tv: Whether the item was detected as a TV show; preferred if the
+            name matches titles of both types
+        tmdb: TMDB client. Defaults to the shared client.
+
+    Returns:
+        MediaMetadata of the tagged title, or None if no name carries a usable tag
+    """
+    names = list(names)
+    tag = find_id_tag(names)
+    if tag is None:
+        return None
+    matches = resolve_id_tag(tag, tmdb)
+    if not matches:
+        logger.info(f"ID tag {tag.source}-{tag.value} did not resolve, falling back to search")
+        return None
+    if tag.bare or len(matches) > 1:
+        tagged_name = next(name for name in names if find_id_tag([name]) == tag)
+        named = [m for m in matches if _named_in(m, (names[0], tagged_name))]
+        if not named:
+            found = ', '.join(f"'{m.title}'" for m in matches)
+            logger.info(f"Ignoring {tag.source}-{tag.value} in '{tagged_name}': TMDB title {found} doesn't match")
+            return None
+        matches = named
+    metadata = sorted(matches, key=lambda m: bool(m.is_tv) != bool(is_tv))[0]
+    logger.info(f"Resolved {tag.source}-{tag.value} to {metadata.title} ({metadata.year}) {{tmdb-{metadata.tmdb_id}}}")
+    return metadata
@@ -0,0 +1,277 @@
+"""
+Non-interactive identification of media folders.
+
+identify_folder() collects candidate titles for a folder from its ID tag,
+the scanner lists and a TMDB search, scores each against the cleaned
+folder title and year, and reports the best candidate with a confidence
+between 0 and 1. Callers link the folder automatically when the confidence
+reaches AUTO_CONFIDENCE_THRESHOLD and queue it for review otherwise.
+
+identify_folders() does the same for a batch of folders and sends their
+TMDB searches together through the async client (src/api/tmdb_async.py),
+so bulk runs are paced by the client's shared rate limiter.
+"""
+
+import difflib
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence
+
+from src.api.tmdb_async import search_batch
+from src.models.media_metadata import MediaMetadata
+from src.utils.logger import get_logger
+from src.utils.scan_logic import normalize_title
+
+logger = get_logger(__name__)
+
+# Folders identified with at least this confidence are linked without review
+AUTO_CONFIDENCE_THRESHOLD = float(os.environ.get('AUTO_CONFIDENCE_THRESHOLD', '0.85'))
+# Candidates for different titles scoring within this margin of the best make it ambiguous
+AUTO_CONFIDENCE_MARGIN = float(os.environ.get('AUTO_CONFIDENCE_MARGIN', '0.1'))
+# Folders of a batch prepared in parallel (directory listings and ID tag lookups)
+AUTO_WORKERS = int(os.environ.get('AUTO_WORKERS', '4'))
+# Folders whose TMDB searches are sent as one batch
+AUTO_BATCH_SIZE = int(os.environ.get('AUTO_BATCH_SIZE', '20'))
+
+# Bonus when the scanner lists and TMDB agree on the ID
+_AGREEMENT_BONUS = 0.1
+
+_SCANNER_ENTRY_RE = re.compile(r'^(?P<title>.+?)\s+\((?P<year>\d{4})\)')
+_SCANNER_TMDB_RE = re.compile(r'\{tmdb-(?P<id>\d+)\}')
+
+
+class Candidate:
+    """A possible identification of a folder."""
+
+    __slots__ = ('metadata', 'source', 'score')
+
+    def __init__(self, metadata, source, score=0.0):
+        self.metadata = metadata
+        self.source = source
+        self.score = score
+
+    def __repr__(self):
+        m = self.metadata
+        return f"Candidate({m.title!r}, {m.year!r}, tmdb-{m.tmdb_id}, {self.source}, {self.score:.2f})"
+
+
+class Identification:
+    """Result of identify_folder()."""
+
+    __slots__ = ('subfolder_name', 'title', 'year', 'is_tv', 'is_anime', 'is_wrestling',
+                 'candidates', 'confidence', 'reason')
+
+    def __init__(self, subfolder_name, title, year, is_tv, is_anime, is_wrestling):
+        self.subfolder_name = subfolder_name
+        self.title = title
+        self.year = year
+        self.is_tv = is_tv
+        self.is_anime = is_anime
+        self.is_wrestling = is_wrestling
+        self.candidates = []
+        self.confidence = 0.0
+        self.reason = None
+
+    @property
+    def best(self) -> Optional[Candidate]:
+        """The highest scoring candidate, if any."""
+        return self.candidates[0] if self.candidates else None
+
+    def is_confident(self, threshold: float = AUTO_CONFIDENCE_THRESHOLD) -> bool:
+        """True if the best candidate can be linked without review."""
+        return self.best is not None and self.confidence >= threshold
+
+
+def parse_scanner_entry(entry: str, is_tv: bool = False) -> MediaMetadata:
+    """
+    Parse a scanner list line such as 'Heat (1995) {tmdb-949}'.
+
+    Args:
+        entry: Scanner list line
+        is_tv: Whether the list holds TV shows
+
+    Returns:
+        MediaMetadata with title, year and TMDB ID where present
+    """
+    match = _SCANNER_ENTRY_RE.match(entry)
+    title, year = (match.group('title'), match.group('year')) if match else (entry.strip(), None)
+    id_match = _SCANNER_TMDB_RE.search(entry)
+    return MediaMetadata(title, year, id_match.group('id') if id_match else None, is_tv)
+
+
+def score_candidate(title: str, year: Optional[str], candidate: MediaMetadata) -> float:
+    """
+    Score how well a candidate matches a cleaned title and year.
+
+    Args:
+        title: Cleaned folder title
+        year: Folder year, or None
+        candidate: Candidate metadata
+
+    Returns:
+        Score between 0 and 1
+    """
+    wanted = normalize_title(title or '')
+    found = normalize_title(candidate.title or '')
+    if not wanted or not found:
+        return 0.0
+    similarity = 1.0 if wanted == found else difflib.SequenceMatcher(None, wanted, found).ratio()
+
+    if year and candidate.year:
+        difference = abs(int(year) - int(candidate.year))
+        year_factor = 1.0 if difference == 0 else 0.9 if difference == 1 else 0.5
+    else:
+        year_factor = 0.9
+    return similarity * year_factor
+
+
+def _confidence(candidates: List[Candidate]) -> float:
+    best = candidates[0]
+    for other in candidates[1:]:
+        if other.metadata.tmdb_id != best.metadata.tmdb_id or other.metadata.tmdb_id is None:
+            # A close runner-up for another title makes the pick a coin toss
+            gap = best.score - other.score
+            if gap < AUTO_CONFIDENCE_MARGIN:
+                return best.score * (0.5 + gap / (2 * AUTO_CONFIDENCE_MARGIN))
+            break
+    return best.score
+
+
+def _start(processor, subfolder_name: str) -> Identification:
+    """
+    Detect a folder's title and type and resolve its ID tag.
+
+    The returned Identification has a reason set if it is complete (tagged
+    or wrestling); otherwise it still needs a TMDB search.
+    """
+    title, year, is_tv, is_anime, is_wrestling = processor._initial_folder_info(subfolder_name)
+    if not (year and str(year).isdigit()):
+        year = None
+    result = Identification(subfolder_name, title, year, is_tv, is_anime, is_wrestling)
+
+    if is_wrestling:
+        result.reason = 'wrestling'
+        return result
+
+    tagged = processor._resolve_id_tag(subfolder_name, is_tv)
+    if tagged is not None:
+        result.is_tv = tagged.is_tv
+        result.candidates = [Candidate(tagged, 'tag', 1.0)]
+        result.confidence = 1.0
+        result.reason = 'id_tag'
+    return result
+
+
+def _finish(processor, result: Identification, results) -> Identification:
+    """Score the scanner list matches and TMDB search results of a started identification."""
+    title, year, is_tv = result.title, result.year, result.is_tv
+    candidates = []
+    for entry in processor._check_scanner_lists(title, year, is_tv, result.is_anime):
+        metadata = parse_scanner_entry(entry, is_tv)
+        candidates.append(Candidate(metadata, 'scanner', score_candidate(title, year, metadata)))
+
+    for found in results:
+        metadata = MediaMetadata.from_tmdb(found, is_tv)
+        candidates.append(Candidate(metadata, 'tmdb', score_candidate(title, year, metadata)))
+
+    # Scanner entries confirmed by TMDB get a bonus and the TMDB metadata
+    tmdb_by_id = {c.metadata.tmdb_id: c for c in candidates if c.source == 'tmdb' and c.metadata.tmdb_id}
+    for candidate in candidates:
+        confirmed = tmdb_by_id.get(candidate.metadata.tmdb_id) if candidate.source == 'scanner' else None
+        if confirmed is not None:
+            confirmed.score = min(1.0, max(confirmed.score, candidate.score) + _AGREEMENT_BONUS)
+            confirmed.source = 'scanner+tmdb'
+            candidate.score = 0.0
+
+    candidates = sorted((c for c in candidates if c.score > 0), key=lambda c: c.score, reverse=True)
+    result.candidates = candidates
+    if not candidates:
+        result.reason = 'no_candidates'
+        return result
+    result.confidence = _confidence(candidates)
+    result.reason = candidates[0].source
+    return result
+
+
+def identify_folder(processor, subfolder_name: str, tmdb) -> Identification:
+    """
+    Identify a folder without asking the operator.
+
+    Args:
+        processor: DirectoryProcessor the folder belongs to
+        subfolder_name: Folder name within processor.directory_path
+        tmdb: TMDB client the search goes through
+
+    Returns:
+        Identification with scored candidates, best first
+    """
+    result = identify_folders(processor, [subfolder_name], tmdb, workers=1)[0]
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+def _search(started: List[Identification], tmdb) -> List[list]:
+    """TMDB results for started identifications, searched as batches per media type."""
+    results = [[] for _ in started]
+    for is_tv in (False, True):
+        positions = [i for i, result in enumerate(started) if bool(result.is_tv) == is_tv]
+        if not positions:
+            continue
+        media_type = 'tv' if is_tv else 'movie'
+        queries = [(started[i].title, started[i].year) for i in positions]
+        for i, found in zip(positions, search_batch(queries, media_type, client=tmdb)):
+            results[i] = found
+        # Searches with a year that found nothing are repeated without it
+        retry = [i for i in positions if not results[i] and started[i].year]
+        if retry:
+            for i, found in zip(retry, search_batch([started[i].title for i in retry], media_type, client=tmdb)):
+                results[i] = found
+    return results
+
+
+def identify_folders(processor, subfolder_names: Sequence[str], tmdb=None,
+                     workers: int = AUTO_WORKERS) -> list:
+    """
+    Identify a batch of folders without asking the operator.
+
+    Folders are prepared (title, type, ID tag) on a thread pool, then the
+    searches of the untagged ones are sent together with search_batch().
+
+    Args:
+        processor: DirectoryProcessor the folders belong to
+        subfolder_names: Folder names within processor.directory_path
+        tmdb: TMDB client the searches go through. Defaults to the shared client.
+        workers: Folders prepared at the same time
+
+    Returns:
+        One Identification per folder, in input order; the exception raised
+        for a folder that could not be prepared
+    """
+    def start(subfolder_name):
+        try:
+            return _start(processor, subfolder_name)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='identify') as executor:
+        started = list(executor.map(start, subfolder_names))
+
+    searching = [r for r in started if isinstance(r, Identification) and not r.reason]
+    try:
+        found = _search(searching, tmdb)
+    except Exception as e:
+        logger.warning(f"TMDB batch search failed: {e}")
+        found = [[] for _ in searching]
+
+    identified = []
+    found = iter(found)
+    for result in started:
+        if isinstance(result, Identification) and not result.reason:
+            try:
+                result = _finish(processor, result, next(found))
+            except Exception as e:
+                result = e
+        identified.append(result)
+    return identified
@@ -13,7 +13,8 @@ from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-from src.main import load_scan_history_set, is_any_media_file_in_scan_history
+from src.main import is_any_media_file_in_scan_history
+from src.utils.scan_history_utils import get_scan_history_store
 
 logger = logging.getLogger(__name__)
 
@@ -58,7 +59,7 @@ class MonitorManager:
         self._pending_files = {}
         self._initial_scan_thread = None
         self._initial_scan_running = False
-        self.scan_history_set = load_scan_history_set()
+        self.scan_history_set = get_scan_history_store()
         self._ensure_config_dir()
         self._load_monitored_directories()
 
@@ -251,9 +252,7 @@ class MonitorManager:
             return
 
         # --- CRITICAL: Check if any media file in this folder is in scan history ---
-        from src.main import load_scan_history_set, is_any_media_file_in_scan_history
-        scan_history_set = load_scan_history_set()
-        scan_history_check = is_any_media_file_in_scan_history(dir_path, scan_history_set)
+        scan_history_check = is_any_media_file_in_scan_history(dir_path, self.scan_history_set)
         logger.info(f"DEBUG: Monitor scan history check for {dir_path}: {scan_history_check}")
         if scan_history_check:
             logger.info(f"DEBUG: MONITOR AUTO-SKIPPING due to scan history: {dir_path}")
@@ -27,6 +27,8 @@ except ImportError:
     def get_logger(name):
         return logging.getLogger(name)
 
+from src.extractors.id_tags import find_id_tag
+
 logger = get_logger(__name__)
 
 class MonitorManager:
@@ -137,11 +139,10 @@ class MonitorManager:
             subfolder = os.path.dirname(file_path)
             subfolder_name = os.path.basename(subfolder)
             
-            # Look for TMDB ID in folder name
-            tmdb_id_match = re.search(r'\[(\d+)\]', subfolder_name)
-            if tmdb_id_match:
-                tmdb_id = tmdb_id_match.group(1)
-                folders_with_ids[subfolder] = tmdb_id
+            # Look for an ID tag in the folder name; IMDb/TVDB IDs keep their prefix
+            id_tag = find_id_tag([subfolder_name])
+            if id_tag:
+                folders_with_ids[subfolder] = id_tag.value if id_tag.source == 'tmdb' else f"{id_tag.source}-{id_tag.value}"
         
         if folders_with_ids:
             self.logger.info(f"Found {len(folders_with_ids)} folders with TMDB IDs")
@@ -14,6 +14,8 @@ from pathlib import Path
 # Fix import path issues - add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+from src.extractors.id_tags import find_id_tag
+
 try:
     from src.main import DirectoryProcessor, get_logger
 except ImportError:
@@ -51,6 +53,33 @@ class MonitorProcessor:
         self.logger = get_logger(__name__)
         self.auto_mode = auto_mode
         
+    def _process_tagged_folder(self, subfolder):
+        """
+        Link a folder whose name or files carry an ID tag, skipping the search flow.
+        
+        Args:
+            subfolder: Path to the tagged folder
+        
+        Returns:
+            True if links were created, False if the tag didn't resolve or linking failed
+        """
+        try:
+            processor = DirectoryProcessor(os.path.dirname(subfolder), resume=False, auto_mode=self.auto_mode)
+            subfolder_name = os.path.basename(subfolder)
+            _, _, is_tv, is_anime, is_wrestling = processor._initial_folder_info(subfolder_name)
+            if is_wrestling:
+                return False
+            tagged = processor._resolve_id_tag(subfolder_name, is_tv)
+            if tagged is None:
+                return False
+            return processor._create_symlinks(
+                subfolder, tagged.title, tagged.year, tagged.is_tv, is_anime, is_wrestling,
+                tagged.tmdb_id, metadata=tagged
+            )
+        except Exception as e:
+            self.logger.error(f"Error linking tagged folder {subfolder}: {e}")
+            return False
+    
     def process_new_files(self, directory_path, file_paths):
         """
         Process newly detected files in a monitored directory.
@@ -91,24 +120,37 @@ class MonitorProcessor:
         try:
             # Import the load_skipped_items and save_skipped_items functions from main
             from src.main import load_skipped_items, save_skipped_items
-            skipped_items_registry = load_skipped_items()
         except ImportError:
-            skipped_items_registry = []
+            load_skipped_items = list
+            save_skipped_items = None
             self.logger.warning("Could not import skipped items functions, skipped items may not be saved properly")
+        # Entries added here; merged into the registry on disk at the end
+        skipped_items_registry = []
         
         # Process each subfolder with the DirectoryProcessor
         for subfolder, files in subfolder_files.items():
             self.logger.info(f"Processing subfolder: {subfolder}")
             
-            # Check if the folder name contains a TMDB ID
+            # Folders tagged with a TMDB/IMDb/TVDB ID are linked directly, without search
             subfolder_name = os.path.basename(subfolder)
-            tmdb_id = None
+            id_tag = find_id_tag([subfolder_name] + [os.path.basename(f) for f in files])
+            if id_tag:
+                self.logger.info(f"Found {id_tag.source} ID in folder or file name: {id_tag.value}")
+                if self._process_tagged_folder(subfolder):
+                    total_processed += len(files)
+                    continue
             
-            # Look for TMDB ID in folder name - format: "Title (Year) [TMDB_ID]"
-            tmdb_id_match = re.search(r'\[(\d+)\]', subfolder_name)
-            if tmdb_id_match:
-                tmdb_id = tmdb_id_match.group(1)
-                self.logger.info(f"Found TMDB ID in folder name: {tmdb_id}")
+            if self.auto_mode:
+                # Identify and link the folder itself without prompts
+                try:
+                    processor = DirectoryProcessor(os.path.dirname(subfolder), resume=False, auto_mode=True)
+                    processor._auto_process_folders([subfolder_name])
+                    total_processed += len(files) if processor.processed_files else 0
+                    total_errors += len(files) if processor.errors else 0
+                    total_skipped += len(files) if processor.skipped or processor.review_queued else 0
+                    continue
+                except Exception as e:
+                    self.logger.error(f"Auto mode failed for {subfolder}, using the default processor: {e}")
             
             try:
                 # Create a temporary DirectoryProcessor for this subfolder
@@ -159,10 +201,11 @@ class MonitorProcessor:
                 total_errors += len(files)
         
         # Save updated skipped items
-        try:
-            save_skipped_items(skipped_items_registry)
-        except Exception as e:
-            self.logger.error(f"Error saving skipped items: {e}")
+        if skipped_items_registry and save_skipped_items:
+            try:
+                save_skipped_items(load_skipped_items() + skipped_items_registry)
+            except Exception as e:
+                self.logger.error(f"Error saving skipped items: {e}")
         
         return total_processed, total_errors, total_skipped
 
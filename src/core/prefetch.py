@@ -0,0 +1,128 @@
+"""
+Look-ahead prefetching for the interactive folder loop.
+
+While the operator reviews one folder, FolderPrefetcher prepares the next
+few on a small thread pool. Folders with an ID tag are resolved by ID;
+the others have their titles cleaned, looked up in the scanner lists and
+sent through the same TMDB ID lookup and title search the folder menu
+makes. By the time the
+operator moves on, those lookups are answered from the TMDB response
+cache. If a search is still in flight, the menu joins it instead of
+sending another.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.logger import get_logger
+from src.utils.scanner_index import scanner_lists_signature
+
+logger = get_logger(__name__)
+
+# How many upcoming folders to prepare, and with how many threads (0 disables prefetching)
+PREFETCH_LOOKAHEAD = int(os.environ.get('PREFETCH_LOOKAHEAD', '3'))
+PREFETCH_WORKERS = int(os.environ.get('PREFETCH_WORKERS', '2'))
+
+
+class FolderPrefetcher:
+    """Prepares upcoming folders of a DirectoryProcessor scan in the background."""
+
+    def __init__(self, processor, tmdb, lookahead=PREFETCH_LOOKAHEAD, workers=PREFETCH_WORKERS):
+        """
+        Initialize the prefetcher. Nothing runs until advance() is called.
+
+        Args:
+            processor: DirectoryProcessor whose folders are being reviewed
+            tmdb: TMDB client used for the searches
+            lookahead: Number of folders after the current one to prepare
+            workers: Number of background threads
+        """
+        self.processor = processor
+        self.tmdb = tmdb
+        self.lookahead = max(0, lookahead)
+        self._scheduled = set()
+        self._futures = []
+        self._scanner_matches = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        if self.lookahead and workers > 0:
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='prefetch')
+
+    def advance(self, upcoming):
+        """
+        Schedule the upcoming folders that aren't prepared yet.
+
+        Args:
+            upcoming: Names of the next folders in review order; only the
+                first `lookahead` are used
+        """
+        if self._executor is None:
+            return
+        self._futures = [future for future in self._futures if not future.done()]
+        for name in upcoming[:self.lookahead]:
+            if name in self._scheduled:
+                continue
+            self._scheduled.add(name)
+            try:
+                self._futures.append(self._executor.submit(self._prefetch, name))
+            except RuntimeError:
+                # Executor already shut down
+                return
+
+    def _prefetch(self, subfolder_name):
+        try:
+            title, year, is_tv, is_anime, is_wrestling = self.processor._initial_folder_info(subfolder_name)
+            if not is_wrestling and self.processor._resolve_id_tag(subfolder_name, is_tv) is not None:
+                # Tagged folders skip scanner matching and search
+                logger.debug(f"Prefetched '{subfolder_name}' by its ID tag")
+                return
+            if year == "Unknown":
+                year = None
+            self.scanner_matches(title, year, is_tv, is_anime)
+
+            # Same lookups the folder menu makes: the header's ID (often answered
+            # by the local index) and the title search behind its TMDB results
+            media_type = 'tv' if is_tv and not is_wrestling else 'movie'
+            self.tmdb.resolve_id(title, year, media_type)
+            if media_type == 'tv':
+                self.tmdb.search_tv(title)
+            else:
+                self.tmdb.search_movie(title)
+            logger.debug(f"Prefetched '{subfolder_name}' as '{title}' ({year})")
+        except Exception as e:
+            logger.debug(f"Prefetch failed for '{subfolder_name}': {e}")
+
+    def scanner_matches(self, title, year=None, is_tv=False, is_anime=False):
+        """
+        Scanner list matches for a title, prepared in the background if possible.
+
+        Args:
+            title: Search title
+            year: Optional year
+            is_tv: Whether the content is a TV series
+            is_anime: Whether the content is anime
+
+        Returns:
+            List of matching scanner lines
+        """
+        key = (title, year, is_tv, is_anime)
+        # Matches are only reused while no scanner list has been edited
+        signature = scanner_lists_signature()
+        with self._lock:
+            cached = self._scanner_matches.get(key)
+        if cached is not None and cached[0] == signature:
+            return list(cached[1])
+        matches = self.processor._check_scanner_lists(title, year, is_tv, is_anime)
+        with self._lock:
+            self._scanner_matches[key] = (signature, matches)
+        return list(matches)
+
+    def close(self):
+        """Stop the background threads, dropping work that hasn't started."""
+        if self._executor is not None:
+            # shutdown's cancel_futures needs Python 3.9
+            for future in self._futures:
+                future.cancel()
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -0,0 +1,275 @@
+"""
+Job table for the two-phase interactive scan.
+
+An interactive scan identifies folders without prompting (see
+src/core/identify.py), ahead of the operator, and records each outcome here,
+one row per folder, together with any link the destination already has
+for it. The review then acts on the rows: confident jobs are linked,
+ambiguous and already-linked ones are shown with their stored candidates,
+so the operator never waits on the network. Rows outlive the session, so an
+interrupted review resumes where it stopped and unchanged folders aren't
+identified again.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from src.models.media_metadata import MediaMetadata
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SCAN_JOBS_DB = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'scan_jobs.db')
+# Identify folders ahead of the operator and only ask about ambiguous ones (off by default: the folder-by-folder scan)
+TWO_PHASE_SCAN = os.environ.get('TWO_PHASE_SCAN', 'false').lower() == 'true'
+
+# Job states
+IDENTIFIED = 'identified'   # confident, waiting to be linked
+AMBIGUOUS = 'ambiguous'     # needs the operator
+DEFERRED = 'deferred'       # sent to the full folder menu
+LINKED = 'linked'
+SKIPPED = 'skipped'
+FAILED = 'failed'
+
+# Jobs in these states are reused by the next scan while their folder is unchanged;
+# the others are identified again
+REUSABLE_STATES = (IDENTIFIED, AMBIGUOUS, SKIPPED)
+
+# Folder names per query when loading the jobs of some folders
+_QUERY_CHUNK = 500
+
+
+def folder_mtime(path: str) -> Optional[float]:
+    """Modification time of a folder, or None if it can't be read."""
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+class ScanJob:
+    """A folder's identification outcome as stored in the job table."""
+
+    __slots__ = ('directory', 'subfolder', 'status', 'title', 'year', 'is_tv', 'is_anime',
+                 'is_wrestling', 'confidence', 'reason', 'candidates', 'mtime', 'existing')
+
+    def __init__(self, directory, subfolder, status, title=None, year=None, is_tv=False,
+                 is_anime=False, is_wrestling=False, confidence=0.0, reason=None,
+                 candidates=None, mtime=None, existing=None):
+        self.directory = directory
+        self.subfolder = subfolder
+        self.status = status
+        self.title = title
+        self.year = year
+        self.is_tv = bool(is_tv)
+        self.is_anime = bool(is_anime)
+        self.is_wrestling = bool(is_wrestling)
+        self.confidence = confidence or 0.0
+        self.reason = reason
+        # List of (MediaMetadata, source, score), best first
+        self.candidates = candidates or []
+        self.mtime = mtime
+        # A destination link already holding this folder (or its episode), if any
+        self.existing = existing
+
+    @classmethod
+    def from_identification(cls, directory, result, status, mtime=None, existing=None):
+        """
+        Build a job from an identify_folder() result.
+
+        Args:
+            directory: Scanned directory
+            result: Identification
+            status: Job state
+            mtime: Folder modification time when it was identified
+            existing: Destination link already holding the folder, if any
+
+        Returns:
+            ScanJob instance
+        """
+        return cls(directory, result.subfolder_name, status, result.title, result.year,
+                   result.is_tv, result.is_anime, result.is_wrestling, result.confidence,
+                   result.reason, [(c.metadata, c.source, c.score) for c in result.candidates],
+                   mtime, existing)
+
+    @property
+    def path(self):
+        return os.path.join(self.directory, self.subfolder)
+
+    @property
+    def best(self):
+        """The best candidate's metadata, if any."""
+        return self.candidates[0][0] if self.candidates else None
+
+
+class ScanJobStore:
+    """SQLite table of scan jobs keyed by directory and subfolder."""
+
+    def __init__(self, db_path: str = SCAN_JOBS_DB):
+        """
+        Open (and create if needed) the job database.
+
+        Args:
+            db_path: Path to the SQLite database
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS scan_jobs (
+                directory TEXT NOT NULL,
+                subfolder TEXT NOT NULL,
+                status TEXT NOT NULL,
+                title TEXT,
+                year TEXT,
+                is_tv INTEGER NOT NULL DEFAULT 0,
+                is_anime INTEGER NOT NULL DEFAULT 0,
+                is_wrestling INTEGER NOT NULL DEFAULT 0,
+                confidence REAL NOT NULL DEFAULT 0,
+                reason TEXT,
+                candidates TEXT,
+                mtime REAL,
+                updated REAL NOT NULL,
+                existing TEXT,
+                PRIMARY KEY (directory, subfolder)
+            )
+        ''')
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(scan_jobs)')}
+        if 'existing' not in columns:
+            # Tables created before existing links were recorded
+            self._conn.execute('ALTER TABLE scan_jobs ADD COLUMN existing TEXT')
+        self._conn.commit()
+
+    def save(self, jobs: Iterable[ScanJob]) -> None:
+        """
+        Insert or replace jobs in one transaction.
+
+        Args:
+            jobs: Jobs to store
+        """
+        now = time.time()
+        rows = []
+        for job in jobs:
+            candidates = [dict(metadata.to_dict(), source=source, score=score)
+                          for metadata, source, score in job.candidates]
+            rows.append((job.directory, job.subfolder, job.status, job.title, job.year,
+                         int(job.is_tv), int(job.is_anime), int(job.is_wrestling), job.confidence,
+                         job.reason, json.dumps(candidates), job.mtime, now, job.existing))
+        with self._lock:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO scan_jobs (directory, subfolder, status, title, year, is_tv, is_anime, '
+                'is_wrestling, confidence, reason, candidates, mtime, updated, existing) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+            self._conn.commit()
+
+    def jobs(self, directory: str, statuses: Optional[Iterable[str]] = None,
+             subfolders: Optional[Iterable[str]] = None) -> Dict[str, ScanJob]:
+        """
+        Load the jobs of a directory.
+
+        Args:
+            directory: Scanned directory
+            statuses: Only return jobs in these states (default: all)
+            subfolders: Only return the jobs of these folders (default: all)
+
+        Returns:
+            Dictionary of subfolder name to ScanJob
+        """
+        query = ('SELECT subfolder, status, title, year, is_tv, is_anime, is_wrestling, confidence, '
+                 'reason, candidates, mtime, existing FROM scan_jobs WHERE directory = ?')
+        params = [directory]
+        if statuses is not None:
+            statuses = list(statuses)
+            query += f" AND status IN ({', '.join('?' * len(statuses))})"
+            params += statuses
+        if subfolders is None:
+            with self._lock:
+                rows = self._conn.execute(query, params).fetchall()
+        else:
+            subfolders = list(subfolders)
+            rows = []
+            # Chunked to stay under SQLite's limit on query parameters
+            for start in range(0, len(subfolders), _QUERY_CHUNK):
+                chunk = subfolders[start:start + _QUERY_CHUNK]
+                with self._lock:
+                    rows += self._conn.execute(f"{query} AND subfolder IN ({', '.join('?' * len(chunk))})",
+                                               params + chunk).fetchall()
+
+        jobs = {}
+        for (subfolder, status, title, year, is_tv, is_anime, is_wrestling, confidence,
+             reason, candidates, mtime, existing) in rows:
+            try:
+                parsed = [(MediaMetadata.from_dict(c), c.get('source'), c.get('score', 0.0))
+                          for c in json.loads(candidates or '[]')]
+            except (ValueError, AttributeError):
+                logger.warning(f"Discarding unreadable candidates of scan job {directory}/{subfolder}")
+                parsed = []
+            jobs[subfolder] = ScanJob(directory, subfolder, status, title, year, is_tv, is_anime,
+                                      is_wrestling, confidence, reason, parsed, mtime, existing)
+        return jobs
+
+    def subfolders(self, directory: str) -> List[str]:
+        """
+        Names of the folders a directory has jobs for.
+
+        Args:
+            directory: Scanned directory
+
+        Returns:
+            Subfolder names
+        """
+        with self._lock:
+            rows = self._conn.execute('SELECT subfolder FROM scan_jobs WHERE directory = ?', (directory,)).fetchall()
+        return [subfolder for (subfolder,) in rows]
+
+    def set_status(self, directory: str, subfolder: str, status: str) -> None:
+        """
+        Update the state of one job.
+
+        Args:
+            directory: Scanned directory
+            subfolder: Folder name within the directory
+            status: New state
+        """
+        with self._lock:
+            self._conn.execute('UPDATE scan_jobs SET status = ?, updated = ? WHERE directory = ? AND subfolder = ?',
+                               (status, time.time(), directory, subfolder))
+            self._conn.commit()
+
+    def forget(self, directory: str, subfolders: List[str]) -> None:
+        """
+        Remove jobs, e.g. of folders that no longer exist.
+
+        Args:
+            directory: Scanned directory
+            subfolders: Folder names to remove
+        """
+        with self._lock:
+            self._conn.executemany('DELETE FROM scan_jobs WHERE directory = ? AND subfolder = ?',
+                                   [(directory, name) for name in subfolders])
+            self._conn.commit()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_scan_job_store() -> ScanJobStore:
+    """
+    Get the shared scan job store.
+
+    Returns:
+        ScanJobStore instance
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ScanJobStore()
+    return _store
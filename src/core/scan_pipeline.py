@@ -0,0 +1,204 @@
+"""
+Streaming stages of a directory scan.
+
+A scan is a chain of generators: folders are enumerated (media_folders),
+filtered (unprocessed_folders), identified (identify_batches) and then
+presented by the caller. Each stage pulls from the previous one, so the
+first folder reaches the operator as soon as it has made it through the
+chain, while the rest of the directory is still being listed. A shared
+ScanProgress is updated by every stage so the UI can report totals that
+grow as the scan advances.
+
+With a fingerprint store (see src/utils/folder_fingerprints.py), folders
+unchanged since a scan that settled them (no media, linked or skipped) are
+dropped without being listed, and the outcome of every folder that passes
+through is recorded for the next scan.
+"""
+
+import itertools
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Tuple
+
+from src.utils.folder_fingerprints import LINKED, MEDIA, NO_MEDIA, SETTLED
+from src.utils.fs_scan import scan_media_folders
+from src.utils.link_index import get_link_index
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ScanProgress:
+    """Counters of a streaming scan."""
+
+    __slots__ = ('found', 'unchanged', 'no_media', 'in_history', 'linked', 'queued', 'identified',
+                 'presented', 'enumerated')
+
+    def __init__(self):
+        self.found = 0          # subfolders listed
+        self.unchanged = 0      # dropped: settled by an earlier scan and unchanged since
+        self.no_media = 0       # dropped: no media files
+        self.in_history = 0     # dropped: already in scan history
+        self.linked = 0         # dropped: already linked in the destination
+        self.queued = 0         # passed the filters
+        self.identified = 0     # identified without prompting
+        self.presented = 0      # handed to the operator or the linker
+        self.enumerated = False  # the whole directory has been listed
+
+    @property
+    def total(self) -> str:
+        """Folders to process, with a '+' while more may still turn up."""
+        return str(self.queued) if self.enumerated else f"{self.queued}+"
+
+    def summary(self) -> str:
+        """One-line description of where the scan stands."""
+        parts = [f"{self.found} folders found" + ('' if self.enumerated else ' so far')]
+        for count, label in ((self.unchanged, 'unchanged'), (self.no_media, 'without media'),
+                             (self.in_history, 'in scan history'),
+                             (self.linked, 'already linked'), (self.identified, 'identified')):
+            if count:
+                parts.append(f"{count} {label}")
+        parts.append(f"{self.presented}/{self.total} processed")
+        return ', '.join(parts)
+
+
+class FolderStream:
+    """
+    Iterator over folder names that can look ahead without consuming.
+
+    Used by the interactive loop to prepare upcoming folders while the
+    current one is reviewed.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self._names = iter(names)
+        self._buffer = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if self._buffer:
+            return self._buffer.popleft()
+        return next(self._names)
+
+    def peek(self, count: int) -> List[str]:
+        """
+        The next `count` names (fewer at the end), without consuming them.
+
+        Args:
+            count: Number of names to look ahead
+        """
+        while len(self._buffer) < count:
+            name = next(self._names, None)
+            if name is None:
+                break
+            self._buffer.append(name)
+        return list(itertools.islice(self._buffer, count))
+
+
+def media_folders(root: str, extensions: Iterable[str], progress: ScanProgress,
+                  fingerprints=None) -> Iterator[str]:
+    """
+    Stage 1: subfolders of root that contain media files, as they are found.
+
+    Args:
+        root: Scanned directory
+        extensions: Lower-case media extensions including the dot
+        progress: Counters to update
+        fingerprints: FolderFingerprints store, or None to list every folder
+    """
+    known = fingerprints.known(root) if fingerprints is not None else None
+    try:
+        for probe in scan_media_folders(root, extensions, known=known):
+            progress.found += 1
+            if probe.outcome in SETTLED:
+                progress.unchanged += 1
+                continue
+            if fingerprints is not None and probe.outcome is None and probe.fingerprint is not None:
+                fingerprints.record(root, probe.name, probe.fingerprint, MEDIA if probe.has_media else NO_MEDIA)
+            if not probe.has_media:
+                progress.no_media += 1
+                logger.info(f"Skipping directory {probe.name} - no valid media files found")
+                continue
+            yield probe.name
+        progress.enumerated = True
+    finally:
+        if fingerprints is not None:
+            fingerprints.flush()
+
+
+def unprocessed_folders(names: Iterable[str], root: str, progress: ScanProgress,
+                        history: Callable[[str], bool] = None, skip_linked: bool = False,
+                        fingerprints=None) -> Iterator[str]:
+    """
+    Stage 2: drop folders that were already processed.
+
+    Args:
+        names: Folder names from media_folders()
+        root: Scanned directory
+        progress: Counters to update
+        history: Returns True for a folder path found in the scan history;
+            None keeps those folders (the caller asks about them)
+        skip_linked: Drop folders linked from the destination (see src/utils/link_index.py)
+        fingerprints: FolderFingerprints store; dropped folders are recorded as linked
+    """
+    link_index = get_link_index() if skip_linked else None
+    for name in names:
+        path = os.path.join(root, name)
+        if history is not None and history(path):
+            progress.in_history += 1
+        elif link_index is not None and link_index.is_linked(path):
+            progress.linked += 1
+            logger.info(f"Pre-filtering: Skipping {name} - symlinks already exist")
+        else:
+            progress.queued += 1
+            yield name
+            continue
+        if fingerprints is not None:
+            fingerprints.set_outcome(root, name, LINKED)
+
+
+def identify_batches(names: Iterable[str], identify: Callable, progress: ScanProgress,
+                     batch_size: int) -> Iterator[Tuple[str, object]]:
+    """
+    Stage 3: identify folders in batches, yielding them in input order.
+
+    While the consumer works through one batch, the next is identified on a
+    background thread, so identification overlaps with the operator's
+    review of earlier folders and a batch's TMDB searches go out together.
+    Batches start with a single folder and double up to batch_size, so the
+    first folder isn't held back until a full batch has been listed.
+
+    Args:
+        names: Folder names from unprocessed_folders()
+        identify: Function of a list of folder names returning one result
+            per name, e.g. built on identify_folders() (src/core/identify.py)
+        progress: Counters to update
+        batch_size: Largest number of folders per batch
+
+    Yields:
+        (name, result) pairs; result is the exception if identification failed
+    """
+    batch_size = max(1, batch_size)
+    names = iter(names)
+    size = 1
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix='identify-batch') as executor:
+        def submit():
+            nonlocal size
+            batch = list(itertools.islice(names, size))
+            size = min(batch_size, size * 2)
+            return (batch, executor.submit(identify, batch)) if batch else None
+
+        current = submit()
+        while current is not None:
+            batch, future = current
+            try:
+                results = future.result()
+            except Exception as e:
+                results = [e] * len(batch)
+            current = submit()
+            for name, result in zip(batch, results):
+                progress.identified += 1
+                yield name, result
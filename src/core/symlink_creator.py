@@ -11,6 +11,7 @@ from pathlib import Path
 from typing import Optional
 
 from src.config import DESTINATION_DIRECTORY, RELATIVE_SYMLINK, LINK_TYPE
+from src.utils.link_index import forget_link, record_link
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -86,6 +87,7 @@ class SymlinkCreator:
             if os.path.exists(full_dest_path):
                 if os.path.islink(full_dest_path):
                     os.unlink(full_dest_path)
+                    forget_link(full_dest_path)
                 else:
                     logger.warning(f"Destination exists and is not a link: {full_dest_path}")
                     return False
@@ -94,6 +96,7 @@ class SymlinkCreator:
             if self.link_type == 'hardlink':
                 # Create a hard link
                 os.link(source_path, full_dest_path)
+                record_link(full_dest_path, source_path, hardlink=True)
                 logger.info(f"Created hardlink: {source_path} -> {full_dest_path}")
             else:
                 # Create a symbolic link (default)
@@ -104,6 +107,7 @@ class SymlinkCreator:
                 else:
                     # Create an absolute symlink
                     os.symlink(source_path, full_dest_path)
+                record_link(full_dest_path, source_path)
                 logger.info(f"Created symlink: {source_path} -> {full_dest_path}")
                 
             return True
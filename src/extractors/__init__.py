@@ -5,6 +5,8 @@ This module contains functions for extracting metadata from filenames,
 including show/movie names, season numbers, and episode numbers.
 """
 
+from .release_parser import ParsedRelease, parse_release
+from .id_tags import IdTag, find_id_tag, find_id_tags
 from .name_extractor import extract_name
 from .season_extractor import extract_season
-from .episode_extractor import extract_episode
\ No newline at end of file
+from .episode_extractor import extract_episode
@@ -0,0 +1,99 @@
+"""
+ID tag extraction for Scanly.
+
+Release and library folders often carry the database ID of their title,
+e.g. "Heat (1995) {tmdb-949}", "Heat [tt0113277]" or "Show [tvdb-81189]".
+This module finds those tags so the title can be looked up by ID instead
+of being cleaned, matched and searched.
+"""
+
+import datetime
+import re
+from typing import Iterable, List, NamedTuple, Optional
+
+# Tags must not touch other letters or digits
+_B = r'(?<![A-Za-z0-9])'
+_E = r'(?![A-Za-z0-9])'
+
+_TAG_RE = re.compile(
+    # {tmdb-949}, [tmdb-949], tmdb-949, [tmdbid-949], tmdb=949
+    _B + r'tmdb(?:id)?[-_=: ]?(?P<tmdb>\d{1,8})' + _E
+    # tt0113277
+    + r'|' + _B + r'(?P<imdb>tt\d{7,9})' + _E
+    # {tvdb-81189}, [tvdbid-81189], tvdb-81189
+    + r'|' + _B + r'tvdb(?:id)?[-_=: ]?(?P<tvdb>\d{1,8})' + _E
+    # [949]: bare TMDB ID in square brackets
+    + r'|\[(?P<bare>\d{1,7})\]',
+    re.IGNORECASE
+)
+
+# Preferred source when a name carries several tags
+_PRIORITY = {'tmdb': 0, 'imdb': 1, 'tvdb': 2, 'bare': 3}
+
+
+class IdTag(NamedTuple):
+    """An ID found in a name. `source` is 'tmdb', 'imdb' or 'tvdb'."""
+
+    source: str
+    value: str
+    # True for a bare [N], which is assumed to be a TMDB ID
+    bare: bool = False
+
+
+def _is_year(value: str) -> bool:
+    return len(value) == 4 and 1900 <= int(value) <= datetime.datetime.now().year + 5
+
+
+def find_id_tags(name: str) -> List[IdTag]:
+    """
+    Find all ID tags in a file or folder name.
+
+    A bare number in square brackets counts as a TMDB ID unless it looks
+    like a year.
+
+    Args:
+        name: File or folder name
+
+    Returns:
+        Tags, most reliable first (explicit TMDB, IMDb, TVDB, bare [N])
+    """
+    found = []
+    for match in _TAG_RE.finditer(name):
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'bare' and _is_year(value):
+            continue
+        found.append((_PRIORITY[kind], match.start(), kind, value))
+    found.sort()
+
+    tags = []
+    for _, _, kind, value in found:
+        if kind == 'bare':
+            tag = IdTag('tmdb', str(int(value)), bare=True)
+        elif kind == 'imdb':
+            tag = IdTag('imdb', value.lower())
+        else:
+            tag = IdTag(kind, str(int(value)))
+        if tag not in tags:
+            tags.append(tag)
+    return tags
+
+
+def find_id_tag(names: Iterable[str]) -> Optional[IdTag]:
+    """
+    Find the best ID tag across several names.
+
+    Names are checked in order (e.g. the folder name, then its files), and
+    the first name with a tag wins.
+
+    Args:
+        names: File or folder names
+
+    Returns:
+        The most reliable tag of the first tagged name, or None
+    """
+    for name in names:
+        tags = find_id_tags(name)
+        if tags:
+            return tags[0]
+    return None
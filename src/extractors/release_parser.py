@@ -0,0 +1,229 @@
+"""
+Release name parsing for Scanly.
+
+This module tokenizes a release name (file or directory name) in a single
+pass and returns a ParsedRelease record with the title, year, season,
+episode numbers, resolution, remux flag and release group. All tokens are
+found by one combined regex scanned left to right, so parsing cost grows
+with the length of the name rather than with the number of patterns.
+"""
+
+import re
+from typing import Optional, Tuple
+
+# Tokens must not touch other letters or digits; dots, underscores, dashes,
+# spaces and brackets all separate tokens
+_B = r'(?<![A-Za-z0-9])'
+_E = r'(?![A-Za-z0-9])'
+# A bare season or episode marker also must not follow an apostrophe, so the
+# possessive in "Ocean's 8" isn't read as season 8
+_B_MARKER = r"(?<![A-Za-z0-9'\u2019])"
+
+_TAG_WORDS = (
+    r'blu-?ray|bdrip|brrip|web-?dl|web-?rip|web|hdtv|hdrip|dvdrip|dvd|'
+    r'hdr10\+?|hdr|sdr|dv|x26[45]|h\.?26[45]|hevc|avc|xvid|divx|10bit|'
+    r'aac(?:2\.0)?|ac3|dts|ddp?(?:5\.1|2\.0)?|truehd|atmos|flac|'
+    r'amzn|nf|dsnp|hmax|atvp|hulu|'
+    r'proper|repack|extended|unrated|remastered|internal|limited|complete|'
+    r'multi|dual|subbed|dubbed'
+)
+
+_TOKEN_RE = re.compile(
+    # S01E01, S01.E01, S01E01E02, S01E01-E03, S01E01-03
+    _B + r's(?P<se_s>\d{1,3})[ ._-]*e(?P<se_e>\d{1,4})(?P<se_more>(?:-?e\d{1,4}|-\d{1,4})*)' + _E
+    # 1x01, 1x01-02
+    + r'|' + _B + r'(?P<x_s>\d{1,2})x(?P<x_e>\d{2,3})(?P<x_more>(?:[-x]\d{2,3})*)' + _E
+    # 1920x1080
+    + r'|' + _B + r'\d{3,4}x(?P<res_h>\d{3,4})' + _E
+    # 1080p, 2160p, 1080i, 4K, UHD
+    + r'|' + _B + r'(?P<res>\d{3,4}[pi]|4k|uhd)' + _E
+    # S01, Season 1, Season.01
+    + r'|' + _B_MARKER + r's(?:eason)?[ ._-]*(?P<s>\d{1,3})' + _E
+    # E01, Ep 1, Episode 01
+    + r'|' + _B_MARKER + r'(?:episode|ep|e)[ ._-]*(?P<e>\d{1,4})' + _E
+    + r'|' + _B + r'(?P<remux>(?:bd)?remux)' + _E
+    + r'|' + _B + r'(?P<year>19\d{2}|20\d{2})' + _E
+    # Absolute episode numbers as in "Show - 24 (1080p)", but not sizes as in "Show - 1.2GB"
+    + r'|' + r'(?<=\s-\s)(?P<abs>\d{1,4})' + _E + r'(?!\.\d)'
+    + r'|' + _B + r'(?P<tag>' + _TAG_WORDS + r')' + _E,
+    re.IGNORECASE
+)
+
+_EXTENSION_RE = re.compile(
+    r'\.(mkv|mp4|avi|m4v|mov|wmv|ts|m2ts|webm|flv|mpg|mpeg|srt|sub|idx|ass|nfo)$',
+    re.IGNORECASE
+)
+_LEADING_GROUP_RE = re.compile(r'^\s*\[(?P<group>[^\]]+)\]\s*')
+_TRAILING_GROUP_RE = re.compile(r'-(?P<group>[A-Za-z0-9]+)(?:\[[^\]]*\])?\s*$')
+_SEPARATORS_RE = re.compile(r'[._]+')
+_TITLE_EDGE_RE = re.compile(r'^[\s\-\[\(\{]+|[\s\-\[\(\{]+$')
+_WHITESPACE_RE = re.compile(r'\s+')
+_NUMBER_RE = re.compile(r'\d+')
+
+_RESOLUTION_HEIGHTS = {'2160': '2160p', '1080': '1080p', '720': '720p', '576': '576p', '480': '480p'}
+
+
+class ParsedRelease:
+    """
+    Metadata parsed from a release name.
+
+    Attributes:
+        title: Title text before the first release token
+        year: Release year as a string, or None
+        season: Season number, or None
+        episodes: Tuple of episode numbers (empty if none were found)
+        resolution: Normalized resolution such as '1080p' or '2160p', or None
+        remux: True if the name marks a remux
+        group: Release group, or None
+    """
+
+    __slots__ = ('title', 'year', 'season', 'episodes', 'resolution', 'remux', 'group')
+
+    def __init__(self, title: str, year: Optional[str] = None, season: Optional[int] = None,
+                 episodes: Tuple[int, ...] = (), resolution: Optional[str] = None,
+                 remux: bool = False, group: Optional[str] = None):
+        self.title = title
+        self.year = year
+        self.season = season
+        self.episodes = episodes
+        self.resolution = resolution
+        self.remux = remux
+        self.group = group
+
+    @property
+    def episode(self) -> Optional[int]:
+        """First episode number, or None."""
+        return self.episodes[0] if self.episodes else None
+
+    def __eq__(self, other):
+        if not isinstance(other, ParsedRelease):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"ParsedRelease({fields})"
+
+
+def _episode_list(first: str, more: Optional[str]) -> Tuple[int, ...]:
+    """Expand the episode part of a token ('01', '-E03') into episode numbers."""
+    start = int(first)
+    if not more:
+        return (start,)
+    numbers = [int(n) for n in _NUMBER_RE.findall(more)]
+    if len(numbers) == 1 and more.startswith('-') and numbers[0] > start:
+        # A range such as E01-E03 or E01-03
+        return tuple(range(start, numbers[0] + 1))
+    return (start, *numbers)
+
+
+def _resolution(match) -> str:
+    if match.group('res_h'):
+        height = match.group('res_h')
+        return _RESOLUTION_HEIGHTS.get(height, height + 'p')
+    res = match.group('res').lower()
+    if res in ('4k', 'uhd'):
+        return '2160p'
+    return res
+
+
+def _clean_title(text: str) -> str:
+    text = _SEPARATORS_RE.sub(' ', text)
+    text = _TITLE_EDGE_RE.sub('', text)
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+def parse_release(name: str) -> ParsedRelease:
+    """
+    Parse a release name in a single pass.
+
+    The title is the text before the first release token. A year directly
+    followed by another year ("Blade.Runner.2049.2017") is kept as part of
+    the title, and tokens at the very start of the name ("2012.1080p") are
+    treated as the title.
+
+    Args:
+        name: File or directory name (not a full path)
+
+    Returns:
+        ParsedRelease for the name
+    """
+    stem = _EXTENSION_RE.sub('', name)
+
+    group = None
+    start = 0
+    leading = _LEADING_GROUP_RE.match(stem)
+    if leading:
+        group = leading.group('group').strip()
+        start = leading.end()
+
+    year = None
+    season = None
+    episodes: Tuple[int, ...] = ()
+    resolution = None
+    remux = False
+    title_end = None
+    pending_year = None
+    found_token = False
+    title_started = False
+    last_token_end = start
+
+    for match in _TOKEN_RE.finditer(stem, start):
+        kind = match.lastgroup
+        found_token = True
+        last_token_end = match.end()
+        if not title_started:
+            title_started = bool(_clean_title(stem[start:match.start()]))
+        at_title_start = not title_started
+
+        if kind == 'year':
+            if title_end is None and not at_title_start:
+                # Only the last year in a run of years is the release year
+                pending_year = match
+            elif year is None and title_end is not None:
+                year = match.group('year')
+            continue
+
+        if title_end is None and not at_title_start:
+            title_end = pending_year.start() if pending_year else match.start()
+        if pending_year is not None and year is None:
+            year = pending_year.group('year')
+        pending_year = None
+
+        if kind in ('se_s', 'se_e', 'se_more'):
+            if season is None:
+                season = int(match.group('se_s'))
+            if not episodes:
+                episodes = _episode_list(match.group('se_e'), match.group('se_more'))
+        elif kind in ('x_s', 'x_e', 'x_more'):
+            if season is None:
+                season = int(match.group('x_s'))
+            if not episodes:
+                episodes = _episode_list(match.group('x_e'), match.group('x_more'))
+        elif kind == 's':
+            if season is None:
+                season = int(match.group('s'))
+        elif kind in ('e', 'abs'):
+            if not episodes:
+                episodes = (int(match.group(kind)),)
+        elif kind in ('res', 'res_h'):
+            if resolution is None:
+                resolution = _resolution(match)
+        elif kind == 'remux':
+            remux = True
+
+    if pending_year is not None:
+        if title_end is None:
+            title_end = pending_year.start()
+        if year is None:
+            year = pending_year.group('year')
+
+    if found_token and group is None:
+        trailing = _TRAILING_GROUP_RE.search(stem)
+        if trailing and trailing.start() >= last_token_end:
+            group = trailing.group('group')
+            if title_end is None:
+                title_end = trailing.start()
+
+    title = _clean_title(stem[start:title_end])
+    return ParsedRelease(title, year, season, episodes, resolution, remux, group)
@@ -16,22 +16,28 @@ import subprocess
 import csv
 import sqlite3
 from pathlib import Path
-from utils.plex_utils import refresh_selected_plex_libraries
-from utils.cleaning_patterns import patterns_to_remove, case_sensitive_patterns
-from utils.scan_logic import normalize_title, normalize_unicode
+
+# Ensure parent directory is in path for imports, so every module is loaded
+# once as src.* (caches and indexes in src.utils are shared by the whole app)
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from src.utils.plex_utils import refresh_selected_plex_libraries
+from src.utils.cleaning_engine import clean_title as _clean_title_compiled
+from src.utils.scan_logic import normalize_title, normalize_unicode
+from src.utils.parse_cache import memoize_parse
 
 # --- Add this helper function for consistent cleaning ---
 def clean_title_with_patterns(title):
-    for pattern in patterns_to_remove:
-        title = re.sub(pattern, ' ', title, flags=re.IGNORECASE)
-    for pattern in case_sensitive_patterns:
-        title = re.sub(pattern, ' ', title)  # No IGNORECASE here!
-    title = re.sub(r'\s+', ' ', title).strip()
-    return title
+    # Applies patterns_to_remove (IGNORECASE) then case_sensitive_patterns,
+    # using the precompiled engine in src/utils/cleaning_engine.py
+    return _clean_title_compiled(title)
 
 TMDB_FOLDER_ID = os.getenv("TMDB_FOLDER_ID", "false").lower() == "true"
 RESUME_TEMP_FILE = "/tmp/scanly_resume_path.txt"
 
+@memoize_parse('deduplicate_phrases')
 def deduplicate_phrases(title):
     """Remove repeated phrases from a title string, preserving order."""
     words = title.split()
@@ -59,6 +65,79 @@ def deduplicate_phrases(title):
             seen_words.add(word.lower())
     return ' '.join(final)
 
+@memoize_parse('folder_metadata', persist=True)
+def _parse_folder_metadata(folder_name):
+    """
+    Extract a clean title and year from a folder name.
+
+    Results are cached in memory and in the parse cache database, keyed by
+    folder name and the current parsing code.
+
+    Args:
+        folder_name: Raw folder name
+
+    Returns:
+        Tuple of (clean_title, year), where year is a string or None
+    """
+    # Find the first 4-digit year (1900-2099) anywhere in the folder name
+    year_match = re.search(r'(19\d{2}|20\d{2})', folder_name)
+    year = None
+    clean_title = folder_name
+    if year_match:
+        year = year_match.group(1)
+        # Remove the year and any separators around it from the title
+        clean_title = re.sub(r'[\.\s\-\_\(\)\[\]]*' + re.escape(year) + r'[\.\s\-\_\(\)\[\]]*', ' ', folder_name, count=1)
+    # Remove patterns to clean up the title
+    clean_title = clean_title_with_patterns(clean_title)
+    # --- Deduplicate repeated words/phrases ---
+    clean_title = deduplicate_phrases(clean_title)
+    # --- PATCH: Restore titles like "9-1-1 Lone Star" if original matches ---
+    if re.match(r'9-1-1(\.| )?Lone\.?Star', folder_name, re.IGNORECASE):
+        clean_title = "9-1-1 Lone Star"
+    if not clean_title.strip():
+        # Fallback: use the folder name (minus year) if cleaning wipes everything
+        clean_title = re.sub(r'[\.\s\-\_\(\)\[\]]*' + re.escape(year) + r'[\.\s\-\_\(\)\[\]]*', ' ', folder_name, count=1) if year else folder_name
+        clean_title = clean_title.strip()
+    
+    # Remove trailing season/volume number if year is unknown and title ends with a number
+    if (year is None or str(year).lower() == "unknown") and re.search(r'\b\d+$', clean_title):
+        known_numbered = [
+            r'^24$', r'^9-1-1(\s|$)', r'^60\s?Minutes', r'^90\s?Day\s?Fianc[eé]'
+        ]
+        if not any(re.match(pat, clean_title, re.IGNORECASE) for pat in known_numbered):
+            clean_title = re.sub(r'\b\d+$', '', clean_title).strip()
+    
+    # Always remove trailing season/volume number if title ends with a number and not a known numbered show
+    if re.search(r'\b\d+$', clean_title):
+        known_numbered = [
+            r'^24$', r'^9-1-1(\s|$)', r'^60\s?Minutes', r'^90\s?Day\s?Fianc[eé]'
+        ]
+        if not any(re.match(pat, clean_title, re.IGNORECASE) for pat in known_numbered):
+            clean_title = re.sub(r'\b\d+$', '', clean_title).strip()
+    
+    return clean_title, year
+
+@memoize_parse('csv_title', persist=True)
+def _parse_csv_title(title_part):
+    """
+    Extract a clean title and year from a file name without its extension.
+
+    Args:
+        title_part: File name without extension
+
+    Returns:
+        Tuple of (clean_title, year), where year is a string or None
+    """
+    year_match = re.search(r'(19\d{2}|20\d{2})', title_part)
+    year = year_match.group(1) if year_match else None
+
+    clean_title = title_part
+    if year:
+        clean_title = clean_title.replace(year, '').strip()
+    clean_title = clean_title_with_patterns(clean_title)
+    clean_title = normalize_unicode(clean_title)
+    return clean_title, year
+
 def save_resume_path(path):
     """Save the resume path to a temp file."""
     with open(RESUME_TEMP_FILE, "w") as f:
@@ -77,11 +156,6 @@ def sanitize_filename(name):
     """Replace problematic characters for cross-platform compatibility."""
     return re.sub(r'[:/\\]', '-', name)
 
-# Ensure parent directory is in path for imports
-parent_dir = os.path.dirname(os.path.dirname(__file__))
-if parent_dir not in sys.path:
-    sys.path.append(parent_dir)
-
 # ======================================================================
 # CRITICAL FIX: Silence problematic loggers BEFORE any imports
 # ======================================================================
@@ -159,7 +233,7 @@ def _update_env_var(name, value):
 
 # Try to load the TMDB API 
 try:
-    from src.api.tmdb import TMDB
+    from src.api.tmdb import TMDB, fill_tmdb_details, get_tmdb
     from src.config import TMDB_API_KEY, TMDB_BASE_URL
 except ImportError as e:
     logger.error(f"Error importing TMDB API: {e}. TMDB functionality will be disabled.")
@@ -185,6 +259,14 @@ except ImportError as e:
             logger.error("TMDB API not available. Cannot get TV details.")
             return {}
 
+    _stub_tmdb = TMDB()
+
+    def get_tmdb():
+        return _stub_tmdb
+
+    def fill_tmdb_details(metadata, content_type='movie'):
+        return metadata
+
 # Get destination directory from environment variables
 DESTINATION_DIRECTORY = os.environ.get('DESTINATION_DIRECTORY', '')
 
@@ -204,88 +286,84 @@ def _clean_directory_path(path):
     
     return path
 
-# Import utility functions for scan history
-SCAN_HISTORY_FILE = os.path.join(os.path.dirname(__file__), 'scan_history.txt')
-SCAN_HISTORY_DB = os.path.join(os.path.dirname(__file__), 'scan_history.db')
-
-def _init_scan_history_db():
-    """Initialize the scan history database if it doesn't exist."""
-    conn = sqlite3.connect(SCAN_HISTORY_DB)
-    c = conn.cursor()
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS archived_scan_history (
-            path TEXT PRIMARY KEY,
-            archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    conn.commit()
-    conn.close()
+# The chosen TMDB entry travels with the item (see src/models/media_metadata.py)
+from src.models.media_metadata import MediaMetadata
+
+# Folders tagged with a database ID skip the search flow (see src/core/id_resolver.py)
+from src.core.id_resolver import resolve_tagged
+
+# Headless identification for auto mode (see src/core/identify.py)
+from src.core.identify import AUTO_BATCH_SIZE, identify_folders
+
+# Two-phase interactive scan: identify everything, then review (see src/core/scan_jobs.py)
+from src.core.scan_jobs import (
+    AMBIGUOUS,
+    DEFERRED,
+    FAILED,
+    IDENTIFIED,
+    LINKED,
+    REUSABLE_STATES,
+    SKIPPED,
+    TWO_PHASE_SCAN,
+    ScanJob,
+    folder_mtime,
+    get_scan_job_store,
+)
 
-def archive_scan_history_txt_to_db():
-    """Move all items from scan_history.txt to the database if there are 100 or more, then clear the file."""
-    if not os.path.exists(SCAN_HISTORY_FILE):
-        return
+# Unchanged folders settled by an earlier scan are skipped (see src/utils/folder_fingerprints.py)
+from src.utils.folder_fingerprints import (
+    LINKED as FOLDER_LINKED,
+    SKIPPED as FOLDER_SKIPPED,
+    get_folder_fingerprints,
+    remember_outcome,
+)
 
-    with open(SCAN_HISTORY_FILE, 'r') as f:
-        lines = [line.strip() for line in f if line.strip()]
+# Scans run as a generator pipeline (see src/core/scan_pipeline.py)
+from src.core.scan_pipeline import (
+    FolderStream,
+    ScanProgress,
+    identify_batches,
+    media_folders,
+    unprocessed_folders,
+)
 
-    if len(lines) < 100:
-        return
+# Look-ahead preparation of upcoming folders in the interactive scan
+from src.core.prefetch import FolderPrefetcher
 
-    _init_scan_history_db()
-    conn = sqlite3.connect(SCAN_HISTORY_DB)
-    c = conn.cursor()
-    for path in lines:
-        try:
-            c.execute('INSERT OR IGNORE INTO archived_scan_history (path) VALUES (?)', (path,))
-        except Exception:
-            pass
-    conn.commit()
-    conn.close()
+# Links in the destination are indexed by source (see src/utils/link_index.py)
+from src.utils.link_index import forget_link, get_link_index, record_link
 
-    # Clear the txt file after archiving
-    with open(SCAN_HISTORY_FILE, 'w') as f:
-        pass
+# Release names are parsed in one pass (see src/extractors/release_parser.py)
+from src.extractors.release_parser import parse_release
+
+# Scan history is kept in a single batched SQLite store (see src/utils/scan_history_utils.py)
+from src.utils.scan_history_utils import (
+    SCAN_HISTORY_FILE,
+    SCAN_HISTORY_DB,
+    get_scan_history_store,
+    get_scan_history_set,
+)
+
+def archive_scan_history_txt_to_db():
+    """Flush pending scan history writes to the database."""
+    get_scan_history_store().flush()
 
 def is_path_in_archived_history(path):
-    """Check if a path is in the archived scan history database."""
-    _init_scan_history_db()
-    conn = sqlite3.connect(SCAN_HISTORY_DB)
-    c = conn.cursor()
-    c.execute('SELECT 1 FROM archived_scan_history WHERE path=?', (path,))
-    result = c.fetchone()
-    conn.close()
-    return result is not None
-
-# Update load_scan_history_set to check both txt and db
+    """Check if a path is in the scan history database."""
+    return get_scan_history_store().is_processed(path)
+
 def load_scan_history_set():
-    """Load processed file paths from scan_history.txt and archived DB as a set."""
-    paths = set()
-    if os.path.exists(SCAN_HISTORY_FILE):
-        with open(SCAN_HISTORY_FILE, 'r') as f:
-            paths.update(line.strip() for line in f if line.strip())
-    # Add archived paths from DB
-    _init_scan_history_db()
-    conn = sqlite3.connect(SCAN_HISTORY_DB)
-    c = conn.cursor()
-    c.execute('SELECT path FROM archived_scan_history')
-    db_paths = c.fetchall()
-    conn.close()
-    paths.update(row[0] for row in db_paths)
-    return paths
-
-def is_any_media_file_in_scan_history(folder_path, scan_history_set):
+    """Load processed file paths from the scan history database as a set."""
+    return get_scan_history_store().load_paths()
+
+def is_any_media_file_in_scan_history(folder_path, scan_history_set=None):
     """
-    Returns True if any media file in the given folder (recursively) is present in scan_history_set.
+    Returns True if any media file in the given folder (recursively) is in the scan history.
+
+    Uses the history store's parent-directory index, so the folder is not walked.
+    scan_history_set is accepted for backward compatibility and ignored.
     """
-    media_exts = ('.mkv', '.mp4', '.avi', '.mov', '.wmv', '.flv')
-    for root, dirs, files in os.walk(folder_path):
-        for file in files:
-            if file.lower().endswith(media_exts):
-                full_path = os.path.join(root, file)
-                if full_path in scan_history_set:
-                    return True
-    return False
+    return get_scan_history_store().has_media_under(folder_path)
 
 # Clean directory path
 def _clean_directory_path(path):
@@ -303,15 +381,9 @@ def _clean_directory_path(path):
     
     return path
 
-# Import utility functions for scan history
-SCAN_HISTORY_FILE = os.path.join(os.path.dirname(__file__), 'scan_history.txt')
-
 def append_to_scan_history(path):
-    """Append a processed file path to scan_history.txt and update global set."""
-    with open(SCAN_HISTORY_FILE, 'a') as f:
-        f.write(f"{path}\n")
+    """Record a processed path in the scan history store and update global set."""
     GLOBAL_SCAN_HISTORY_SET.add(path)
-    archive_scan_history_txt_to_db()  # <-- Add this line
 
 def load_scan_history():
     """Load scan history from file."""
@@ -382,11 +454,22 @@ def save_skipped_items(items):
         logger.error(f"Error saving skipped items: {e}")
         return False
 
+def forget_skip(folder_path):
+    """Let the next scan offer a skipped folder again, though it is unchanged."""
+    fingerprints = get_folder_fingerprints()
+    if fingerprints is not None:
+        folder_path = os.path.normpath(folder_path)
+        fingerprints.clear_outcome(FOLDER_SKIPPED, os.path.dirname(folder_path), os.path.basename(folder_path))
+
 def clear_skipped_items():
     """Clear all skipped items from the registry."""
     global skipped_items_registry
     skipped_items_registry = []
     save_skipped_items(skipped_items_registry)
+    # Skipped folders are settled until their fingerprint changes; offer them again
+    fingerprints = get_folder_fingerprints()
+    if fingerprints is not None:
+        fingerprints.clear_outcome(FOLDER_SKIPPED)
     print("\nAll skipped items have been cleared.")
     input("\nPress Enter to continue...")
 
@@ -399,6 +482,10 @@ def clear_all_history():
     """Clear both scan history and skipped items."""
     clear_scan_history()
     clear_skipped_items()
+    # Folders settled by earlier scans are looked at again
+    fingerprints = get_folder_fingerprints()
+    if fingerprints is not None:
+        fingerprints.clear()
     print("\nAll history has been cleared.")
     input("\nPress Enter to continue...")
     clear_screen()
@@ -408,11 +495,10 @@ def clear_all_history():
 skipped_items_registry = load_skipped_items()
 
 # --- GLOBAL: Load scan history set at startup ---
-GLOBAL_SCAN_HISTORY_SET = set()
+# Compact hash-based view of the history; membership hits are confirmed against the store.
+GLOBAL_SCAN_HISTORY_SET = get_scan_history_set()
 def reload_global_scan_history():
-    global GLOBAL_SCAN_HISTORY_SET
-    GLOBAL_SCAN_HISTORY_SET = load_scan_history_set()
-reload_global_scan_history()
+    GLOBAL_SCAN_HISTORY_SET.reload()
 
 # Function to clear the screen - updating to remove excessive newlines
 def clear_screen():
@@ -506,8 +592,10 @@ def review_skipped_items():
                     # Actual processing would happen here
                     
                     # Remove from skipped items after processing
-                    skipped_items_registry.pop(item_idx)
+                    item = skipped_items_registry.pop(item_idx)
                     save_skipped_items(skipped_items_registry)
+                    # The skip no longer settles the folder, so scans offer it again
+                    forget_skip(item['path'])
                 else:
                     print("\nInvalid item number.")
             except ValueError:
@@ -547,7 +635,8 @@ try:
         send_monitored_item_notification,
         send_symlink_creation_notification,
         send_symlink_deletion_notification,
-        send_symlink_repair_notification
+        send_symlink_repair_notification,
+        queue_symlink_creation_notification
     )
     webhook_available = True
 except Exception as e:
@@ -563,6 +652,10 @@ except Exception as e:
         logger.error("Webhook functionality is not available")
         return False
         
+    def queue_symlink_creation_notification(metadata, symlink_path):
+        logger.error("Webhook functionality is not available")
+        return False
+        
     def send_symlink_deletion_notification(media_name, year, poster, description, original_path, symlink_path):
         logger.error("Webhook functionality is not available")
         return False
@@ -608,6 +701,12 @@ class DirectoryProcessor:
         # Use the global scan history set
         self.processed_paths = GLOBAL_SCAN_HISTORY_SET
         
+        # Counters for the last run (auto mode)
+        self.processed_files = 0
+        self.errors = 0
+        self.skipped = 0
+        self.review_queued = 0
+        
         # Initialize detection state variables
         self._detected_content_type = None
         self._detected_tmdb_id = None
@@ -618,7 +717,7 @@ class DirectoryProcessor:
         Returns a list of matching entries.
         """
         from src.utils.scan_logic import normalize_title
-        import re
+        from src.utils.scanner_index import get_scanner_index
 
         # Normalize year: treat None, "", "Unknown", "unknown" as no year
         if not year or str(year).lower() == "unknown":
@@ -644,27 +743,8 @@ class DirectoryProcessor:
         for scanner_file in scanner_files:
             if not os.path.exists(scanner_file):
                 continue
-            with open(scanner_file, 'r', encoding='utf-8') as file:
-                for line in file:
-                    entry = line.strip()
-                    if not entry or entry.startswith('#'):
-                        continue
-
-                    # Remove TMDB ID
-                    entry_wo_tmdb = re.sub(r'\s*\{tmdb-\d+\}', '', entry)
-                    # Extract title and year
-                    m = re.match(r'^(.*?)\s+\((\d{4})\)$', entry_wo_tmdb)
-                    if m:
-                        scanner_title = m.group(1)
-                        scanner_year = m.group(2)
-                    else:
-                        scanner_title = entry_wo_tmdb.strip()
-                        scanner_year = None
-
-                    normalized_scanner_title = normalize_title(scanner_title)
-                    if normalized_input_title == normalized_scanner_title:
-                        if not year or not scanner_year or str(year) == str(scanner_year):
-                            matches.append(entry)
+            index = get_scanner_index(scanner_file)
+            matches.extend(entry.line for entry in index.lookup(normalized_input_title, year))
 
         return matches
     
@@ -674,43 +754,8 @@ class DirectoryProcessor:
         return normalize_title(title1) == normalize_title(title2)
 
     def _extract_folder_metadata(self, folder_name):
-        # Find the first 4-digit year (1900-2099) anywhere in the folder name
-        year_match = re.search(r'(19\d{2}|20\d{2})', folder_name)
-        year = None
-        clean_title = folder_name
-        if year_match:
-            year = year_match.group(1)
-            # Remove the year and any separators around it from the title
-            clean_title = re.sub(r'[\.\s\-\_\(\)\[\]]*' + re.escape(year) + r'[\.\s\-\_\(\)\[\]]*', ' ', folder_name, count=1)
-        # Remove patterns to clean up the title
-        clean_title = clean_title_with_patterns(clean_title)
-        # --- Deduplicate repeated words/phrases ---
-        clean_title = deduplicate_phrases(clean_title)
-        # --- PATCH: Restore titles like "9-1-1 Lone Star" if original matches ---
-        if re.match(r'9-1-1(\.| )?Lone\.?Star', folder_name, re.IGNORECASE):
-            clean_title = "9-1-1 Lone Star"
-        if not clean_title.strip():
-            # Fallback: use the folder name (minus year) if cleaning wipes everything
-            clean_title = re.sub(r'[\.\s\-\_\(\)\[\]]*' + re.escape(year) + r'[\.\s\-\_\(\)\[\]]*', ' ', folder_name, count=1) if year else folder_name
-            clean_title = clean_title.strip()
+        clean_title, year = _parse_folder_metadata(folder_name)
         self.logger.debug(f"Original: '{folder_name}', Cleaned: '{clean_title}', Year: {year}")
-        
-        # Remove trailing season/volume number if year is unknown and title ends with a number
-        if (year is None or str(year).lower() == "unknown") and re.search(r'\b\d+$', clean_title):
-            known_numbered = [
-                r'^24$', r'^9-1-1(\s|$)', r'^60\s?Minutes', r'^90\s?Day\s?Fianc[eé]'
-            ]
-            if not any(re.match(pat, clean_title, re.IGNORECASE) for pat in known_numbered):
-                clean_title = re.sub(r'\b\d+$', '', clean_title).strip()
-        
-        # Always remove trailing season/volume number if title ends with a number and not a known numbered show
-        if re.search(r'\b\d+$', clean_title):
-            known_numbered = [
-                r'^24$', r'^9-1-1(\s|$)', r'^60\s?Minutes', r'^90\s?Day\s?Fianc[eé]'
-            ]
-            if not any(re.match(pat, clean_title, re.IGNORECASE) for pat in known_numbered):
-                clean_title = re.sub(r'\b\d+$', '', clean_title).strip()
-        
         return clean_title, year
     
     def _detect_if_tv_show(self, folder_name):
@@ -744,6 +789,37 @@ class DirectoryProcessor:
                 return True
         
         return False
+    
+    def _initial_folder_info(self, subfolder_name):
+        """
+        Detect title, year and content type for a subfolder before any user input.
+        
+        Returns:
+            Tuple of (title, year, is_tv, is_anime, is_wrestling)
+        """
+        title, year = self._extract_folder_metadata(subfolder_name)
+        is_tv = self._detect_if_tv_show(subfolder_name)
+        is_anime = self._detect_if_anime(subfolder_name)
+        is_wrestling = False
+        
+        # Apply default content type logic based on parent directory
+        default_flags = get_default_content_type_for_path(self.directory_path)
+        if default_flags:
+            is_tv, is_anime, is_wrestling = default_flags
+        return title, year, is_tv, is_anime, is_wrestling
+    
+    def _resolve_id_tag(self, subfolder_name, is_tv=False):
+        """
+        Resolve a subfolder by the TMDB/IMDb/TVDB ID tag in its name or its files' names.
+        
+        Returns:
+            MediaMetadata of the tagged title, or None if there is no usable tag
+        """
+        try:
+            file_names = sorted(os.listdir(os.path.join(self.directory_path, subfolder_name)))
+        except OSError:
+            file_names = []
+        return resolve_tagged([subfolder_name] + file_names, is_tv)
         
     def _prompt_for_content_type(self, current_is_tv, current_is_anime):
         """Helper method to prompt user for content type selection."""
@@ -856,8 +932,11 @@ class DirectoryProcessor:
         
         return season_number, episode_number, episode_name
 
-    def _display_folder_header(self, subfolder_name, title, year, content_type, search_term, tmdb_id_for_search, media_files_count, scanner_matches_count, current_index, total_items):
-        """Helper method to display consistent folder processing header without clearing screen."""
+    def _display_folder_header(self, subfolder_name, title, year, content_type, search_term, tmdb_id_for_search, media_files_count, scanner_matches_count, current_index, total_items, more_pending=False):
+        """Helper method to display consistent folder processing header without clearing screen.
+
+        With more_pending, total_items is a running count while the directory is still being listed.
+        """
         print("=" * 84)
         print("FOLDER PROCESSING".center(84))
         print("=" * 84)
@@ -880,15 +959,47 @@ class DirectoryProcessor:
         filled_len = int(bar_len * current_index // total_items)
         bar = '=' * filled_len + '-' * (bar_len - filled_len)
         percent = int(100 * current_index / total_items)
-        print(f"\nItem {current_index} of {total_items} [{bar}] {percent}%")
+        print(f"\nItem {current_index} of {total_items}{'+' if more_pending else ''} [{bar}] {percent}%")
         print("=" * 84)
 
-    def _create_symlinks(self, subfolder_path, title, year, is_tv=False, is_anime=False, is_wrestling=False, tmdb_id=None, season_number=None, episode_number=None, episode_name=None):
+    def _notification_metadata(self, metadata, title, year, tmdb_id, is_tv):
+        """
+        Metadata for the symlink notification of an item.
+        
+        Returns the chosen TMDB result if it is the entry being linked,
+        otherwise a MediaMetadata whose remaining fields the notification
+        thread looks up.
+        """
+        if metadata is not None and (metadata.matches(tmdb_id) or not tmdb_id):
+            return metadata
+        return MediaMetadata(title, year, tmdb_id, is_tv)
+
+    def _link_folder_name(self, base_name, tmdb_id, is_tv=False, is_wrestling=False):
+        """
+        Destination folder name: '<base name> {tmdb-N}', followed by
+        '[imdb-ttN]' / '[tvdb-N]' when IMDB_FOLDER_ID / TVDB_FOLDER_ID are enabled.
+        
+        The external IDs come from one TMDB request that also caches the
+        details (see TMDB.get_full_movie/get_full_tv).
+        """
+        if not tmdb_id:
+            return base_name
+        folder_name = f"{base_name} {{tmdb-{tmdb_id}}}"
+        if not is_wrestling:
+            ids = fill_tmdb_details({'tmdb_id': tmdb_id}, 'tv' if is_tv else 'movie')
+            if ids.get('imdb_id'):
+                folder_name += f" [imdb-{ids['imdb_id']}]"
+            if ids.get('tvdb_id'):
+                folder_name += f" [tvdb-{ids['tvdb_id']}]"
+        return folder_name
+
+    def _create_symlinks(self, subfolder_path, title, year, is_tv=False, is_anime=False, is_wrestling=False, tmdb_id=None, season_number=None, episode_number=None, episode_name=None, metadata=None):
         """
         Create symlinks from the source directory to the destination directory.
         For TV/Anime Series, creates a symlink for each episode in the format:
         'MEDIA TITLE (YEAR) {tmdb-TMDB_ID}' / 'Season X' / 'MEDIA TITLE (YEAR) - SXXEXX.ext'
-        Sends one webhook per subfolder processed.
+        Sends one webhook per subfolder processed, in the background, using
+        `metadata` (the chosen TMDB result) when it matches tmdb_id.
 
         CRITICAL FIX: Only process files that are NOT in scan history.
         """
@@ -903,7 +1014,7 @@ class DirectoryProcessor:
                 self.logger.info(f"Created destination directory: {DESTINATION_DIRECTORY}")
 
             base_name = f"{title} ({year})" if year and not is_wrestling else title
-            folder_name = f"{base_name} {{tmdb-{tmdb_id}}}" if tmdb_id else base_name
+            folder_name = self._link_folder_name(base_name, tmdb_id, is_tv, is_wrestling)
             
             # Sanitize for filesystem safety
             safe_base_name = sanitize_filename(base_name)
@@ -973,11 +1084,11 @@ class DirectoryProcessor:
                                 episode_label = f"E{e_num:02d}"
                                 self.logger.info(f"DEBUG: Fallback to file index: S{s_num:02d}E{e_num:02d}")
                         else:
-                            # Fallback to regex extraction from filename
-                            ep_match = re.search(r'(?:[sS](\d{1,2}))?[\. _-]*[eE](\d{1,2})', file)
-                            if ep_match:
-                                s_num = int(ep_match.group(1)) if ep_match.group(1) else 1
-                                e_num = int(ep_match.group(2))
+                            # Fallback to parsing season/episode from the filename
+                            parsed = parse_release(file)
+                            if parsed.episode is not None:
+                                s_num = parsed.season if parsed.season is not None else 1
+                                e_num = parsed.episode
                                 episode_label = f"E{e_num:02d}"
                             else:
                                 s_num = 1
@@ -1019,9 +1130,11 @@ class DirectoryProcessor:
                         if os.path.islink(dest_file_path) or os.path.exists(dest_file_path):
                             self.logger.info(f"DEBUG: Removing existing file/symlink: {dest_file_path}")
                             os.remove(dest_file_path)
+                            forget_link(dest_file_path)
                         if use_symlinks:
                             self.logger.info(f"DEBUG: Creating symlink from {source_file_path} to {dest_file_path}")
                             os.symlink(source_file_path, dest_file_path)
+                            record_link(dest_file_path, source_file_path)
                             self.logger.info(f"Created symlink: {dest_file_path} -> {source_file_path}")
                             print(f"📺 Created TV symlink: {dest_file_path}")
                         else:
@@ -1036,41 +1149,10 @@ class DirectoryProcessor:
 
                 # Send one webhook for the whole subfolder (first symlink as reference)
                 if processed_any and episode_symlinks:
-                    metadata = {}
-                    try:
-                        tmdb = TMDB()
-                        details = {}
-                        if tmdb_id:
-                            details = tmdb.get_tv_details(tmdb_id)
-                        else:
-                            results = tmdb.search_tv(title)
-                            details = results[0] if results else {}
-                        metadata['title'] = details.get('name') or title
-                        metadata['year'] = (details.get('first_air_date') or str(year or ""))[:4]
-                        metadata['description'] = details.get('overview', '')
-                        poster_path = details.get('poster_path')
-                        if poster_path:
-                            metadata['poster'] = f"https://image.tmdb.org/t/p/w500{poster_path}"
-                        else:
-                            metadata['poster'] = None
-                        metadata['tmdb_id'] = details.get('id') or tmdb_id
-                    except Exception as e:
-                        self.logger.warning(f"Could not fetch TMDB metadata: {e}")
-                        metadata = {
-                            'title': title,
-                            'year': year,
-                            'description': '',
-                            'poster': None,
-                            'tmdb_id': tmdb_id
-                        }
                     symlink_path = episode_symlinks[0] if episode_symlinks else target_dir_path
-                    send_symlink_creation_notification(
-                        metadata['title'],
-                        metadata['year'],
-                        metadata['poster'],
-                        metadata['description'],
-                        symlink_path,
-                        metadata['tmdb_id']
+                    queue_symlink_creation_notification(
+                        self._notification_metadata(metadata, title, year, tmdb_id, is_tv),
+                        symlink_path
                     )
 
             else:
@@ -1087,8 +1169,10 @@ class DirectoryProcessor:
                         dest_file_path = os.path.join(target_dir_path, dest_file_name)
                         if os.path.islink(dest_file_path) or os.path.exists(dest_file_path):
                             os.remove(dest_file_path)
+                            forget_link(dest_file_path)
                         if use_symlinks:
                             os.symlink(source_file_path, dest_file_path)
+                            record_link(dest_file_path, source_file_path)
                             self.logger.info(f"Created symlink: {dest_file_path} -> {source_file_path}")
                         else:
                             shutil.copy2(source_file_path, dest_file_path)
@@ -1099,43 +1183,13 @@ class DirectoryProcessor:
 
                 # Send one webhook for the movie folder
                 if processed_any:
-                    metadata = {}
-                    try:
-                        tmdb = TMDB()
-                        details = {}
-                        if tmdb_id:
-                            details = tmdb.get_movie_details(tmdb_id)
-                        else:
-                            results = tmdb.search_movie(title)
-                            details = results[0] if results else {}
-                        metadata['title'] = details.get('title') or title
-                        metadata['year'] = (details.get('release_date') or str(year or ""))[:4]
-                        metadata['description'] = details.get('overview', '')
-                        poster_path = details.get('poster_path')
-                        if poster_path:
-                            metadata['poster'] = f"https://image.tmdb.org/t/p/w500{poster_path}"
-                        else:
-                            metadata['poster'] = None
-                        metadata['tmdb_id'] = details.get('id') or tmdb_id
-                    except Exception as e:
-                        self.logger.warning(f"Could not fetch TMDB metadata: {e}")
-                        metadata = {
-                            'title': title,
-                            'year': year,
-                            'description': '',
-                            'poster': None,
-                            'tmdb_id': tmdb_id
-                        }
-                    send_symlink_creation_notification(
-                        metadata['title'],
-                        metadata['year'],
-                        metadata['poster'],
-                        metadata['description'],
-                        target_dir_path,
-                        metadata['tmdb_id']
+                    queue_symlink_creation_notification(
+                        self._notification_metadata(metadata, title, year, tmdb_id, is_tv),
+                        target_dir_path
                     )
 
             if processed_any:
+                remember_outcome(subfolder_path, FOLDER_LINKED)
                 self.logger.info(f"Successfully created links in: {target_dir_path}")
                 print(f"\nSuccessfully created links in: {target_dir_path}")
             else:
@@ -1148,7 +1202,7 @@ class DirectoryProcessor:
             print(f"\nError creating links: {e}")
             return False
 
-    def _create_symlink_for_single_file(self, file_path, title, year, is_tv=False, is_anime=False, is_wrestling=False, tmdb_id=None, season_number=None, episode_number=None, episode_name=None, ignore_scan_history=False):
+    def _create_symlink_for_single_file(self, file_path, title, year, is_tv=False, is_anime=False, is_wrestling=False, tmdb_id=None, season_number=None, episode_number=None, episode_name=None, ignore_scan_history=False, metadata=None):
         """
         Create a symlink for a single specific file (used in CSV import).
         This is different from _create_symlinks which processes all files in a directory.
@@ -1190,7 +1244,7 @@ class DirectoryProcessor:
 
             # Setup directory structure
             base_name = f"{title} ({year})" if year and not is_wrestling else title
-            folder_name = f"{base_name} {{tmdb-{tmdb_id}}}" if tmdb_id else base_name
+            folder_name = self._link_folder_name(base_name, tmdb_id, is_tv, is_wrestling)
             
             # Sanitize for filesystem safety
             safe_base_name = sanitize_filename(base_name)
@@ -1241,11 +1295,11 @@ class DirectoryProcessor:
                             episode_label = "E01"
                             ep_symlink_name = f"{base_name} - S{s_num:02d}E01{file_ext}"
                 else:
-                    # Fallback to regex extraction from filename
-                    ep_match = re.search(r'(?:[sS](\d{1,2}))?[\. _-]*[eE](\d{1,2})', filename)
-                    if ep_match:
-                        s_num = int(ep_match.group(1)) if ep_match.group(1) else 1
-                        e_num = int(ep_match.group(2))
+                    # Fallback to parsing season/episode from the filename
+                    parsed = parse_release(filename)
+                    if parsed.episode is not None:
+                        s_num = parsed.season if parsed.season is not None else 1
+                        e_num = parsed.episode
                         if s_num == 0:
                             # Season 0 episodes: "SHOW NAME (YEAR) - EPISODE_NUM.extension" (no S00 prefix)
                             ep_symlink_name = f"{base_name} - {e_num:02d}{file_ext}"
@@ -1270,10 +1324,12 @@ class DirectoryProcessor:
             # Remove existing file/symlink if it exists
             if os.path.islink(dest_file_path) or os.path.exists(dest_file_path):
                 os.remove(dest_file_path)
+                forget_link(dest_file_path)
 
             # Create symlink or copy
             if use_symlinks:
                 os.symlink(file_path, dest_file_path)
+                record_link(dest_file_path, file_path)
                 self.logger.info(f"Created symlink: {dest_file_path} -> {file_path}")
                 if is_tv:
                     print(f"📺 Created TV symlink: {os.path.basename(dest_file_path)}")
@@ -1292,60 +1348,10 @@ class DirectoryProcessor:
             append_to_scan_history(file_path)
 
             # Send notification
-            try:
-                from src.utils.webhooks import send_symlink_creation_notification
-                from src.api.tmdb import TMDB
-                
-                metadata = {}
-                try:
-                    tmdb = TMDB()
-                    details = {}
-                    if tmdb_id:
-                        if is_tv:
-                            details = tmdb.get_tv_details(tmdb_id)
-                        else:
-                            details = tmdb.get_movie_details(tmdb_id)
-                    else:
-                        if is_tv:
-                            results = tmdb.search_tv(title)
-                        else:
-                            results = tmdb.search_movie(title)
-                        details = results[0] if results else {}
-                    
-                    if is_tv:
-                        metadata['title'] = details.get('name') or title
-                        metadata['year'] = (details.get('first_air_date') or str(year or ""))[:4]
-                    else:
-                        metadata['title'] = details.get('title') or title
-                        metadata['year'] = (details.get('release_date') or str(year or ""))[:4]
-                    
-                    metadata['description'] = details.get('overview', '')
-                    poster_path = details.get('poster_path')
-                    if poster_path:
-                        metadata['poster'] = f"https://image.tmdb.org/t/p/w500{poster_path}"
-                    else:
-                        metadata['poster'] = None
-                    metadata['tmdb_id'] = details.get('id') or tmdb_id
-                except Exception as e:
-                    self.logger.warning(f"Could not fetch TMDB metadata: {e}")
-                    metadata = {
-                        'title': title,
-                        'year': year,
-                        'description': '',
-                        'poster': None,
-                        'tmdb_id': tmdb_id
-                    }
-                
-                send_symlink_creation_notification(
-                    metadata['title'],
-                    metadata['year'],
-                    metadata['poster'],
-                    metadata['description'],
-                    target_dir_path,
-                    metadata['tmdb_id']
-                )
-            except Exception as e:
-                self.logger.warning(f"Could not send notification: {e}")
+            queue_symlink_creation_notification(
+                self._notification_metadata(metadata, title, year, tmdb_id, is_tv),
+                target_dir_path
+            )
 
             return True
 
@@ -1354,206 +1360,449 @@ class DirectoryProcessor:
             print(f"\nError creating symlink: {e}")
             return False
     
+    def _in_scan_history(self, subfolder_path):
+        """True if any media file in the folder is in the scan history."""
+        return is_any_media_file_in_scan_history(subfolder_path, self.processed_paths)
+    
+    def _existing_link(self, subfolder_name, title, is_tv=False, tmdb_id=None):
+        """
+        Find a destination link that already holds a subfolder's content.
+        
+        Checks the link index for links into the folder, and for TV episode
+        folders also for the same episode linked from another source.
+        
+        Args:
+            subfolder_name: Folder name within self.directory_path
+            title: Cleaned folder title
+            is_tv: Whether the folder holds a TV show
+            tmdb_id: TMDB ID of the show, if known
+        
+        Returns:
+            Path of an existing link, or None
+        """
+        if not DESTINATION_DIRECTORY:
+            return None
+        try:
+            link_index = get_link_index()
+            links = link_index.links_to(os.path.join(self.directory_path, subfolder_name), limit=1)
+            if links:
+                return links[0]
+            if is_tv:
+                parsed = parse_release(subfolder_name)
+                if parsed.season is not None and parsed.episode is not None:
+                    existing = link_index.find_episode((title, parsed.title), parsed.season, parsed.episode, tmdb_id)
+                    if existing:
+                        return existing[0][0]
+        except Exception as e:
+            self.logger.warning(f"Error checking the link index for {subfolder_name}: {e}")
+        return None
+
+    def _auto_process_folders(self, subdirs, progress=None):
+        """
+        Process subfolders without prompts.
+        
+        Folders are identified in batches whose TMDB searches go out together
+        through the rate-limited client (see src/core/identify.py).
+        Those identified with at least AUTO_CONFIDENCE_THRESHOLD confidence and
+        a TMDB ID are linked; the rest are added to the skipped items registry for review
+        with their best guess. Folders whose content is already linked in the
+        destination are left alone.
+        
+        Args:
+            subdirs: Subfolder names within self.directory_path, or a stream
+                of them from the scan pipeline (see src/core/scan_pipeline.py)
+            progress: ScanProgress of the pipeline that filtered subdirs. Without
+                one, folders in the scan history are dropped here.
+        
+        Returns:
+            Number of folders linked
+        """
+        global skipped_items_registry
+        
+        self.processed_files = self.errors = self.skipped = self.review_queued = 0
+        if progress is None:
+            progress = ScanProgress()
+            subdirs = unprocessed_folders(subdirs, self.directory_path, progress, history=self._in_scan_history)
+        review_items = []
+        tmdb = get_tmdb()
+        start_time = time.time()
+        if DESTINATION_DIRECTORY:
+            # Link lookups wait for the build (see src/utils/link_index.py)
+            get_link_index().build_in_background(DESTINATION_DIRECTORY)
+        
+        def identify(subfolder_names):
+            return identify_folders(self, subfolder_names, tmdb)
+        
+        for subfolder_name, result in identify_batches(subdirs, identify, progress, AUTO_BATCH_SIZE):
+            progress.presented += 1
+            subfolder_path = os.path.join(self.directory_path, subfolder_name)
+            
+            existing = None
+            if not isinstance(result, Exception):
+                best = result.best
+                existing = self._existing_link(subfolder_name, result.title, result.is_tv,
+                                               best.metadata.tmdb_id if best else None)
+            
+            if isinstance(result, Exception):
+                self.logger.error(f"Auto mode: could not identify {subfolder_path}: {result}")
+                self.errors += 1
+            elif existing:
+                progress.linked += 1
+                self.logger.info(f"Auto mode: {subfolder_name} is already linked as {existing}")
+            elif not result.is_confident() or not result.best.metadata.tmdb_id:
+                best = result.best
+                self.review_queued += 1
+                guess = best.metadata if best else None
+                if result.is_confident():
+                    # A scanner list entry without a {tmdb-N} tag that TMDB didn't confirm
+                    result.reason = 'no_tmdb_id'
+                review_items.append({
+                    'subfolder': subfolder_name,
+                    'path': subfolder_path,
+                    'skipped_date': datetime.datetime.now().isoformat(),
+                    'reason': result.reason or 'low_confidence',
+                    'confidence': round(result.confidence, 3),
+                    'suggested_name': f"{guess.title} ({guess.year})" if guess else result.title,
+                    'tmdb_id': guess.tmdb_id if guess else None,
+                    'is_tv': result.is_tv,
+                    'is_anime': result.is_anime
+                })
+                # Not settled: an unattended guess isn't an operator's skip, so the
+                # folder is identified again by the next scan
+                self.logger.info(f"Auto mode: queued {subfolder_name} for review "
+                                 f"(confidence {result.confidence:.2f}, {result.reason})")
+            else:
+                best = result.best
+                metadata = best.metadata
+                if self._create_symlinks(subfolder_path, metadata.title, metadata.year, result.is_tv,
+                                         result.is_anime, False, metadata.tmdb_id, metadata=metadata):
+                    self.processed_files += 1
+                    append_to_scan_history(subfolder_path)
+                    self.logger.info(f"Auto mode: linked {subfolder_name} as {metadata.title} ({metadata.year}) "
+                                     f"{{tmdb-{metadata.tmdb_id}}}, confidence {result.confidence:.2f} ({best.source})")
+                else:
+                    self.errors += 1
+            
+            if progress.presented % 100 == 0:
+                print(f"Auto mode: {progress.summary()}; {self.processed_files} linked, "
+                      f"{self.review_queued} queued for review, {self.errors} errors "
+                      f"({time.time() - start_time:.0f}s)")
+        
+        self.skipped = progress.in_history + progress.linked
+        if review_items:
+            # Reload first: the registry may have been saved by another processor meanwhile.
+            # Folders queued by an earlier run are replaced, not listed twice.
+            queued = {item['path'] for item in review_items}
+            skipped_items_registry = [item for item in load_skipped_items()
+                                      if item.get('path') not in queued] + review_items
+            save_skipped_items(skipped_items_registry)
+        if self.processed_files:
+            trigger_plex_refresh()
+        self.logger.info(f"Auto mode finished {self.directory_path}: {progress.summary()}; "
+                         f"{self.processed_files} linked, {self.review_queued} queued for review, "
+                         f"{self.errors} errors")
+        return self.processed_files
+
+    def _identify_jobs(self, subdirs, progress):
+        """
+        Identify subfolders and record them in the scan job table, as a stream.
+        
+        Folders are identified in batches (see src/core/identify.py), ahead
+        of the consumer. Jobs stored by an earlier scan are reused while the
+        folder's modification time is unchanged. Every job is checked against
+        the destination link index, so the review knows which folders (or
+        episodes) are already linked. The index is built in the background if
+        needed, and jobs of deleted folders are dropped once the stream is
+        exhausted, so nothing proportional to the library delays the first job.
+        
+        Args:
+            subdirs: Subfolder names within self.directory_path, in any iterable
+            progress: ScanProgress to update
+        
+        Yields:
+            ScanJob for each folder, in the order of subdirs
+        """
+        store = get_scan_job_store()
+        tmdb = get_tmdb()
+        if DESTINATION_DIRECTORY:
+            # Link lookups wait for the build (see src/utils/link_index.py)
+            get_link_index().build_in_background(DESTINATION_DIRECTORY)
+        seen = set()
+        
+        def identify(subfolder_names):
+            stored = store.jobs(self.directory_path, subfolders=subfolder_names)
+            jobs = {}
+            fresh = []
+            for subfolder_name in subfolder_names:
+                mtime = folder_mtime(os.path.join(self.directory_path, subfolder_name))
+                job = stored.get(subfolder_name)
+                if job is not None and job.status in REUSABLE_STATES and job.mtime == mtime:
+                    if job.status == SKIPPED:
+                        # Unchanged skipped folders are dropped by the pipeline while their
+                        # skip is settled; reaching here means it was cleared, so ask again
+                        job.status = AMBIGUOUS
+                    jobs[subfolder_name] = job
+                else:
+                    fresh.append((subfolder_name, mtime))
+            results = identify_folders(self, [name for name, _ in fresh], tmdb)
+            for (subfolder_name, mtime), result in zip(fresh, results):
+                if isinstance(result, Exception):
+                    jobs[subfolder_name] = result
+                    continue
+                status = IDENTIFIED if result.is_confident() else AMBIGUOUS
+                jobs[subfolder_name] = ScanJob.from_identification(self.directory_path, result, status, mtime)
+            for job in jobs.values():
+                if isinstance(job, ScanJob):
+                    # Checked again for reused jobs: links may have been made since
+                    best = job.best
+                    job.existing = self._existing_link(job.subfolder, job.title, job.is_tv,
+                                                       best.tmdb_id if best else None)
+            return [jobs[name] for name in subfolder_names]
+        
+        for subfolder_name, job in identify_batches(subdirs, identify, progress, AUTO_BATCH_SIZE):
+            if isinstance(job, Exception):
+                self.logger.error(f"Could not identify {subfolder_name}: {job}")
+                job = ScanJob(self.directory_path, subfolder_name, FAILED)
+            seen.add(subfolder_name)
+            # Stored before it's acted on, so later status updates find the row
+            store.save([job])
+            yield job
+        
+        # The stream is exhausted: drop the jobs of folders deleted since an earlier
+        # scan. Only folders the pipeline didn't pass on need checking on disk.
+        gone = [name for name in store.subfolders(self.directory_path)
+                if name not in seen and not os.path.isdir(os.path.join(self.directory_path, name))]
+        if gone:
+            store.forget(self.directory_path, gone)
+    
+    def _link_job(self, job, metadata):
+        """
+        Link a scan job's folder as the given title and record the outcome.
+        
+        Args:
+            job: ScanJob
+            metadata: MediaMetadata of the chosen title
+        
+        Returns:
+            True if the symlinks were created
+        """
+        store = get_scan_job_store()
+        if self._create_symlinks(job.path, metadata.title, metadata.year, metadata.is_tv, job.is_anime,
+                                 job.is_wrestling, metadata.tmdb_id, metadata=metadata):
+            self.processed_files += 1
+            append_to_scan_history(job.path)
+            store.set_status(job.directory, job.subfolder, LINKED)
+            self.logger.info(f"Linked {job.subfolder} as {metadata.title} ({metadata.year}) {{tmdb-{metadata.tmdb_id}}}")
+            return True
+        self.errors += 1
+        store.set_status(job.directory, job.subfolder, FAILED)
+        return False
+    
+    def _review_folders(self, subdirs, progress):
+        """
+        Two-phase scan: identify folders ahead of the operator and ask only about ambiguous ones.
+        
+        Folders are identified in the background while earlier ones are
+        reviewed (see _identify_jobs). Confident matches are linked without a
+        prompt if the operator agrees up front, and ambiguous folders are shown
+        with their stored candidates, so no prompt waits on TMDB. Folders that
+        are already linked are never linked again without asking, and with
+        SKIP_SYMLINKED they aren't shown at all. Folders the
+        operator sends to the full menu, and folders that could not be
+        identified, are returned for the folder-by-folder loop.
+        
+        Args:
+            subdirs: Stream of subfolder names from the scan pipeline
+            progress: ScanProgress of the pipeline
+        
+        Returns:
+            Subfolder names for the full folder menu, or None if the operator
+            stopped the review
+        """
+        global skipped_items_registry
+        
+        self.processed_files = self.errors = self.skipped = self.review_queued = 0
+        store = get_scan_job_store()
+        auto_link = input("\nLink folders identified with confidence without asking? (y/n): ").strip().lower() == 'y'
+        skip_symlinked = os.environ.get('SKIP_SYMLINKED', 'false').lower() == 'true'
+        
+        deferred = []
+        skipped_now = []
+        stopped = False
+        jobs = self._identify_jobs(subdirs, progress)
+        try:
+            for job in jobs:
+                progress.presented += 1
+                if job.status in (FAILED, DEFERRED):
+                    deferred.append(job.subfolder)
+                    continue
+                if job.existing and skip_symlinked:
+                    progress.linked += 1
+                    store.set_status(job.directory, job.subfolder, LINKED)
+                    self.logger.info(f"Skipping {job.subfolder} - already linked as {job.existing}")
+                    continue
+                if job.status == IDENTIFIED and auto_link and not job.existing:
+                    best = job.best
+                    if self._link_job(job, best):
+                        print(f"[{progress.presented}/{progress.total}] Linked {job.subfolder} as "
+                              f"{best.title} ({best.year}), confidence {job.confidence:.2f}")
+                    continue
+                
+                content_type = 'Wrestling' if job.is_wrestling else 'TV Show' if job.is_tv else 'Movie'
+                print(f"\n[{progress.presented}/{progress.total}] {job.subfolder}")
+                print(f"  Detected: {job.title} ({job.year or 'no year'}), {content_type}, "
+                      f"confidence {job.confidence:.2f}")
+                shown = job.candidates[:5]
+                for number, (metadata, source, score) in enumerate(shown, 1):
+                    print(f"  {number}. {metadata.title} ({metadata.year or '?'}) {{tmdb-{metadata.tmdb_id}}} "
+                          f"[{source}, {score:.2f}]")
+                if not shown:
+                    print("  No candidates found")
+                if job.existing:
+                    print(f"  Already linked: {job.existing}")
+                
+                while True:
+                    if job.existing:
+                        prompt = (f"Enter=keep the existing link, {f'1-{len(shown)}=link again, ' if shown else ''}"
+                                  f"m=full menu, s=skip, q=stop review: ")
+                    elif shown:
+                        prompt = f"Enter=1, 1-{len(shown)}=link, m=full menu, s=skip, q=stop review: "
+                    else:
+                        prompt = "m=full menu, s=skip, q=stop review: "
+                    choice = input(prompt).strip().lower()
+                    if job.existing and choice == '':
+                        progress.linked += 1
+                        store.set_status(job.directory, job.subfolder, LINKED)
+                    elif shown and (choice == '' or (choice.isdigit() and 1 <= int(choice) <= len(shown))):
+                        self._link_job(job, shown[int(choice or 1) - 1][0])
+                    elif choice == 'm':
+                        deferred.append(job.subfolder)
+                        store.set_status(job.directory, job.subfolder, DEFERRED)
+                    elif choice == 's':
+                        best = job.best
+                        skipped_now.append({
+                            'subfolder': job.subfolder,
+                            'path': job.path,
+                            'skipped_date': datetime.datetime.now().isoformat(),
+                            'reason': job.reason or 'low_confidence',
+                            'confidence': round(job.confidence, 3),
+                            'suggested_name': f"{best.title} ({best.year})" if best else job.title,
+                            'tmdb_id': best.tmdb_id if best else None,
+                            'is_tv': job.is_tv,
+                            'is_anime': job.is_anime
+                        })
+                        self.review_queued += 1
+                        store.set_status(job.directory, job.subfolder, SKIPPED)
+                        remember_outcome(job.path, FOLDER_SKIPPED)
+                    elif choice == 'q':
+                        stopped = True
+                    else:
+                        print("Invalid option. Please try again.")
+                        continue
+                    break
+                if stopped:
+                    print("Review stopped; unreviewed folders are kept for the next scan.")
+                    break
+        finally:
+            jobs.close()
+        
+        self.skipped = progress.in_history + progress.linked
+        if skipped_now:
+            # Reload first: the registry may have been saved by another processor meanwhile
+            skipped_items_registry = load_skipped_items() + skipped_now
+            save_skipped_items(skipped_items_registry)
+        if self.processed_files:
+            trigger_plex_refresh()
+        self.logger.info(f"Two-phase scan of {self.directory_path}: {progress.summary()}; "
+                         f"{self.processed_files} linked, {self.review_queued} skipped, "
+                         f"{len(deferred)} for the full menu, {self.errors} errors")
+        print(f"\n{progress.summary()}")
+        print(f"{self.processed_files} folders linked, {self.review_queued} skipped, {self.errors} errors")
+        if stopped:
+            return None
+        return deferred
+
     def _process_media_files(self):
         """Process media files in the directory."""
         global skipped_items_registry
 
-        # --- Archive scan_history.txt if needed ---
-        archive_scan_history_txt_to_db()
-
         # --- Use the global scan history set ---
         processed_paths = self.processed_paths
+        prefetcher = None
 
         try:
             # Get allowed extensions from environment
             allowed_extensions = os.environ.get('ALLOWED_EXTENSIONS', '.mp4,.mkv,.srt,.avi,.mov,.divx').lower().split(',')
             allowed_extensions = [ext.strip() for ext in allowed_extensions if ext.strip()]
             
-            # Get all subdirectories that contain valid media files
-            all_subdirs = []
-            for d in os.listdir(self.directory_path):
-                dir_path = os.path.join(self.directory_path, d)
-                if os.path.isdir(dir_path):
-                    # Check if directory contains any valid media files
-                    has_media = False
-                    try:
-                        for file in os.listdir(dir_path):
-                            if os.path.isfile(os.path.join(dir_path, file)):
-                                file_ext = os.path.splitext(file)[1].lower()
-                                if file_ext in allowed_extensions and file_ext != '.srt':  # Exclude subtitle files
-                                    has_media = True
-                                    break
-                    except Exception as e:
-                        self.logger.warning(f"Error checking directory {d}: {e}")
-                        continue
-                    
-                    if has_media:
-                        all_subdirs.append(d)
-                    else:
-                        self.logger.info(f"Skipping directory {d} - no valid media files found (allowed: {allowed_extensions})")
-            
-            if not all_subdirs:
-                print("\nNo subdirectories found to process.")
-                input("\nPress Enter to continue...")
-                clear_screen()  # Clear screen when returning to main menu
-                display_ascii_art()  # Show ASCII art
-                return 0
-
-            print(f"Found {len(all_subdirs)} total subdirectories")
-            self.logger.info(f"Directory scan found {len(all_subdirs)} total subdirectories in {self.directory_path}")
-            
-            # Log some sample directory names for debugging
-            if len(all_subdirs) > 0:
-                sample_count = min(10, len(all_subdirs))
-                self.logger.info(f"Sample directories: {all_subdirs[:sample_count]}")
-                if len(all_subdirs) > 100:
-                    self.logger.warning(f"Very high directory count ({len(all_subdirs)}) - this might indicate individual files being treated as directories")
+            # Subfolders count if they hold media files (subtitles alone don't count)
+            media_extensions = [ext for ext in allowed_extensions if ext != '.srt']
             
             # Check SKIP_SYMLINKED setting to determine if we should pre-filter
             skip_symlinked = os.environ.get('SKIP_SYMLINKED', 'false').lower() == 'true'
-            
             if skip_symlinked:
-                print("Pre-filtering directories that already have symlinks...")
-                print("⚠️  This may take some time for large directories (4000+ items)")
-                print("    Building symlink cache for faster processing...")
-                
-                # Build a cache of all existing symlinks in destination (ONE-TIME OPERATION)
-                symlink_cache = {}
-                if DESTINATION_DIRECTORY and os.path.exists(DESTINATION_DIRECTORY):
-                    cache_start = time.time()
-                    print("Building symlink cache from destination directory...")
-                    try:
-                        for root, dirs, files in os.walk(DESTINATION_DIRECTORY):
-                            # Cache directory symlinks
-                            for d in dirs:
-                                dest_dir_path = os.path.join(root, d)
-                                if os.path.islink(dest_dir_path):
-                                    try:
-                                        real_path = os.path.realpath(dest_dir_path)
-                                        symlink_cache[real_path] = dest_dir_path
-                                    except Exception:
-                                        pass
-                            
-                            # Cache file symlinks
-                            for f in files:
-                                dest_file_path = os.path.join(root, f)
-                                if os.path.islink(dest_file_path):
-                                    try:
-                                        real_target = os.path.realpath(dest_file_path)
-                                        # Store parent directory of the target file
-                                        parent_dir = os.path.dirname(real_target)
-                                        if parent_dir not in symlink_cache:
-                                            symlink_cache[parent_dir] = []
-                                        if isinstance(symlink_cache[parent_dir], list):
-                                            symlink_cache[parent_dir].append(dest_file_path)
-                                        else:
-                                            symlink_cache[parent_dir] = [dest_file_path]
-                                    except Exception:
-                                        pass
-                    except Exception as e:
-                        print(f"Warning: Error building symlink cache: {e}")
-                    
-                    cache_time = time.time() - cache_start
-                    print(f"Symlink cache built in {cache_time:.1f}s ({len(symlink_cache)} entries)")
-                
-                subdirs_to_process = []
-                symlinked_count = 0
-                total_dirs = len(all_subdirs)
-                start_time = time.time()
-                
-                for i, subfolder_name in enumerate(all_subdirs):
-                    # Calculate time estimates
-                    if i > 0:
-                        elapsed_time = time.time() - start_time
-                        avg_time_per_dir = elapsed_time / i
-                        remaining_dirs = total_dirs - i
-                        estimated_remaining = avg_time_per_dir * remaining_dirs
-                        
-                        # Format time estimates
-                        def format_time(seconds):
-                            if seconds < 60:
-                                return f"{int(seconds)}s"
-                            elif seconds < 3600:
-                                return f"{int(seconds/60)}m {int(seconds%60)}s"
-                            else:
-                                return f"{int(seconds/3600)}h {int((seconds%3600)/60)}m"
-                        
-                        eta_str = format_time(estimated_remaining)
-                    else:
-                        eta_str = "calculating..."
-                    
-                    # Show progress every 10 directories or at the end
-                    if i % 50 == 0 or i == total_dirs - 1:
-                        progress_percent = int((i + 1) / total_dirs * 100)
-                        bar_length = 40
-                        filled_length = int(bar_length * (i + 1) // total_dirs)
-                        bar = '█' * filled_length + '░' * (bar_length - filled_length)
-                        print(f"\rProgress: [{bar}] {progress_percent}% ({i + 1}/{total_dirs}) - Found {symlinked_count} with symlinks - ETA: {eta_str}", end='', flush=True)
-                    
-                    subfolder_path = os.path.join(self.directory_path, subfolder_name)
-                    
-                    # Fast symlink check using cache
-                    has_symlink = False
-                    real_subfolder_path = os.path.realpath(subfolder_path)
-                    
-                    # Check if directory itself is symlinked
-                    if real_subfolder_path in symlink_cache:
-                        has_symlink = True
-                    
-                    # Check if any files in this directory are symlinked
-                    if not has_symlink and real_subfolder_path in symlink_cache:
-                        cache_entry = symlink_cache[real_subfolder_path]
-                        if isinstance(cache_entry, list) and cache_entry:
-                            has_symlink = True
-                    
-                    if has_symlink:
-                        symlinked_count += 1
-                        self.logger.info(f"Pre-filtering: Skipping {subfolder_name} - symlinks already exist")
-                    else:
-                        subdirs_to_process.append(subfolder_name)
-                
-                total_time = time.time() - start_time
-                print(f"\nFiltering completed in {int(total_time/60)}m {int(total_time%60)}s")
-                print(f"After filtering: {len(subdirs_to_process)} directories to process, {symlinked_count} already have symlinks")
-                subdirs = subdirs_to_process
+                # Existing links are looked up in the persistent destination link index,
+                # built in the background while the first folders are listed
+                get_link_index().build_in_background(DESTINATION_DIRECTORY)
             else:
                 print("Symlink pre-filtering disabled")
-                subdirs = all_subdirs
-
-            if not subdirs:
-                print("\nNo directories need processing (all already have symlinks).")
-                input("\nPress Enter to continue...")
-                clear_screen()
-                display_ascii_art()
-                return 0
-
-            print(f"Will process {len(subdirs)} subdirectories")
+            
+            # The scan is a generator pipeline (see src/core/scan_pipeline.py): folders
+            # are listed, filtered and handed on one at a time, so the first one is
+            # ready while the rest of the directory is still being listed. The
+            # unattended flows drop folders in the scan history; the folder loop
+            # below asks about them instead.
+            progress = ScanProgress()
+            fingerprints = get_folder_fingerprints()
+            history = self._in_scan_history if (self.auto_mode or TWO_PHASE_SCAN) else None
+            subdirs = unprocessed_folders(
+                media_folders(self.directory_path, media_extensions, progress, fingerprints),
+                self.directory_path, progress, history=history, skip_linked=skip_symlinked,
+                fingerprints=fingerprints
+            )
+            print(f"Scanning {self.directory_path}...")
+
+            if self.auto_mode:
+                return self._auto_process_folders(subdirs, progress)
 
             # Track progress
             processed = 0
 
-            for subfolder_name in subdirs:
+            if TWO_PHASE_SCAN:
+                # Only folders sent to the full menu go through the loop below
+                deferred = self._review_folders(subdirs, progress)
+                processed = self.processed_files
+                if not deferred:
+                    input("\nPress Enter to continue...")
+                    clear_screen()
+                    display_ascii_art()
+                    return processed
+                print(f"\n{len(deferred)} folders left for the full folder menu")
+                subdirs = deferred
+                progress = ScanProgress()
+                progress.queued = len(deferred)
+                progress.enumerated = True
+
+            # Prepare the next few folders while the current one is reviewed
+            subdirs = FolderStream(subdirs)
+            prefetcher = FolderPrefetcher(self, get_tmdb())
+
+            for folder_index, subfolder_name in enumerate(subdirs):
+                prefetcher.advance(subdirs.peek(prefetcher.lookahead))
+                progress.presented = folder_index + 1
                 subfolder_path = os.path.join(self.directory_path, subfolder_name)
                 
                 self.logger.info(f"DEBUG: Starting to process subfolder: {subfolder_name}")
                 print(f"DEBUG: Processing folder: {subfolder_name}")
 
                 # Initialize variables early to avoid scope issues
-                title, year = self._extract_folder_metadata(subfolder_name)
-                is_tv = self._detect_if_tv_show(subfolder_name)
-                is_anime = self._detect_if_anime(subfolder_name)
-                is_wrestling = False
+                title, year, is_tv, is_anime, is_wrestling = self._initial_folder_info(subfolder_name)
                 tmdb_id = None
                 
                 # Initialize season/episode variables
                 season_number = None
                 episode_number = None
                 episode_name = None
-                
-                # Apply default content type logic based on parent directory
-                default_flags = get_default_content_type_for_path(self.directory_path)
-                if default_flags:
-                    is_tv, is_anime, is_wrestling = default_flags
 
                 # --- CHECK if any media file in subfolder is in scan history ---
                 scan_history_check = is_any_media_file_in_scan_history(subfolder_path, processed_paths)
@@ -1592,36 +1841,22 @@ class DirectoryProcessor:
                 self.logger.info(f"DEBUG: Checking for existing symlinks in destination for {subfolder_name}")
                 if DESTINATION_DIRECTORY and os.path.exists(DESTINATION_DIRECTORY):
                     # Extract episode info from folder name to check for existing episodes
-                    is_tv_episode = is_tv and re.search(r'[sS](\d+)[eE](\d+)', subfolder_name)
+                    parsed = parse_release(subfolder_name)
+                    is_tv_episode = is_tv and parsed.season is not None and parsed.episode is not None
                     if is_tv_episode:
                         # For TV episodes, check if this episode already exists
-                        season_match = re.search(r'[sS](\d+)[eE](\d+)', subfolder_name)
-                        if season_match:
-                            season_num = int(season_match.group(1))
-                            episode_num = int(season_match.group(2))
-                            
-                            # Check for existing episode in destination using cleaned title
-                            tv_series_dir = os.path.join(DESTINATION_DIRECTORY, "TV Series")
-                            if os.path.exists(tv_series_dir):
-                                for show_folder in os.listdir(tv_series_dir):
-                                    show_path = os.path.join(tv_series_dir, show_folder)
-                                    if os.path.isdir(show_path):
-                                        # Check if this could be the same show (basic title matching)
-                                        if any(word.lower() in show_folder.lower() for word in title.split() if len(word) > 3):
-                                            season_folder = f"Season {season_num}"
-                                            season_path = os.path.join(show_path, season_folder)
-                                            if os.path.exists(season_path):
-                                                # Look for existing episode file
-                                                for episode_file in os.listdir(season_path):
-                                                    episode_match = re.search(rf'[sS]{season_num:02d}[eE]{episode_num:02d}', episode_file)
-                                                    if episode_match:
-                                                        already_processed = True
-                                                        self.logger.info(f"DEBUG: Found existing episode S{season_num:02d}E{episode_num:02d}: {episode_file}")
-                                                        break
-                                            if already_processed:
-                                                break
-                                    if already_processed:
-                                        break
+                        season_num = parsed.season
+                        episode_num = parsed.episode
+                        
+                        # Look the episode up in the destination episode index
+                        link_index = get_link_index()
+                        link_index.ensure_built(DESTINATION_DIRECTORY)
+                        existing = link_index.find_episode((title, parsed.title), season_num, episode_num)
+                        if existing:
+                            already_processed = True
+                            link_path, quality = existing[0]
+                            self.logger.info(f"DEBUG: Found existing episode S{season_num:02d}E{episode_num:02d}: "
+                                             f"{link_path} ({quality or 'unknown quality'})")
                     else:
                         # For non-TV or non-episode content, check if any media files are symlinked
                         for root, dirs, files in os.walk(subfolder_path):
@@ -1664,6 +1899,19 @@ class DirectoryProcessor:
                             self.logger.info(f"DEBUG: User chose to proceed despite already processed")
                 # --- SKIP LOGIC END ---
 
+                # --- Fast path: the folder or its files carry a TMDB/IMDb/TVDB ID ---
+                tagged = None if is_wrestling else self._resolve_id_tag(subfolder_name, is_tv)
+                if tagged is not None:
+                    title, year, tmdb_id, is_tv = tagged.title, tagged.year, tagged.tmdb_id, tagged.is_tv
+                    print(f"\n🏷️  ID tag found: {title} ({year}) {{tmdb-{tmdb_id}}}")
+                    if self._create_symlinks(subfolder_path, title, year, is_tv, is_anime, is_wrestling, tmdb_id, season_number, episode_number, episode_name, metadata=tagged):
+                        processed += 1
+                        append_to_scan_history(subfolder_path)
+                        trigger_plex_refresh()
+                        print(f"\n✅ Successfully processed: {title} ({year})")
+                        continue
+                    print(f"\n❌ Failed to create symlinks for tagged folder, continuing with manual review")
+
                 # --- NEW: Skip if any symlinked file for this subfolder exists in destination ---
                 # Initialize search_term before using it
                 search_term = title
@@ -1685,27 +1933,10 @@ class DirectoryProcessor:
                         content_type = "TV Series"
 
                     # --- NEW: Display TMDB ID for search term ---
-                    tmdb_id_for_search = None
+                    # Resolved from the local ID index when possible, else by a live search
                     try:
-                        tmdb = TMDB()
-                        if content_type in ("TV Series", "Anime Series"):
-                            if year:
-                                tmdb_results = tmdb.search_tv(search_term, year=year)
-                            else:
-                                tmdb_results = tmdb.search_tv(search_term)
-                            if tmdb_results:
-                                tmdb_id_for_search = tmdb_results[0].get('id')
-                                tmdb_title = tmdb_results[0].get('name')
-                                tmdb_year = (tmdb_results[0].get('first_air_date') or '')[:4]
-                        else:
-                            if year:
-                                tmdb_results = tmdb.search_movie(search_term, year=year)
-                            else:
-                                tmdb_results = tmdb.search_movie(search_term)
-                            if tmdb_results:
-                                tmdb_id_for_search = tmdb_results[0].get('id')
-                                tmdb_title = tmdb_results[0].get('title')
-                                tmdb_year = (tmdb_results[0].get('release_date') or '')[:4]
+                        media_type = 'tv' if content_type in ("TV Series", "Anime Series") else 'movie'
+                        tmdb_id_for_search = get_tmdb().resolve_id(search_term, year, media_type)
                     except Exception as e:
                         tmdb_id_for_search = None
 
@@ -1718,17 +1949,14 @@ class DirectoryProcessor:
                     
                     if year == "Unknown":
                         year = None
-                    scanner_matches = self._check_scanner_lists(search_term, year, is_tv, is_anime)
+                    scanner_matches = prefetcher.scanner_matches(search_term, year, is_tv, is_anime)
                     
                     # Show current item count and progress
-                    current_index = subdirs.index(subfolder_name) + 1
-                    total_items = len(subdirs)
-                    
                     # Use the new header function
                     self._display_folder_header(
                         subfolder_name, title, year, content_type, search_term, 
                         tmdb_id_for_search, len(media_files), len(scanner_matches),
-                        current_index, total_items
+                        folder_index + 1, progress.queued, more_pending=not progress.enumerated
                     )
 
                     # Prompt user if multiple scanner matches
@@ -1794,7 +2022,7 @@ class DirectoryProcessor:
                         # --- TMDB search for the current search term (top 5 results, title only) ---
                         tmdb_results = []
                         try:
-                            tmdb = TMDB()
+                            tmdb = get_tmdb()
                             if content_type in ("TV Series", "Anime Series"):
                                 tmdb_results = tmdb.search_tv(search_term)
                             else:
@@ -1816,7 +2044,8 @@ class DirectoryProcessor:
                                 tmdb_choices.append({
                                     'title': t_title,
                                     'year': t_year,
-                                    'tmdb_id': str(t_id)
+                                    'tmdb_id': str(t_id),
+                                    'metadata': MediaMetadata.from_tmdb(result, is_tv)
                                 })
                             print("0. None of these / Manual entry")
                         else:
@@ -1891,7 +2120,7 @@ class DirectoryProcessor:
                                     
                                     # Automatically create symlinks after TMDB selection
                                     print(f"\n🔗 Creating symlinks for {title} ({year})...")
-                                    if self._create_symlinks(subfolder_path, title, year, is_tv, is_anime, is_wrestling, tmdb_id, season_number, episode_number, episode_name):
+                                    if self._create_symlinks(subfolder_path, title, year, is_tv, is_anime, is_wrestling, tmdb_id, season_number, episode_number, episode_name, metadata=pick['metadata']):
                                         processed += 1
                                         append_to_scan_history(subfolder_path)
                                         trigger_plex_refresh()
@@ -1919,7 +2148,7 @@ class DirectoryProcessor:
 
                                 # Run new TMDB search
                                 try:
-                                    tmdb = TMDB()
+                                    tmdb = get_tmdb()
                                     if content_type in ("TV Series", "Anime Series"):
                                         tmdb_results = tmdb.search_tv(search_term)
                                     else:
@@ -1938,7 +2167,8 @@ class DirectoryProcessor:
                                         tmdb_choices.append({
                                             'title': t_title,
                                             'year': t_year,
-                                            'tmdb_id': str(t_id)
+                                            'tmdb_id': str(t_id),
+                                            'metadata': MediaMetadata.from_tmdb(result, is_tv)
                                         })
                                     print("0. Enter a new search term")
                                     print("9. Skip and return to previous menu")
@@ -1951,7 +2181,7 @@ class DirectoryProcessor:
                                                 search_term = new_search
                                             # Re-run TMDB search with the new term
                                             try:
-                                                tmdb = TMDB()
+                                                tmdb = get_tmdb()
                                                 if content_type in ("TV Series", "Anime Series"):
                                                     tmdb_results = tmdb.search_tv(search_term)
                                                 else:
@@ -1970,7 +2200,8 @@ class DirectoryProcessor:
                                                     tmdb_choices.append({
                                                         'title': t_title,
                                                         'year': t_year,
-                                                        'tmdb_id': str(t_id)
+                                                        'tmdb_id': str(t_id),
+                                                        'metadata': MediaMetadata.from_tmdb(result, is_tv)
                                                     })
                                                 print("0. Enter a new search term")
                                                 print("9. Skip and return to previous menu")
@@ -1994,7 +2225,7 @@ class DirectoryProcessor:
                                             
                                             # Automatically create symlinks after TMDB selection
                                             print(f"\n🔗 Creating symlinks for {title} ({year})...")
-                                            if self._create_symlinks(subfolder_path, title, year, is_tv, is_anime, is_wrestling, tmdb_id, season_number, episode_number, episode_name):
+                                            if self._create_symlinks(subfolder_path, title, year, is_tv, is_anime, is_wrestling, tmdb_id, season_number, episode_number, episode_name, metadata=pick['metadata']):
                                                 processed += 1
                                                 append_to_scan_history(subfolder_path)
                                                 trigger_plex_refresh()
@@ -2068,7 +2299,7 @@ class DirectoryProcessor:
                             if new_tmdb_id:
                                 tmdb_id = new_tmdb_id
                                 try:
-                                    tmdb = TMDB()
+                                    tmdb = get_tmdb()
                                     if content_type in ("TV Series", "Anime Series"):
                                         details = tmdb.get_tv_details(tmdb_id)
                                         title = details.get('name', title)
@@ -2111,6 +2342,7 @@ class DirectoryProcessor:
                                 'skipped_date': datetime.datetime.now().isoformat()
                             })
                             save_skipped_items(skipped_items_registry)
+                            remember_outcome(subfolder_path, FOLDER_SKIPPED)
                             input("\nPress Enter to continue...")
                             clear_screen()
                             display_ascii_art()
@@ -2119,6 +2351,8 @@ class DirectoryProcessor:
                             save_resume_path(self.directory_path)
                             print("\nRefreshing script and resuming scan...")
                             sys.stdout.flush()
+                            # exec skips atexit handlers, so write pending history first
+                            archive_scan_history_txt_to_db()
                             python = sys.executable
                             os.execv(python, [python] + sys.argv)
                         elif action_choice == "0":
@@ -2167,7 +2401,7 @@ class DirectoryProcessor:
                             search_term = new_search  # Do NOT clean user-entered search term
                         # Immediately run TMDB search and present results
                         try:
-                            tmdb = TMDB()
+                            tmdb = get_tmdb()
                             if content_type in ("TV Series", "Anime Series"):
                                 tmdb_results = tmdb.search_tv(search_term)
                             else:
@@ -2186,7 +2420,8 @@ class DirectoryProcessor:
                                 tmdb_choices.append({
                                     'title': t_title,
                                     'year': t_year,
-                                    'tmdb_id': str(t_id)
+                                    'tmdb_id': str(t_id),
+                                    'metadata': MediaMetadata.from_tmdb(result, is_tv)
                                 })
                             print("0. Enter a new search term")
                             print("9. Skip and return to previous menu")
@@ -2199,7 +2434,7 @@ class DirectoryProcessor:
                                         search_term = new_search
                                     # Re-run TMDB search with the new term
                                     try:
-                                        tmdb = TMDB()
+                                        tmdb = get_tmdb()
                                         if content_type in ("TV Series", "Anime Series"):
                                             tmdb_results = tmdb.search_tv(search_term)
                                         else:
@@ -2218,7 +2453,8 @@ class DirectoryProcessor:
                                             tmdb_choices.append({
                                                 'title': t_title,
                                                 'year': t_year,
-                                                'tmdb_id': str(t_id)
+                                                'tmdb_id': str(t_id),
+                                                'metadata': MediaMetadata.from_tmdb(result, is_tv)
                                             })
                                         print("0. Enter a new search term")
                                         print("9. Skip and return to previous menu")
@@ -2242,7 +2478,7 @@ class DirectoryProcessor:
                                     
                                     # Automatically create symlinks after TMDB selection
                                     print(f"\n🔗 Creating symlinks for {title} ({year})...")
-                                    if self._create_symlinks(subfolder_path, title, year, is_tv, is_anime, is_wrestling, tmdb_id, season_number, episode_number, episode_name):
+                                    if self._create_symlinks(subfolder_path, title, year, is_tv, is_anime, is_wrestling, tmdb_id, season_number, episode_number, episode_name, metadata=pick['metadata']):
                                         processed += 1
                                         append_to_scan_history(subfolder_path)
                                         trigger_plex_refresh()
@@ -2319,7 +2555,7 @@ class DirectoryProcessor:
                         if new_tmdb_id:
                             tmdb_id = new_tmdb_id
                             try:
-                                tmdb = TMDB()
+                                tmdb = get_tmdb()
                                 if content_type in ("TV Series", "Anime Series"):
                                     details = tmdb.get_tv_details(tmdb_id)
                                     title = details.get('name', title)
@@ -2345,6 +2581,7 @@ class DirectoryProcessor:
                             'skipped_date': datetime.datetime.now().isoformat()
                         })
                         save_skipped_items(skipped_items_registry)
+                        remember_outcome(subfolder_path, FOLDER_SKIPPED)
                         input("\nPress Enter to continue...")
                         clear_screen()
                         display_ascii_art()
@@ -2368,6 +2605,8 @@ class DirectoryProcessor:
                         save_resume_path(self.directory_path)
                         print("\nRefreshing scan script...")
                         sys.stdout.flush()
+                        # exec skips atexit handlers, so write pending history first
+                        archive_scan_history_txt_to_db()
                         python = sys.executable
                         os.execv(python, [python] + sys.argv)
                     elif choice == "0":
@@ -2387,8 +2626,10 @@ class DirectoryProcessor:
                 self.logger.info(f"DEBUG: Completed processing subfolder: {subfolder_name}")
                 print(f"DEBUG: Finished with folder: {subfolder_name}")
                 
-            print(f"\nFinished processing {len(subdirs)} subdirectories.")
-            self.logger.info(f"DEBUG: Finished processing all {len(subdirs)} subdirectories")
+            if not progress.queued:
+                print("\nNo directories need processing.")
+            print(f"\nFinished processing {progress.queued} subdirectories ({progress.summary()}).")
+            self.logger.info(f"DEBUG: Finished processing all {progress.queued} subdirectories: {progress.summary()}")
             input("\nPress Enter to continue...")
             clear_screen()
             display_ascii_art()
@@ -2396,46 +2637,34 @@ class DirectoryProcessor:
         except Exception as e:
             self.logger.error(f"Error processing media files: {e}")
             print(f"Error: {e}")
+            if self.auto_mode:
+                return -1
             input("\nPress Enter to continue...")
             clear_screen()
             display_ascii_art()
+        finally:
+            if prefetcher is not None:
+                prefetcher.close()
 
     def _has_existing_symlink(self, subfolder_path, title, year, is_tv=False, is_anime=False, is_wrestling=False, tmdb_id=None):
         """
         Check if a symlink for the main media file(s) in this subfolder already exists in the destination directory.
-        Uses comprehensive checking similar to individual scan logic.
+        Links are looked up in the destination link index (see src/utils/link_index.py),
+        then at the path the folder would be linked to.
         """
         if not DESTINATION_DIRECTORY:
             return False
             
-        # Method 1: Check if any symlink in destination points to this subfolder (like individual scan)
+        # Method 1: Check if any link in destination points to this subfolder or a file in it
         try:
-            for root, dirs, files in os.walk(DESTINATION_DIRECTORY):
-                # Check directory symlinks
-                for d in dirs:
-                    dest_dir_path = os.path.join(root, d)
-                    if os.path.islink(dest_dir_path):
-                        try:
-                            if os.path.realpath(dest_dir_path) == os.path.realpath(subfolder_path):
-                                self.logger.info(f"Found existing directory symlink pointing to {subfolder_path}: {dest_dir_path}")
-                                return True
-                        except Exception as e:
-                            self.logger.warning(f"Error checking directory symlink: {dest_dir_path} -> {e}")
-                
-                # Check file symlinks that might point to files in this subfolder
-                for f in files:
-                    dest_file_path = os.path.join(root, f)
-                    if os.path.islink(dest_file_path):
-                        try:
-                            real_target = os.path.realpath(dest_file_path)
-                            # Check if the symlink points to any file in our subfolder
-                            if real_target.startswith(os.path.realpath(subfolder_path)):
-                                self.logger.info(f"Found existing file symlink pointing to file in {subfolder_path}: {dest_file_path} -> {real_target}")
-                                return True
-                        except Exception as e:
-                            self.logger.warning(f"Error checking file symlink: {dest_file_path} -> {e}")
+            link_index = get_link_index()
+            link_index.ensure_built(DESTINATION_DIRECTORY)
+            links = link_index.links_to(subfolder_path, limit=1)
+            if links:
+                self.logger.info(f"Found existing link pointing into {subfolder_path}: {links[0]}")
+                return True
         except Exception as e:
-            self.logger.warning(f"Error during comprehensive symlink check: {e}")
+            self.logger.warning(f"Error checking the link index: {e}")
         
         # Method 2: Check expected destination path (original logic, but improved)
         try:
@@ -2443,9 +2672,7 @@ class DirectoryProcessor:
             base_name = title
             if year and not is_wrestling:
                 base_name = f"{title} ({year})"
-            folder_name = base_name
-            if tmdb_id:
-                folder_name = f"{base_name} {{tmdb-{tmdb_id}}}"
+            folder_name = self._link_folder_name(base_name, tmdb_id, is_tv, is_wrestling)
             
             # Sanitize for filesystem safety
             safe_base_name = sanitize_filename(base_name)
@@ -2781,7 +3008,7 @@ def handle_monitor_management(monitor_manager):
             # --- NEW: Check pending files implementation ---
             # Gather pending files per directory, filter out already scanned
             pending_files = monitor_manager.get_all_pending_files()
-            scan_history = load_scan_history_set()
+            scan_history = get_scan_history_store()
             # Build a map: dir_path -> [pending files]
             dir_pending_map = {}
             for file in pending_files:
@@ -2995,7 +3222,7 @@ def handle_tmdb_test():
         input("\nPress Enter to continue...")
         return
     try:
-        tmdb = TMDB()
+        tmdb = get_tmdb()
         results = tmdb.search_movie(query)
         if not results:
             print("\nNo results found from TMDB.")
@@ -3078,7 +3305,7 @@ def perform_csv_import():
     logger.info(f"CSV Processing: Processing CSV file: {csv_path}")
     
     # Load scan history to avoid re-processing
-    scan_history = load_scan_history_set()
+    scan_history = get_scan_history_store()
     
     try:
         # Read and count items in CSV
@@ -3143,16 +3370,8 @@ def perform_csv_import():
                             filename = os.path.basename(file_path)
                             title_part = os.path.splitext(filename)[0]
                             
-                            # Extract year
-                            year_match = re.search(r'(19\d{2}|20\d{2})', title_part)
-                            year = year_match.group(1) if year_match else None
-                            
-                            # Clean title
-                            clean_title = title_part
-                            if year:
-                                clean_title = clean_title.replace(year, '').strip()
-                            clean_title = clean_title_with_patterns(clean_title)
-                            clean_title = normalize_unicode(clean_title)
+                            # Extract year and clean title
+                            clean_title, year = _parse_csv_title(title_part)
                             
                             # Detect content type
                             default_flags = get_default_content_type_for_path(parent_dir)
@@ -3239,16 +3458,8 @@ def perform_csv_import():
                         filename = os.path.basename(file_path)
                         title_part = os.path.splitext(filename)[0]
                         
-                        # Extract year
-                        year_match = re.search(r'(19\d{2}|20\d{2})', title_part)
-                        year = year_match.group(1) if year_match else None
-                        
-                        # Clean title
-                        clean_title = title_part
-                        if year:
-                            clean_title = clean_title.replace(year, '').strip()
-                        clean_title = clean_title_with_patterns(clean_title)
-                        clean_title = normalize_unicode(clean_title)
+                        # Extract year and clean title
+                        clean_title, year = _parse_csv_title(title_part)
                         
                         # Detect content type
                         default_flags = get_default_content_type_for_path(parent_dir)
@@ -3340,18 +3551,8 @@ def perform_csv_import():
             # Remove file extension for title extraction
             title_part = os.path.splitext(filename)[0]
             
-            # Extract year
-            year_match = re.search(r'(19\d{2}|20\d{2})', title_part)
-            year = year_match.group(1) if year_match else None
-            
-            # Clean title
-            clean_title = title_part
-            if year:
-                clean_title = clean_title.replace(year, '').strip()
-            
-            # Apply cleaning patterns
-            clean_title = clean_title_with_patterns(clean_title)
-            clean_title = normalize_unicode(clean_title)
+            # Extract year and clean title
+            clean_title, year = _parse_csv_title(title_part)
             
             if not clean_title.strip():
                 clean_title = filename
@@ -3393,15 +3594,13 @@ def perform_csv_import():
             
             # Auto-detect season and episode for TV content
             if is_tv:
-                # Try to extract season from filename
-                season_match = re.search(r'[sS](\d{1,2})', filename)
-                if season_match:
-                    season_number = int(season_match.group(1))
+                # Try to extract season and episode from filename
+                parsed = parse_release(filename)
+                if parsed.season is not None:
+                    season_number = parsed.season
                 
-                # Try to extract episode from filename  
-                episode_match = re.search(r'[eE](\d{1,2})', filename)
-                if episode_match:
-                    episode_number = int(episode_match.group(1))
+                if parsed.episode is not None:
+                    episode_number = parsed.episode
                 else:
                     # Check for special episode names
                     if re.search(r'(extra|special|behind|making|deleted|bonus)', filename, re.IGNORECASE):
@@ -3541,7 +3740,7 @@ def perform_csv_import():
                             
                         # Immediately run TMDB search and present results
                         try:
-                            tmdb = TMDB()
+                            tmdb = get_tmdb()
                             if is_tv:  # TV Series or Anime Series
                                 tmdb_results = tmdb.search_tv(clean_title)
                             else:  # Movies, Anime Movies, Wrestling
@@ -3570,7 +3769,8 @@ def perform_csv_import():
                                 tmdb_choices.append({
                                     'title': t_title,
                                     'year': t_year if t_year != 'N/A' else '',
-                                    'tmdb_id': str(t_id)
+                                    'tmdb_id': str(t_id),
+                                    'metadata': MediaMetadata.from_tmdb(result, is_tv)
                                 })
                             print("0. Enter a new search term")
                             print("8. Enter TMDB ID manually")
@@ -3635,13 +3835,13 @@ def perform_csv_import():
                                             # For TV content, pass season and episode info
                                             symlink_result = processor._create_symlink_for_single_file(
                                                 file_path, clean_title, year, is_tv, is_anime, is_wrestling, tmdb_id,
-                                                season_number, episode_number, episode_name, ignore_scan_history
+                                                season_number, episode_number, episode_name, ignore_scan_history, metadata=pick['metadata']
                                             )
                                         else:
                                             # For movies
                                             symlink_result = processor._create_symlink_for_single_file(
                                                 file_path, clean_title, year, is_tv, is_anime, is_wrestling, tmdb_id,
-                                                None, None, None, ignore_scan_history
+                                                None, None, None, ignore_scan_history, metadata=pick['metadata']
                                             )
                                         
                                         if symlink_result:
@@ -3748,8 +3948,8 @@ def perform_csv_import():
                         # Prompt for season number
                         try:
                             # Try to extract season from filename first
-                            season_match = re.search(r'[sS](\d{1,2})', filename)
-                            detected_season = season_match.group(1) if season_match else "1"
+                            parsed = parse_release(filename)
+                            detected_season = str(parsed.season) if parsed.season is not None else "1"
                             
                             season_input = input(f"Enter season number [{detected_season}]: ").strip()
                             if not season_input:
@@ -3761,8 +3961,7 @@ def perform_csv_import():
                         # Prompt for episode number or name
                         try:
                             # Try to extract episode from filename first
-                            episode_match = re.search(r'[eE](\d{1,2})', filename)
-                            detected_episode = episode_match.group(1) if episode_match else "1"
+                            detected_episode = str(parsed.episode) if parsed.episode is not None else "1"
                             
                             print(f"\nEnter episode number or name (for Extras/Specials):")
                             print(f"Examples: '1', '01', 'Extra', 'Special', 'Behind the Scenes'")
@@ -4017,8 +4216,20 @@ def trigger_plex_refresh():
 def main():
     parser = argparse.ArgumentParser(description="Scanly Media Scanner")
     parser.add_argument('--monitor', action='store_true', help='Run monitor scan only (no menu)')
+    parser.add_argument('--auto', metavar='DIRECTORY',
+                        help='Process a directory without prompts: link confident matches, queue the rest for review')
     args = parser.parse_args()
 
+    if args.auto:
+        processor = DirectoryProcessor(_clean_directory_path(args.auto), auto_mode=True)
+        result = processor._process_media_files()
+        print(f"\nAuto scan finished: {processor.processed_files} linked, "
+              f"{processor.review_queued} queued for review, {processor.skipped} already processed, "
+              f"{processor.errors} errors")
+        if result is None or result < 0:
+            print("Auto scan did not complete successfully.")
+        return
+
     # --- ADD THIS BLOCK: Resume scan if temp file exists ---
     resume_path = load_resume_path()
     if resume_path and os.path.isdir(resume_path):
@@ -0,0 +1,123 @@
+"""
+Metadata of the TMDB entry chosen for a folder or file.
+
+A MediaMetadata is built from the TMDB result the operator picks and handed
+to the symlink code, so the notification shows that exact match without
+another lookup. Entries built from a scanner match or a manually entered ID
+only carry title, year and ID; complete() fills in the rest from TMDB and
+is meant to run off the critical path.
+"""
+
+TMDB_POSTER_URL = "https://image.tmdb.org/t/p/w500{}"
+
+
+class MediaMetadata:
+    """Model representing the TMDB entry a media item was matched to"""
+
+    def __init__(self, title, year=None, tmdb_id=None, is_tv=False,
+                 poster=None, overview=None):
+        self.title = title
+        self.year = str(year) if year else None
+        self.tmdb_id = str(tmdb_id) if tmdb_id else None
+        self.is_tv = is_tv
+        self.poster = poster
+        self.overview = overview
+
+    @classmethod
+    def from_tmdb(cls, result, is_tv=False, fallback_title=None, fallback_year=None):
+        """
+        Build metadata from a TMDB search result or details response.
+
+        Args:
+            result: TMDB result dictionary
+            is_tv: Whether the result is a TV show
+            fallback_title: Title used if the result has none
+            fallback_year: Year used if the result has no date
+
+        Returns:
+            MediaMetadata instance
+        """
+        result = result or {}
+        title = result.get('name') or result.get('title') or fallback_title
+        date = result.get('first_air_date') or result.get('release_date') or ''
+        poster_path = result.get('poster_path')
+        return cls(
+            title,
+            date[:4] or fallback_year,
+            result.get('id'),
+            is_tv,
+            TMDB_POSTER_URL.format(poster_path) if poster_path else None,
+            result.get('overview'),
+        )
+
+    def matches(self, tmdb_id):
+        """True if this metadata describes the given TMDB ID."""
+        return bool(tmdb_id) and self.tmdb_id == str(tmdb_id)
+
+    @property
+    def is_complete(self):
+        """True once the notification fields have been looked up."""
+        return self.overview is not None
+
+    def complete(self, tmdb):
+        """
+        Fill in missing fields from TMDB.
+
+        Uses the details endpoint when the ID is known. Without an ID, the
+        first search result for the title is used, as before.
+
+        Args:
+            tmdb: TMDB client
+
+        Returns:
+            self, for chaining
+        """
+        if self.is_complete:
+            return self
+        if self.tmdb_id:
+            if self.is_tv:
+                details = tmdb.get_tv_details(self.tmdb_id)
+            else:
+                details = tmdb.get_movie_details(self.tmdb_id)
+        else:
+            results = tmdb.search_tv(self.title) if self.is_tv else tmdb.search_movie(self.title)
+            details = results[0] if results else {}
+
+        found = MediaMetadata.from_tmdb(details, self.is_tv, self.title, self.year)
+        self.title = found.title
+        self.year = found.year
+        self.tmdb_id = found.tmdb_id or self.tmdb_id
+        self.poster = self.poster or found.poster
+        self.overview = found.overview or ''
+        return self
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build metadata from a dictionary made by to_dict().
+
+        Args:
+            data: Dictionary with title, year, tmdb_id, is_tv, poster and description
+
+        Returns:
+            MediaMetadata instance
+        """
+        return cls(
+            data.get('title'),
+            data.get('year'),
+            data.get('tmdb_id'),
+            data.get('is_tv', False),
+            data.get('poster'),
+            data.get('description'),
+        )
+
+    def to_dict(self):
+        """Convert metadata to dictionary"""
+        return {
+            'title': self.title,
+            'year': self.year,
+            'tmdb_id': self.tmdb_id,
+            'is_tv': self.is_tv,
+            'poster': self.poster,
+            'description': self.overview,
+        }
@@ -286,8 +286,8 @@ class MainMenu:
         print("TMDB CONNECTION TEST\n")
         
         try:
-            from src.api.tmdb import TMDB
-            tmdb = TMDB()
+            from src.api.tmdb import get_tmdb
+            tmdb = get_tmdb()
             
             print("Testing TMDB API connection...")
             print("\nPerforming test search for 'Inception'...")
@@ -0,0 +1,315 @@
+"""
+Compiled title cleaning engine for Scanly.
+
+This module applies the cleaning patterns from cleaning_patterns.py with the
+same results as running ``re.sub`` for each pattern in turn, but much faster.
+Patterns are compiled once. Large word alternations such as the release
+group and language lists are split into a set of plain words, looked up
+per token, and a small regex for the remaining alternatives.
+"""
+
+import re
+import threading
+
+from .cleaning_patterns import patterns_to_remove, case_sensitive_patterns
+
+_WORD_RE = re.compile(r'\w+')
+_PLAIN_WORD_RE = re.compile(r'[A-Za-z0-9_]+')
+_WHITESPACE_RE = re.compile(r'\s+')
+# str.isascii() needs Python 3.7
+_is_ascii = re.compile(r'[\x00-\x7f]*\Z').match
+
+# Alternations shorter than this are fast enough as a plain regex
+MIN_WORD_LIST_SIZE = 40
+
+
+def _split_alternatives(group):
+    """Split a regex group body on its top-level '|' separators."""
+    parts = []
+    depth = 0
+    in_class = False
+    start = 0
+    i = 0
+    while i < len(group):
+        ch = group[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if in_class:
+            if ch == ']':
+                in_class = False
+        elif ch == '[':
+            in_class = True
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch == '|' and depth == 0:
+            parts.append(group[start:i])
+            start = i + 1
+        i += 1
+    parts.append(group[start:])
+    return parts
+
+
+def _find_group_end(pattern, open_index):
+    """Index of the ')' closing the group opened at open_index, or -1."""
+    depth = 0
+    in_class = False
+    i = open_index
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if in_class:
+            if ch == ']':
+                in_class = False
+        elif ch == '[':
+            in_class = True
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return -1
+
+
+def _starts_with_word_char(alternative):
+    """True if every match of the alternative must begin with a word character."""
+    return (len(alternative) > 0 and alternative[0].isalnum()
+            and (len(alternative) == 1 or alternative[1] not in '?*{'))
+
+
+class _WordListRule:
+    """A ``\\b(word|word|...)\\b<tail>`` pattern split into a word set and a residual regex."""
+
+    __slots__ = ('full', 'words', 'residual', 'ignorecase')
+
+    def __init__(self, full, words, residual, ignorecase):
+        self.full = full
+        self.words = words
+        self.residual = residual
+        self.ignorecase = ignorecase
+
+    def sub(self, text, repl):
+        words = self.words
+        residual = self.residual
+        if _is_ascii(text):
+            tokens = _WORD_RE.findall(text.lower() if self.ignorecase else text)
+            if words.isdisjoint(tokens):
+                # No plain word can match, so only the residual alternatives can
+                return residual.sub(repl, text) if residual is not None else text
+
+        full = self.full
+        out = []
+        last = 0
+        residual_match = None
+        for token_match in _WORD_RE.finditer(text):
+            pos = token_match.start()
+            if pos < last:
+                continue
+            token = token_match.group()
+            # Non-ASCII tokens may match ASCII alternatives through Unicode
+            # case folding, so they are settled by the full pattern as well
+            if _is_ascii(token) and (token.lower() if self.ignorecase else token) not in words:
+                continue
+            # Residual matches that start before this token come first
+            while residual is not None:
+                if residual_match is None or residual_match.start() < last:
+                    residual_match = residual.search(text, last)
+                if residual_match is None or residual_match.start() >= pos:
+                    break
+                out.append(text[last:residual_match.start()])
+                out.append(repl)
+                last = residual_match.end()
+            if pos < last:
+                continue
+            match = full.match(text, pos)
+            if match:
+                out.append(text[last:pos])
+                out.append(repl)
+                last = match.end()
+        if residual is not None:
+            # Residual matches after the last plain word
+            while True:
+                if residual_match is None or residual_match.start() < last:
+                    residual_match = residual.search(text, last)
+                if residual_match is None:
+                    break
+                out.append(text[last:residual_match.start()])
+                out.append(repl)
+                last = residual_match.end()
+        if not out:
+            return text
+        out.append(text[last:])
+        return ''.join(out)
+
+
+class _RegexRule:
+    """A pattern applied with a precompiled regex."""
+
+    __slots__ = ('regex',)
+
+    def __init__(self, regex):
+        self.regex = regex
+
+    def sub(self, text, repl):
+        return self.regex.sub(repl, text)
+
+
+def _compile_rule(pattern, flags):
+    """Compile one pattern into the fastest rule that gives identical results."""
+    full = re.compile(pattern, flags)
+    ignorecase = bool(full.flags & re.IGNORECASE)
+
+    body = pattern
+    prefix = ''
+    if body.startswith('(?i)'):
+        prefix = '(?i)'
+        body = body[4:]
+    if not body.startswith(r'\b'):
+        return _RegexRule(full)
+    body = body[2:]
+
+    if body.startswith('('):
+        end = _find_group_end(body, 0)
+        if end < 0 or body.startswith('(?'):
+            return _RegexRule(full)
+        group, rest = body[1:end], body[end + 1:]
+    else:
+        # Single word pattern such as \bcut\b
+        match = _PLAIN_WORD_RE.match(body)
+        if not match:
+            return _RegexRule(full)
+        group, rest = match.group(), body[match.end():]
+    if not rest.startswith(r'\b'):
+        return _RegexRule(full)
+    tail = rest[2:]
+
+    alternatives = _split_alternatives(group)
+    if len(alternatives) < MIN_WORD_LIST_SIZE and not (len(alternatives) == 1 and flags == 0):
+        return _RegexRule(full)
+    if not all(_starts_with_word_char(alt) for alt in alternatives):
+        return _RegexRule(full)
+
+    words = set()
+    residual = []
+    for alt in alternatives:
+        if _PLAIN_WORD_RE.fullmatch(alt):
+            words.add(alt.lower() if ignorecase else alt)
+        else:
+            residual.append(alt)
+    if not words:
+        return _RegexRule(full)
+
+    residual_regex = None
+    if residual:
+        residual_regex = re.compile(prefix + r'\b(' + '|'.join(residual) + r')\b' + tail, flags)
+    return _WordListRule(full, frozenset(words), residual_regex, ignorecase)
+
+
+class _MergedWordRule:
+    """Consecutive ``\\bword\\b`` patterns applied as one set lookup."""
+
+    __slots__ = ('words',)
+
+    def __init__(self, words):
+        self.words = words
+
+    def sub(self, text, repl):
+        # Removing one whole word never changes which other words exist, so
+        # applying the patterns together is the same as one after another
+        words = self.words
+        if words.isdisjoint(_WORD_RE.findall(text)):
+            return text
+        return _WORD_RE.sub(lambda m: repl if m.group() in words else m.group(), text)
+
+
+class PatternCleaner:
+    """
+    Applies an ordered list of cleaning patterns.
+
+    ``cleaner.clean(text)`` returns the same string as::
+
+        for pattern in patterns:
+            text = re.sub(pattern, repl, text, flags=flags)
+    """
+
+    def __init__(self, patterns, flags=0, repl=' '):
+        """
+        Compile the patterns.
+
+        Args:
+            patterns: Regex pattern strings, applied in order
+            flags: re flags used for every pattern
+            repl: Replacement for every match
+        """
+        self.repl = repl
+        self.rules = []
+        pending_words = []
+        for pattern in patterns:
+            rule = _compile_rule(pattern, flags)
+            single_word = (isinstance(rule, _WordListRule) and rule.residual is None
+                           and not rule.ignorecase and len(rule.words) == 1
+                           and pattern == r'\b' + next(iter(rule.words)) + r'\b')
+            if single_word:
+                pending_words.extend(rule.words)
+                continue
+            if pending_words:
+                self.rules.append(_MergedWordRule(frozenset(pending_words)))
+                pending_words = []
+            self.rules.append(rule)
+        if pending_words:
+            self.rules.append(_MergedWordRule(frozenset(pending_words)))
+
+    def clean(self, text):
+        """
+        Apply every pattern in order.
+
+        Args:
+            text: Text to clean
+
+        Returns:
+            Cleaned text
+        """
+        repl = self.repl
+        for rule in self.rules:
+            text = rule.sub(text, repl)
+        return text
+
+
+_title_cleaners = None
+_title_cleaners_lock = threading.Lock()
+
+
+def _get_title_cleaners():
+    global _title_cleaners
+    if _title_cleaners is None:
+        with _title_cleaners_lock:
+            if _title_cleaners is None:
+                _title_cleaners = (
+                    PatternCleaner(patterns_to_remove, flags=re.IGNORECASE),
+                    PatternCleaner(case_sensitive_patterns),
+                )
+    return _title_cleaners
+
+
+def clean_title(title):
+    """
+    Remove release tags from a title using the shared cleaning patterns.
+
+    Equivalent to applying patterns_to_remove (case-insensitive) and then
+    case_sensitive_patterns with re.sub, and collapsing whitespace.
+
+    Args:
+        title: Raw folder or file name
+
+    Returns:
+        Cleaned title
+    """
+    insensitive, sensitive = _get_title_cleaners()
+    title = sensitive.clean(insensitive.clean(title))
+    return _WHITESPACE_RE.sub(' ', title).strip()
@@ -9,6 +9,8 @@ import os
 import logging
 import shutil
 from pathlib import Path
+from src.api.tmdb import fill_tmdb_details
+from src.utils.link_index import forget_link, record_link
 from src.utils.webhooks import send_symlink_creation_notification
 
 def create_directory_structure(base_path, directory_structure=None, mode=0o755):
@@ -67,6 +69,7 @@ def create_symlinks(source_path, destination_base, is_anime=False, content_type=
     """
     if metadata is None:
         metadata = {}
+    fill_tmdb_details(metadata, content_type)
     
     # Extract metadata
     title = metadata.get('title', '')
@@ -181,12 +184,14 @@ def create_symlinks(source_path, destination_base, is_anime=False, content_type=
             elif force_overwrite:
                 # Remove existing symlink
                 os.remove(dest_path)
+                forget_link(dest_path)
             else:
                 # Symlink exists but points to a different file
                 return False, f"Symlink already exists and points to different file: {dest_path}"
         elif force_overwrite:
             # Remove existing file
             os.remove(dest_path)
+            forget_link(dest_path)
         else:
             # File exists but is not a symlink
             return False, f"File already exists: {dest_path}"
@@ -199,6 +204,7 @@ def create_symlinks(source_path, destination_base, is_anime=False, content_type=
         # Create symlink or hardlink
         if link_type == 'hardlink':
             os.link(source_path, dest_path)
+            record_link(dest_path, source_path, hardlink=True)
             return True, f"Created hardlink: {dest_path}"
         else:  # Default to symlink
             # Make relative if requested
@@ -208,6 +214,7 @@ def create_symlinks(source_path, destination_base, is_anime=False, content_type=
             
             # Create symlink
             os.symlink(source_path, dest_path)
+            record_link(dest_path)
             
             send_symlink_creation_notification(
                 title=metadata.get('title', ''),
@@ -315,11 +322,13 @@ def create_hardlinks(source_file, base_dest_dir, is_anime=False, content_type='t
             if force_overwrite:
                 # Remove existing link
                 os.unlink(dest_file)
+                forget_link(dest_file)
             else:
                 return False, f"Destination file already exists: {dest_file}"
         
         # Create hard link
         os.link(source_file, dest_file)
+        record_link(dest_file, source_file, hardlink=True)
         logger.info(f"Created hardlink: {dest_file} -> {source_file}")
         
         return True, f"Created hardlink: {dest_file}"
@@ -0,0 +1,242 @@
+"""
+Fingerprints of source folders across scans.
+
+For every subfolder of a scanned directory this module remembers its inode,
+modification time and entry count, the latest modification time of its own
+subfolders, and what the last scan concluded: no media, linked, skipped, or
+media still to process. The next scan stats the top-level entries only; a
+folder whose inode and mtime are unchanged keeps its outcome without being
+listed, so a rescan costs O(changed folders) instead of O(library).
+
+A folder's mtime changes when files are added, removed or renamed in it,
+which is what makes a release worth looking at again. Files added to a
+subfolder (a new episode in 'Season 02/') only change that subfolder's
+mtime, so linked or skipped folders with subfolders are listed again to
+compare their subfolders' mtimes before they are treated as unchanged. Folders can be
+forgotten with clear(), e.g. together with the scan history, and skips
+with clear_outcome(SKIPPED) when the skipped items are cleared.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FOLDER_FINGERPRINTS_DB = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'folder_fingerprints.db')
+# Skip unchanged folders whose outcome is known from an earlier scan
+FOLDER_FINGERPRINTS_ENABLED = os.environ.get('FOLDER_FINGERPRINTS_ENABLED', 'true').lower() == 'true'
+
+# Outcomes
+NO_MEDIA = 'no_media'
+MEDIA = 'media'         # has media, not linked or skipped yet
+LINKED = 'linked'
+SKIPPED = 'skipped'
+
+# Outcomes that let a scan drop an unchanged folder
+SETTLED = (NO_MEDIA, LINKED, SKIPPED)
+
+# Fingerprints written per transaction
+_BATCH_SIZE = 200
+
+
+class Fingerprint(NamedTuple):
+    """Identity and state of a folder on disk."""
+
+    inode: int
+    mtime_ns: int
+    entries: Optional[int] = None
+    # Latest mtime of the folder's subfolders, 0 without any, None if unknown
+    subdirs_mtime_ns: Optional[int] = None
+
+    def same_folder(self, other: 'Fingerprint') -> bool:
+        """True if both describe the same, unmodified folder."""
+        return self.inode == other.inode and self.mtime_ns == other.mtime_ns
+
+
+def _root_key(root: str) -> str:
+    return os.path.normpath(os.path.abspath(root))
+
+
+class FolderFingerprints:
+    """SQLite table of folder fingerprints and outcomes keyed by root and folder name."""
+
+    def __init__(self, db_path: str = FOLDER_FINGERPRINTS_DB):
+        """
+        Open (and create if needed) the fingerprint database.
+
+        Args:
+            db_path: Path to the SQLite database
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._pending = []
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS folder_fingerprints (
+                root TEXT NOT NULL,
+                name TEXT NOT NULL,
+                inode INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                entries INTEGER,
+                outcome TEXT NOT NULL,
+                updated REAL NOT NULL,
+                subdirs_mtime_ns INTEGER,
+                PRIMARY KEY (root, name)
+            )
+        ''')
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(folder_fingerprints)')}
+        if 'subdirs_mtime_ns' not in columns:
+            # Tables created before subfolder mtimes were recorded; their rows stay unknown
+            self._conn.execute('ALTER TABLE folder_fingerprints ADD COLUMN subdirs_mtime_ns INTEGER')
+        self._conn.commit()
+
+    def known(self, root: str) -> Dict[str, tuple]:
+        """
+        Load the fingerprints recorded for the folders of a root.
+
+        Args:
+            root: Scanned directory
+
+        Returns:
+            Dictionary of folder name to (Fingerprint, outcome)
+        """
+        with self._lock:
+            self._flush_locked()
+            rows = self._conn.execute(
+                'SELECT name, inode, mtime_ns, entries, subdirs_mtime_ns, outcome '
+                'FROM folder_fingerprints WHERE root = ?',
+                (_root_key(root),)).fetchall()
+        return {name: (Fingerprint(inode, mtime_ns, entries, subdirs_mtime_ns), outcome)
+                for name, inode, mtime_ns, entries, subdirs_mtime_ns, outcome in rows}
+
+    def record(self, root: str, name: str, fingerprint: Fingerprint, outcome: str) -> None:
+        """
+        Remember a freshly listed folder. Writes are batched; see flush().
+
+        Args:
+            root: Scanned directory
+            name: Folder name within root
+            fingerprint: Fingerprint taken when the folder was listed
+            outcome: NO_MEDIA or MEDIA
+        """
+        with self._lock:
+            self._pending.append((_root_key(root), name, fingerprint.inode, fingerprint.mtime_ns,
+                                  fingerprint.entries, outcome, time.time(), fingerprint.subdirs_mtime_ns))
+            if len(self._pending) >= _BATCH_SIZE:
+                self._flush_locked()
+
+    def set_outcome(self, root: str, name: str, outcome: str) -> None:
+        """
+        Update what the scan concluded about a folder it recorded.
+
+        Args:
+            root: Scanned directory
+            name: Folder name within root
+            outcome: LINKED, SKIPPED or MEDIA
+        """
+        with self._lock:
+            self._flush_locked()
+            self._conn.execute(
+                'UPDATE folder_fingerprints SET outcome = ?, updated = ? WHERE root = ? AND name = ?',
+                (outcome, time.time(), _root_key(root), name))
+            self._conn.commit()
+
+    def clear_outcome(self, outcome: str, root: Optional[str] = None, name: Optional[str] = None) -> None:
+        """
+        Turn an outcome back into MEDIA, so the next scan offers those folders again.
+
+        Args:
+            outcome: Outcome to forget, e.g. SKIPPED
+            root: Only folders of this directory (default: all)
+            name: Only this folder within root
+        """
+        query = 'UPDATE folder_fingerprints SET outcome = ?, updated = ? WHERE outcome = ?'
+        params = [MEDIA, time.time(), outcome]
+        if root is not None:
+            query += ' AND root = ?'
+            params.append(_root_key(root))
+            if name is not None:
+                query += ' AND name = ?'
+                params.append(name)
+        with self._lock:
+            self._flush_locked()
+            self._conn.execute(query, params)
+            self._conn.commit()
+
+    def flush(self) -> None:
+        """Write batched fingerprints."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        self._conn.executemany(
+            'INSERT OR REPLACE INTO folder_fingerprints '
+            '(root, name, inode, mtime_ns, entries, outcome, updated, subdirs_mtime_ns) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', pending)
+        self._conn.commit()
+
+    def clear(self, root: Optional[str] = None) -> None:
+        """
+        Forget fingerprints, so the next scan lists every folder again.
+
+        Args:
+            root: Only forget the folders of this directory (default: all)
+        """
+        with self._lock:
+            self._pending = []
+            if root is None:
+                self._conn.execute('DELETE FROM folder_fingerprints')
+            else:
+                self._conn.execute('DELETE FROM folder_fingerprints WHERE root = ?', (_root_key(root),))
+            self._conn.commit()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_folder_fingerprints() -> Optional[FolderFingerprints]:
+    """
+    Get the shared fingerprint store.
+
+    Returns:
+        FolderFingerprints instance, or None if FOLDER_FINGERPRINTS_ENABLED is false
+    """
+    global _store
+    if not FOLDER_FINGERPRINTS_ENABLED:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = FolderFingerprints()
+    return _store
+
+
+def remember_outcome(folder_path: str, outcome: str) -> None:
+    """
+    Record the outcome of a source folder in the shared store.
+
+    Failures are logged and never interrupt the scan.
+
+    Args:
+        folder_path: Path of the subfolder
+        outcome: LINKED, SKIPPED or MEDIA
+    """
+    store = get_folder_fingerprints()
+    if store is None:
+        return
+    try:
+        folder_path = os.path.normpath(folder_path)
+        store.set_outcome(os.path.dirname(folder_path), os.path.basename(folder_path), outcome)
+    except Exception as e:
+        logger.warning(f"Could not record the outcome of {folder_path}: {e}")
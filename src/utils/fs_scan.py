@@ -0,0 +1,141 @@
+"""
+Parallel enumeration of source folders.
+
+Listing thousands of release folders one after another is slow on network
+and FUSE mounts (rclone, SMB), where every listing is a round trip. This
+module lists the folders of a directory with os.scandir, reusing the file
+type information in each DirEntry instead of a stat per entry, and checks
+the folders for media files on a bounded thread pool. Results are yielded
+as soon as each folder has been checked.
+
+Given the fingerprints of an earlier scan (see src/utils/folder_fingerprints.py),
+folders whose inode and mtime are unchanged are reported from those
+fingerprints without being listed. Linked or skipped folders that have
+subfolders are listed again to compare the subfolders' mtimes, since files
+added to a season folder don't change the show folder's own mtime.
+"""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional
+
+from src.utils.folder_fingerprints import NO_MEDIA, Fingerprint
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Folders listed at the same time (1 lists them one by one)
+FS_SCAN_WORKERS = int(os.environ.get('FS_SCAN_WORKERS', '8'))
+
+
+class FolderProbe(NamedTuple):
+    """Outcome of checking one folder for media files."""
+
+    name: str
+    has_media: bool
+    # Fingerprint taken when the folder was checked
+    fingerprint: Optional[Fingerprint] = None
+    # Outcome from an earlier scan if the folder is unchanged, else None
+    outcome: Optional[str] = None
+
+
+def _probe(path: str, name: str, extensions, stat, previous=None) -> FolderProbe:
+    has_media = False
+    entries = 0
+    subdirs_mtime_ns = 0
+    with os.scandir(path) as listing:
+        for entry in listing:
+            entries += 1
+            if entry.is_dir():
+                if subdirs_mtime_ns is not None:
+                    try:
+                        subdirs_mtime_ns = max(subdirs_mtime_ns, entry.stat().st_mtime_ns)
+                    except OSError:
+                        subdirs_mtime_ns = None
+            elif not has_media and entry.name.lower().endswith(extensions) and entry.is_file():
+                has_media = True
+    if previous is not None:
+        fingerprint, outcome = previous
+        if subdirs_mtime_ns is not None and fingerprint.subdirs_mtime_ns == subdirs_mtime_ns:
+            # Rechecked settled folder whose subfolders are unchanged too
+            return FolderProbe(name, outcome != NO_MEDIA, fingerprint, outcome)
+    fingerprint = (Fingerprint(stat.st_ino, stat.st_mtime_ns, entries, subdirs_mtime_ns)
+                   if stat is not None else None)
+    return FolderProbe(name, has_media, fingerprint)
+
+
+def scan_media_folders(root: str, extensions: Iterable[str], workers: int = FS_SCAN_WORKERS,
+                       known: Optional[Dict[str, tuple]] = None) -> Iterator[FolderProbe]:
+    """
+    Check every subfolder of a directory for media files, in parallel.
+
+    Subfolders are yielded in the order their checks finish, not in
+    directory order. Folders that can't be listed are logged and left out.
+
+    Args:
+        root: Directory whose subfolders are checked
+        extensions: Lower-case media extensions including the dot
+        workers: Folders checked at the same time
+        known: Folder name to (Fingerprint, outcome) from an earlier scan;
+            unchanged folders are yielded with that outcome, without listing
+            unless they have subfolders whose mtimes must be compared
+
+    Yields:
+        FolderProbe for each subfolder
+
+    Raises:
+        OSError: If root itself can't be listed
+    """
+    extensions = tuple(extensions)
+    workers = max(1, workers)
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='fs-scan')
+    pending = set()
+    names = {}
+
+    def finished(futures):
+        for future in futures:
+            name = names.pop(future)
+            try:
+                yield future.result()
+            except OSError as e:
+                logger.warning(f"Error checking directory {name}: {e}")
+
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                # Like os.path.isdir, a symlink to a folder counts as a folder
+                if not entry.is_dir():
+                    continue
+                stat = None
+                previous = None
+                if known is not None:
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        pass
+                    if stat is not None:
+                        previous = known.get(entry.name)
+                    if previous is not None:
+                        fingerprint, outcome = previous
+                        if not fingerprint.same_folder(Fingerprint(stat.st_ino, stat.st_mtime_ns)):
+                            previous = None
+                        elif outcome == NO_MEDIA or fingerprint.subdirs_mtime_ns == 0:
+                            # Only the folder's own files decide these
+                            yield FolderProbe(entry.name, outcome != NO_MEDIA, fingerprint, outcome)
+                            continue
+                # Keep the queue short so results stream while the root is still being listed
+                if len(pending) >= workers * 4:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    yield from finished(done)
+                future = executor.submit(_probe, entry.path, entry.name, extensions, stat, previous)
+                names[future] = entry.name
+                pending.add(future)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            yield from finished(done)
+    finally:
+        # Drop probes that haven't started if the consumer stops early
+        # (shutdown's cancel_futures needs Python 3.9)
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
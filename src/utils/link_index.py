@@ -0,0 +1,436 @@
+"""
+Destination link index for Scanly.
+
+Maps every link Scanly manages in the destination library to the resolved
+source path it points at, in a WAL-mode SQLite database. Links are recorded
+as they are created and forgotten when Scanly deletes or replaces them, so asking whether a source file or folder is already
+linked is an indexed lookup instead of a walk over the whole library.
+
+The index is built from the destination tree the first time it is needed,
+optionally on a background thread that lookups wait for, and can be rebuilt at any time (scripts/rebuild_link_index.py), e.g. after
+links were changed outside Scanly. Hits are confirmed on disk before they
+are reported, and entries whose link has disappeared are dropped.
+
+Episode links ("<Show> (<Year>) {tmdb-N}/Season N/<Show> - S01E02.mkv") are
+also indexed by show (TMDB ID, normalized title, and the normalized title
+of the source folder), season and episode, with the quality of the source,
+so "is this episode already in the library?" is a single lookup.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
+
+from src.extractors.release_parser import parse_release
+from src.utils.logger import get_logger
+from src.utils.scan_logic import normalize_title
+
+logger = get_logger(__name__)
+
+LINK_INDEX_DB = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'link_index.db')
+
+# Rows written per executemany() during a rebuild
+_REBUILD_BATCH = 5000
+
+# Bumped whenever the schema gains a table that must be filled by a rebuild
+_SCHEMA_VERSION = 1
+
+_SEASON_DIR_RE = re.compile(r'^Season (\d+)$')
+_TMDB_TAG_RE = re.compile(r'\{tmdb-(\d+)\}')
+
+# Bulk rebuilds use the uncached normalizer so they don't flush the parse cache
+_normalize = getattr(normalize_title, '__wrapped__', normalize_title)
+
+# An episode row: (link, season, episode, norm_title, alias, tmdb_id, quality)
+EpisodeRow = Tuple[str, int, int, str, Optional[str], Optional[str], Optional[str]]
+
+
+def _resolve(path: str) -> str:
+    return os.path.realpath(os.path.abspath(path))
+
+
+def _quality(name: str) -> Optional[str]:
+    """Resolution (and remux flag) of a release name, e.g. '2160p Remux'."""
+    parsed = parse_release(name)
+    parts = [parsed.resolution] if parsed.resolution else []
+    if parsed.remux:
+        parts.append('Remux')
+    return ' '.join(parts) or None
+
+
+def _episode_rows(link: str, target: str) -> List[EpisodeRow]:
+    """
+    Episode rows for a link laid out as <Show>/Season N/<file>, or [] for other links.
+
+    Args:
+        link: Absolute link path
+        target: Resolved source path
+    """
+    season_dir = os.path.dirname(link)
+    season_match = _SEASON_DIR_RE.match(os.path.basename(season_dir))
+    if not season_match:
+        return []
+    parsed = parse_release(os.path.basename(link))
+    if not parsed.episodes or not parsed.title:
+        return []
+    show_folder = os.path.basename(os.path.dirname(season_dir))
+    tmdb_match = _TMDB_TAG_RE.search(show_folder)
+    norm_title = _normalize(parsed.title)
+    # The title the source folder was released under, as the scan will see it next time
+    alias = _normalize(parse_release(os.path.basename(os.path.dirname(target))).title or '') or None
+    season = int(season_match.group(1))
+    quality = _quality(os.path.basename(target))
+    return [(link, season, episode, norm_title, alias if alias != norm_title else None,
+             tmdb_match.group(1) if tmdb_match else None, quality)
+            for episode in parsed.episodes]
+
+
+def _prefix_range(folder: str):
+    """Bounds of the paths strictly below a folder, for an index range scan."""
+    folder = folder.rstrip(os.sep)
+    # os.sep + 1 sorts right after every "folder/..." path
+    return folder + os.sep, folder + chr(ord(os.sep) + 1)
+
+
+class LinkIndex:
+    """SQLite index of destination links by resolved target."""
+
+    def __init__(self, db_path: str = LINK_INDEX_DB):
+        """
+        Open (and create if needed) the index database.
+
+        Args:
+            db_path: Path to the SQLite database
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._build_thread = None
+        self._build_thread_lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS links (
+                link TEXT PRIMARY KEY,
+                target TEXT NOT NULL,
+                hardlink INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS links_target ON links (target)')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS episodes (
+                link TEXT NOT NULL,
+                season INTEGER NOT NULL,
+                episode INTEGER NOT NULL,
+                norm_title TEXT NOT NULL,
+                alias TEXT,
+                tmdb_id TEXT,
+                quality TEXT,
+                PRIMARY KEY (link, episode)
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS episodes_title ON episodes (norm_title, season, episode)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS episodes_alias ON episodes (alias, season, episode)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS episodes_tmdb ON episodes (tmdb_id, season, episode)')
+        # Destination trees the index has been built from
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS link_index_builds (
+                destination TEXT PRIMARY KEY,
+                built REAL NOT NULL,
+                links INTEGER NOT NULL
+            )
+        ''')
+        version = self._conn.execute('PRAGMA user_version').fetchone()[0]
+        if version < _SCHEMA_VERSION:
+            # Earlier builds didn't fill the newer tables; build again on next use
+            self._conn.execute('DELETE FROM link_index_builds')
+            self._conn.execute(f'PRAGMA user_version={_SCHEMA_VERSION}')
+        self._conn.commit()
+
+    def add(self, link_path: str, target_path: Optional[str] = None, hardlink: bool = False) -> None:
+        """
+        Record a link created by Scanly, replacing any previous entry for it.
+
+        Args:
+            link_path: Path of the link in the destination
+            target_path: Source the link points at. Defaults to resolving the
+                link, which only works for symlinks.
+            hardlink: Whether the link is a hardlink
+        """
+        link = os.path.abspath(link_path)
+        target = _resolve(target_path) if target_path else _resolve(link)
+        episodes = _episode_rows(link, target)
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO links (link, target, hardlink) VALUES (?, ?, ?)',
+                               (link, target, int(hardlink)))
+            self._conn.execute('DELETE FROM episodes WHERE link = ?', (link,))
+            self._conn.executemany('INSERT OR REPLACE INTO episodes VALUES (?, ?, ?, ?, ?, ?, ?)', episodes)
+            self._conn.commit()
+
+    def remove(self, link_path: str) -> None:
+        """
+        Forget a link that was removed.
+
+        Args:
+            link_path: Path of the link in the destination
+        """
+        self._forget([os.path.abspath(link_path)])
+
+    def _forget(self, links: List[str]) -> None:
+        rows = [(link,) for link in links]
+        with self._lock:
+            self._conn.executemany('DELETE FROM links WHERE link = ?', rows)
+            self._conn.executemany('DELETE FROM episodes WHERE link = ?', rows)
+            self._conn.commit()
+
+    def _live(self, links: Iterable[str], limit: Optional[int] = None) -> List[str]:
+        """Links that still exist; entries for the others are removed."""
+        found, stale = [], []
+        for link in links:
+            if os.path.lexists(link):
+                found.append(link)
+                if limit is not None and len(found) >= limit:
+                    break
+            else:
+                stale.append(link)
+        if stale:
+            logger.debug(f"Dropping {len(stale)} stale entries from the link index")
+            self._forget(stale)
+        return found
+
+    def links_to(self, source_path: str, limit: Optional[int] = None) -> List[str]:
+        """
+        Find the links pointing at a source file or folder, or at anything below it.
+
+        Entries whose link no longer exists are removed and not returned.
+
+        Args:
+            source_path: Source file or folder
+            limit: Stop after this many live links
+
+        Returns:
+            Link paths
+        """
+        self._wait_for_build()
+        target = _resolve(source_path)
+        low, high = _prefix_range(target)
+        query = 'SELECT link FROM links WHERE target = ? OR (target >= ? AND target < ?)'
+        with self._lock:
+            rows = self._conn.execute(query, (target, low, high)).fetchall()
+        return self._live((link for (link,) in rows), limit)
+
+    def is_linked(self, source_path: str) -> bool:
+        """
+        Check whether a source file or folder, or anything below it, is linked.
+
+        Args:
+            source_path: Source file or folder
+
+        Returns:
+            True if at least one live link points there
+        """
+        return bool(self.links_to(source_path, limit=1))
+
+    def find_episode(self, titles: Iterable[str], season: int, episode: int,
+                     tmdb_id: Optional[str] = None) -> List[Tuple[str, Optional[str]]]:
+        """
+        Find the library links of an episode.
+
+        Args:
+            titles: Titles the show may be known by, e.g. the cleaned folder title
+            season: Season number
+            episode: Episode number
+            tmdb_id: TMDB ID of the show, if known
+
+        Returns:
+            List of (link path, source quality) for live links
+        """
+        self._wait_for_build()
+        keys = {normalize_title(title) for title in titles if title}
+        keys.discard('')
+        clauses, params = [], []
+        if tmdb_id:
+            clauses.append('tmdb_id = ?')
+            params.append(str(tmdb_id))
+        if keys:
+            marks = ', '.join('?' * len(keys))
+            clauses.append(f'norm_title IN ({marks}) OR alias IN ({marks})')
+            params += list(keys) * 2
+        if not clauses:
+            return []
+        query = (f"SELECT link, quality FROM episodes WHERE season = ? AND episode = ? "
+                 f"AND ({' OR '.join(clauses)})")
+        with self._lock:
+            rows = self._conn.execute(query, [season, episode] + params).fetchall()
+        quality = dict(rows)
+        return [(link, quality[link]) for link in self._live(quality)]
+
+    def is_built(self, destination: str) -> bool:
+        """True if the index has been built from this destination tree."""
+        with self._lock:
+            row = self._conn.execute('SELECT 1 FROM link_index_builds WHERE destination = ?',
+                                     (_resolve(destination),)).fetchone()
+        return row is not None
+
+    def rebuild(self, destination: str) -> int:
+        """
+        Replace the entries under a destination tree with the symlinks found in it.
+
+        Episode entries are rebuilt along with the links.
+
+        Hardlinks can't be traced back to their source, so only those recorded
+        by add() survive a rebuild.
+
+        Args:
+            destination: Destination library root
+
+        Returns:
+            Number of symlinks indexed
+        """
+        destination = os.path.abspath(destination)
+        low, high = _prefix_range(destination)
+        start = time.time()
+        count = 0
+        batch = []
+
+        with self._lock:
+            self._conn.execute('''
+                DELETE FROM episodes WHERE link IN (
+                    SELECT link FROM links WHERE link >= ? AND link < ? AND hardlink = 0
+                ) OR link NOT IN (SELECT link FROM links)
+            ''', (low, high))
+            self._conn.execute('DELETE FROM links WHERE link >= ? AND link < ? AND hardlink = 0', (low, high))
+            stack = [destination]
+            while stack:
+                try:
+                    entries = os.scandir(stack.pop())
+                except OSError as e:
+                    logger.warning(f"Link index: cannot read {e.filename}: {e.strerror}")
+                    continue
+                with entries:
+                    for entry in entries:
+                        if entry.is_symlink():
+                            try:
+                                batch.append((entry.path, _resolve(entry.path)))
+                            except OSError:
+                                continue
+                        elif entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                if len(batch) >= _REBUILD_BATCH:
+                    self._insert_batch_locked(batch)
+                    count += len(batch)
+                    batch = []
+            self._insert_batch_locked(batch)
+            count += len(batch)
+            self._conn.execute('INSERT OR REPLACE INTO link_index_builds VALUES (?, ?, ?)',
+                               (_resolve(destination), time.time(), count))
+            self._conn.commit()
+
+        logger.info(f"Indexed {count} links under {destination} in {time.time() - start:.1f}s")
+        return count
+
+    def _insert_batch_locked(self, batch):
+        self._conn.executemany('INSERT OR REPLACE INTO links (link, target) VALUES (?, ?)', batch)
+        episodes = [row for link, target in batch for row in _episode_rows(link, target)]
+        self._conn.executemany('INSERT OR REPLACE INTO episodes VALUES (?, ?, ?, ?, ?, ?, ?)', episodes)
+
+    def ensure_built(self, destination: str) -> None:
+        """
+        Build the index from a destination tree unless that was done before.
+
+        Args:
+            destination: Destination library root
+        """
+        self._wait_for_build()
+        if destination and os.path.isdir(destination) and not self.is_built(destination):
+            print("Indexing existing links in the destination (first run only)...")
+            count = self.rebuild(destination)
+            print(f"Indexed {count} links")
+
+    def build_in_background(self, destination: str) -> None:
+        """
+        Build the index from a destination tree on a background thread, unless that was done before.
+
+        Lookups made while the build runs wait for it to finish, so a scan
+        can start listing and identifying folders without waiting for the
+        destination to be walked.
+
+        Args:
+            destination: Destination library root
+        """
+        if not destination or not os.path.isdir(destination) or self.is_built(destination):
+            return
+
+        def build():
+            try:
+                count = self.rebuild(destination)
+                logger.info(f"Link index built in the background: {count} links")
+            except Exception as e:
+                logger.warning(f"Could not build the link index for {destination}: {e}")
+
+        with self._build_thread_lock:
+            if self._build_thread is not None and self._build_thread.is_alive():
+                return
+            logger.info(f"Indexing existing links in {destination} in the background")
+            self._build_thread = threading.Thread(target=build, name='link-index-build', daemon=True)
+            self._build_thread.start()
+
+    def _wait_for_build(self) -> None:
+        """Block until a background build started by build_in_background() has finished."""
+        thread = self._build_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_link_index() -> LinkIndex:
+    """
+    Get the shared destination link index.
+
+    Returns:
+        LinkIndex instance
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = LinkIndex()
+    return _index
+
+
+def record_link(link_path: str, target_path: Optional[str] = None, hardlink: bool = False) -> None:
+    """
+    Record a newly created link in the shared index.
+
+    Failures are logged and never interrupt link creation.
+
+    Args:
+        link_path: Path of the link in the destination
+        target_path: Source the link points at (required for hardlinks)
+        hardlink: Whether the link is a hardlink
+    """
+    try:
+        get_link_index().add(link_path, target_path, hardlink)
+    except Exception as e:
+        logger.warning(f"Could not record {link_path} in the link index: {e}")
+
+
+def forget_link(link_path: str) -> None:
+    """
+    Remove a deleted or replaced link from the shared index.
+
+    Failures are logged and never interrupt link removal.
+
+    Args:
+        link_path: Path of the link in the destination
+    """
+    try:
+        get_link_index().remove(link_path)
+    except Exception as e:
+        logger.warning(f"Could not remove {link_path} from the link index: {e}")
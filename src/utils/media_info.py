@@ -6,10 +6,10 @@ codecs, and other media properties.
 """
 
 import os
-import re
 from pathlib import Path
 from typing import Optional, Tuple
 
+from src.extractors.release_parser import parse_release
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -25,7 +25,14 @@ def detect_resolution(file_path: str) -> Optional[str]:
     Returns:
         Resolution identifier or None if resolution can't be determined
     """
-    filename = os.path.basename(file_path).lower()
+    filename = os.path.basename(file_path)
+    
+    # Explicit resolution tokens such as 1080p or 3840x2160
+    resolution = parse_release(filename).resolution
+    if resolution in ('2160p', '1080p', '720p', '480p'):
+        return resolution
+    
+    filename = filename.lower()
     
     # Common resolution patterns in filenames
     if any(x in filename for x in ['2160p', '4k', 'uhd', '4kuhd', 'ultrahd']):
@@ -53,9 +60,7 @@ def detect_remux(file_path: str) -> bool:
     Returns:
         True if the file appears to be a remux, False otherwise
     """
-    filename = os.path.basename(file_path).lower()
-    
-    return bool(re.search(r'\bremux\b', filename))
+    return parse_release(os.path.basename(file_path)).remux
 
 
 def get_resolution_folder(file_path: str, is_tv: bool = False) -> str:
@@ -0,0 +1,229 @@
+"""
+Title parsing cache for Scanly.
+
+This module memoizes title parsing functions (cleaning, normalization and
+folder metadata extraction) with a bounded in-process LRU. Functions marked
+as persistent are also stored in a small SQLite database so restarts and
+re-scans of the same library skip the regex work entirely.
+
+Persistent entries are keyed by (function, raw name) and tagged with a hash
+of the parsing source files (the cleaning patterns and engine, the release
+parser and the parsing functions in main.py and scan_logic.py); entries
+written by other parsing code are dropped when the cache is opened.
+"""
+
+import atexit
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+PARSE_CACHE_DB = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'parse_cache.db')
+PARSE_CACHE_SIZE = int(os.environ.get('PARSE_CACHE_SIZE', '4096'))
+PARSE_CACHE_PERSIST = os.environ.get('PARSE_CACHE_PERSIST', 'true').lower() == 'true'
+
+# Bump when parsing changes in a way the source files below don't show
+PARSER_VERSION = '1'
+
+_SRC_DIR = os.path.dirname(os.path.dirname(__file__))
+# Source files whose code decides the cached results
+_PARSER_FILES = (
+    os.path.join(_SRC_DIR, 'utils', 'cleaning_patterns.py'),
+    os.path.join(_SRC_DIR, 'utils', 'cleaning_engine.py'),
+    os.path.join(_SRC_DIR, 'utils', 'scan_logic.py'),
+    os.path.join(_SRC_DIR, 'extractors', 'release_parser.py'),
+    os.path.join(_SRC_DIR, 'main.py'),
+)
+
+
+def parser_version():
+    """
+    Hash identifying the current parsing code and parser version.
+
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.sha1(PARSER_VERSION.encode())
+    for path in _PARSER_FILES:
+        try:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        except OSError:
+            pass
+    return digest.hexdigest()
+
+
+class LRUCache:
+    """Small thread-safe LRU mapping."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class PersistentParseStore:
+    """SQLite-backed store for parse results, written in batches."""
+
+    FLUSH_EVERY = 50
+
+    def __init__(self, db_path=PARSE_CACHE_DB):
+        self.db_path = db_path
+        self.version = parser_version()
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS parse_cache (
+                namespace TEXT NOT NULL,
+                raw TEXT NOT NULL,
+                version TEXT NOT NULL,
+                value TEXT NOT NULL,
+                PRIMARY KEY (namespace, raw)
+            )
+        ''')
+        # Results produced by other cleaning patterns are no longer valid
+        removed = self._conn.execute('DELETE FROM parse_cache WHERE version != ?', (self.version,)).rowcount
+        self._conn.commit()
+        if removed:
+            logger.info(f"Cleaning patterns changed; dropped {removed} cached parse results")
+
+    def get(self, namespace, raw):
+        with self._lock:
+            pending = self._pending.get((namespace, raw))
+            if pending is not None:
+                return pending
+            row = self._conn.execute(
+                'SELECT value FROM parse_cache WHERE namespace=? AND raw=? AND version=?',
+                (namespace, raw, self.version)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, namespace, raw, value):
+        with self._lock:
+            self._pending[(namespace, raw)] = value
+            if len(self._pending) >= self.FLUSH_EVERY:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        rows = [(namespace, raw, self.version, value) for (namespace, raw), value in self._pending.items()]
+        self._pending = {}
+        try:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO parse_cache (namespace, raw, version, value) VALUES (?, ?, ?, ?)',
+                rows
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not write parse cache: {e}")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_persistent_store():
+    """
+    Get the shared on-disk parse store, or None if persistence is disabled.
+
+    Returns:
+        PersistentParseStore instance or None
+    """
+    global _store
+    if not PARSE_CACHE_PERSIST:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                try:
+                    _store = PersistentParseStore()
+                    atexit.register(_store.flush)
+                except sqlite3.Error as e:
+                    logger.warning(f"Parse cache disabled, could not open {PARSE_CACHE_DB}: {e}")
+                    return None
+    return _store
+
+
+def _decode(value):
+    value = json.loads(value)
+    return tuple(value) if isinstance(value, list) else value
+
+
+def memoize_parse(namespace, persist=False, maxsize=PARSE_CACHE_SIZE):
+    """
+    Memoize a single-argument string parsing function.
+
+    Args:
+        namespace: Name the results are stored under in the persistent cache
+        persist: Also keep results in the on-disk cache
+        maxsize: Maximum number of in-memory entries
+
+    Returns:
+        Decorator
+    """
+    def decorator(func):
+        cache = LRUCache(maxsize)
+        missing = object()
+
+        @functools.wraps(func)
+        def wrapper(raw):
+            if not isinstance(raw, str):
+                return func(raw)
+            value = cache.get(raw, missing)
+            if value is not missing:
+                return value
+            store = get_persistent_store() if persist else None
+            if store is not None:
+                stored = store.get(namespace, raw)
+                if stored is not None:
+                    value = _decode(stored)
+                    cache.put(raw, value)
+                    return value
+            value = func(raw)
+            cache.put(raw, value)
+            if store is not None:
+                store.put(namespace, raw, json.dumps(value))
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
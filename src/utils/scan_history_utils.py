@@ -1,59 +1,413 @@
+"""
+Scan history storage for Scanly.
+
+This module keeps track of every source path Scanly has already processed.
+All history lives in a single WAL-mode SQLite database; writes are buffered
+and flushed in batches so that creating thousands of links does not turn
+into thousands of synchronous disk writes. A parent-directory index lets
+callers ask whether anything under a folder was processed without walking
+the folder on disk.
+"""
+
+import atexit
 import os
 import sqlite3
+import threading
+import time
+from array import array
+from bisect import bisect_left
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SCAN_HISTORY_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'scan_history.txt')
+SCAN_HISTORY_DB = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'scan_history.db')
+
+# Flush pending writes after this many additions or this many milliseconds,
+# whichever comes first.
+SCAN_HISTORY_BATCH_SIZE = int(os.environ.get('SCAN_HISTORY_BATCH_SIZE', '100'))
+SCAN_HISTORY_FLUSH_MS = int(os.environ.get('SCAN_HISTORY_FLUSH_MS', '2000'))
+
+# Only these files count towards the parent-directory index
+MEDIA_EXTENSIONS = ('.mkv', '.mp4', '.avi', '.mov', '.wmv', '.flv')
+
+# Bumped whenever the schema gains a table that must be backfilled
+_SCHEMA_VERSION = 1
+
+
+def _is_media_path(path):
+    return path.lower().endswith(MEDIA_EXTENSIONS)
+
+
+def _parent_dirs(path):
+    """Yield every ancestor directory of a path, nearest first."""
+    parent = os.path.dirname(os.path.normpath(path))
+    while parent:
+        yield parent
+        next_parent = os.path.dirname(parent)
+        if next_parent == parent:
+            break
+        parent = next_parent
+
+
+class ScanHistoryStore:
+    """
+    Unified, thread-safe scan history store.
+
+    A single long-lived connection is kept open in WAL mode. New paths are
+    held in a pending buffer that is written in one transaction once it
+    reaches ``batch_size`` entries, after ``flush_interval_ms`` has elapsed,
+    or when the process exits. Lookups consult the pending buffer first, so
+    callers never see a path disappear between ``add`` and the next flush.
+    """
+
+    def __init__(self, db_path=SCAN_HISTORY_DB, txt_path=SCAN_HISTORY_FILE,
+                 batch_size=SCAN_HISTORY_BATCH_SIZE, flush_interval_ms=SCAN_HISTORY_FLUSH_MS):
+        """
+        Initialize the store and import any legacy scan_history.txt entries.
+
+        Args:
+            db_path: Path to the SQLite database file
+            txt_path: Path to the legacy plain-text history file
+            batch_size: Number of pending paths that triggers a flush
+            flush_interval_ms: Maximum time a pending path waits before being written
+        """
+        self.db_path = db_path
+        self.txt_path = txt_path
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0, flush_interval_ms) / 1000.0
+        self._lock = threading.RLock()
+        self._pending = []
+        self._pending_set = set()
+        self._timer = None
+        self._conn = self._connect()
+        self._init_schema()
+        self._import_legacy_txt()
+
+    def _connect(self):
+        """Open the shared connection with WAL journaling enabled."""
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
 
-SCAN_HISTORY_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src', 'scan_history.txt')
-SCAN_HISTORY_DB = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src', 'scan_history.db')
-
-def _init_scan_history_db():
-    """Ensure the scan history DB exists."""
-    conn = sqlite3.connect(SCAN_HISTORY_DB)
-    c = conn.cursor()
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS archived_scan_history (
-            path TEXT PRIMARY KEY,
-            archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    def _init_schema(self):
+        """Create the history tables if they don't exist."""
+        with self._lock:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS archived_scan_history (
+                    path TEXT PRIMARY KEY,
+                    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            # Number of processed media files below each directory
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS scan_history_dirs (
+                    dir TEXT PRIMARY KEY,
+                    media_count INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+            version = self._conn.execute('PRAGMA user_version').fetchone()[0]
+            if version < _SCHEMA_VERSION:
+                self._rebuild_dir_index_locked()
+                self._conn.execute(f'PRAGMA user_version={_SCHEMA_VERSION}')
+            self._conn.commit()
+
+    def _rebuild_dir_index_locked(self):
+        """Recompute the parent-directory index from the history table."""
+        counts = {}
+        for (path,) in self._conn.execute('SELECT path FROM archived_scan_history'):
+            if _is_media_path(path):
+                for parent in _parent_dirs(path):
+                    counts[parent] = counts.get(parent, 0) + 1
+        self._conn.execute('DELETE FROM scan_history_dirs')
+        self._conn.executemany(
+            'INSERT INTO scan_history_dirs (dir, media_count) VALUES (?, ?)',
+            counts.items()
         )
-    ''')
-    conn.commit()
-    conn.close()
+        logger.info(f"Built scan history directory index ({len(counts)} directories)")
 
-def is_path_in_scan_history(path):
-    """Return True if path is in scan_history.txt or archived DB."""
-    # Check txt
-    if os.path.exists(SCAN_HISTORY_FILE):
-        with open(SCAN_HISTORY_FILE, 'r', encoding='utf-8') as f:
-            if path in (line.strip() for line in f):
+    def _import_legacy_txt(self):
+        """Move entries from the old scan_history.txt file into the database."""
+        if not self.txt_path or not os.path.exists(self.txt_path):
+            return
+        try:
+            with open(self.txt_path, 'r', encoding='utf-8') as f:
+                lines = [line.strip() for line in f if line.strip()]
+            if lines:
+                with self._lock:
+                    self._insert_locked(lines)
+                    self._conn.commit()
+                logger.info(f"Imported {len(lines)} entries from {self.txt_path} into scan history database")
+            # Clear the txt file once its contents are safely in the database
+            with open(self.txt_path, 'w'):
+                pass
+        except Exception as e:
+            logger.error(f"Error importing legacy scan history file: {e}")
+
+    def add(self, path):
+        """
+        Record a processed path.
+
+        Args:
+            path: Source file or folder path that has been processed
+        """
+        if not path:
+            return
+        with self._lock:
+            if path in self._pending_set:
+                return
+            self._pending.append(path)
+            self._pending_set.add(path)
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+            elif self._timer is None and self.flush_interval > 0:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+            elif self.flush_interval == 0:
+                self._flush_locked()
+
+    def is_processed(self, path):
+        """
+        Check whether a path has already been processed.
+
+        Args:
+            path: Source file or folder path
+
+        Returns:
+            True if the path is in the scan history
+        """
+        with self._lock:
+            if path in self._pending_set:
                 return True
-    # Check DB
-    _init_scan_history_db()
-    conn = sqlite3.connect(SCAN_HISTORY_DB)
-    c = conn.cursor()
-    c.execute('SELECT 1 FROM archived_scan_history WHERE path=?', (path,))
-    result = c.fetchone()
-    conn.close()
-    return result is not None
+            row = self._conn.execute(
+                'SELECT 1 FROM archived_scan_history WHERE path=?', (path,)
+            ).fetchone()
+        return row is not None
 
-def load_scan_history_set():
-    """Load scan history from both scan_history.txt and scan_history.db."""
-    history_set = set()
-    # Load from scan_history.txt
-    txt_path = os.path.join(os.path.dirname(__file__), '../scan_history.txt')
-    if os.path.exists(txt_path):
-        with open(txt_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    history_set.add(line)
-    # Load from scan_history.db
-    db_path = os.path.join(os.path.dirname(__file__), '../scan_history.db')
-    if os.path.exists(db_path):
+    def __contains__(self, path):
+        return self.is_processed(path)
+
+    def has_media_under(self, folder_path):
+        """
+        Check whether any processed media file lives below a folder.
+
+        This is a single indexed lookup; the folder is never walked on disk.
+
+        Args:
+            folder_path: Folder to check
+
+        Returns:
+            True if at least one media file under the folder is in the history
+        """
+        folder_path = os.path.normpath(folder_path)
+        prefix = folder_path.rstrip(os.sep) + os.sep
+        with self._lock:
+            for path in self._pending:
+                if _is_media_path(path) and os.path.normpath(path).startswith(prefix):
+                    return True
+            row = self._conn.execute(
+                'SELECT media_count FROM scan_history_dirs WHERE dir=?', (folder_path,)
+            ).fetchone()
+        return bool(row and row[0] > 0)
+
+    def load_paths(self):
+        """
+        Load every recorded path.
+
+        Returns:
+            Set of processed paths
+        """
+        with self._lock:
+            self._flush_locked()
+            rows = self._conn.execute('SELECT path FROM archived_scan_history').fetchall()
+        return {row[0] for row in rows}
+
+    def flush(self):
+        """Write any pending paths to the database."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        pending = self._pending
+        self._pending = []
+        self._pending_set = set()
+        start = time.time()
         try:
-            conn = sqlite3.connect(db_path)
-            cur = conn.cursor()
-            cur.execute("SELECT path FROM scan_history")
-            for row in cur.fetchall():
-                history_set.add(row[0])
-            conn.close()
+            self._insert_locked(pending)
+            self._conn.commit()
+            logger.debug(f"Flushed {len(pending)} scan history entries in {time.time() - start:.3f}s")
         except Exception as e:
-            print(f"Failed to load scan_history.db: {e}")
-    return history_set
\ No newline at end of file
+            logger.error(f"Error flushing scan history: {e}")
+            # Keep the entries so the next flush can retry them
+            self._pending = pending + self._pending
+            self._pending_set.update(pending)
+
+    def _insert_locked(self, paths):
+        """Insert paths and bump the directory counts for new media files."""
+        counts = {}
+        for path in paths:
+            cursor = self._conn.execute(
+                'INSERT OR IGNORE INTO archived_scan_history (path) VALUES (?)', (path,)
+            )
+            if cursor.rowcount == 1 and _is_media_path(path):
+                for parent in _parent_dirs(path):
+                    counts[parent] = counts.get(parent, 0) + 1
+        if counts:
+            self._conn.executemany('''
+                INSERT INTO scan_history_dirs (dir, media_count) VALUES (?, ?)
+                ON CONFLICT(dir) DO UPDATE SET media_count = media_count + excluded.media_count
+            ''', counts.items())
+
+    def close(self):
+        """Flush pending writes and close the connection."""
+        with self._lock:
+            self._flush_locked()
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+
+
+def _path_hash(path):
+    """64-bit fingerprint of a path (only stable within one process)."""
+    return hash(path) & 0xFFFFFFFFFFFFFFFF
+
+
+class ScanHistorySet:
+    """
+    Memory-compact, set-like view of the scan history.
+
+    Instead of holding every path string, only a sorted array of 64-bit
+    path hashes is kept in memory (8 bytes per entry). A hash hit is
+    confirmed against the SQLite store, so ``in`` gives exactly the same
+    answers as a set of full paths while misses never touch the database.
+    """
+
+    # Recently added hashes are merged into the sorted array past this size
+    MERGE_THRESHOLD = 4096
+
+    def __init__(self, store):
+        """
+        Initialize the set from a scan history store.
+
+        Args:
+            store: ScanHistoryStore used for loading and confirmation
+        """
+        self.store = store
+        self._lock = threading.Lock()
+        self._hashes = array('Q')
+        self._recent = set()
+        self.reload()
+
+    def reload(self):
+        """Rebuild the hash array from the store."""
+        store = self.store
+        with store._lock:
+            store._flush_locked()
+            hashes = [_path_hash(row[0]) for row in
+                      store._conn.execute('SELECT path FROM archived_scan_history')]
+        hashes.sort()
+        with self._lock:
+            self._hashes = array('Q', hashes)
+            self._recent = set()
+
+    def _might_contain(self, hashed):
+        if hashed in self._recent:
+            return True
+        hashes = self._hashes
+        i = bisect_left(hashes, hashed)
+        return i < len(hashes) and hashes[i] == hashed
+
+    def __contains__(self, path):
+        if not isinstance(path, str):
+            return False
+        with self._lock:
+            if not self._might_contain(_path_hash(path)):
+                return False
+        return self.store.is_processed(path)
+
+    def add(self, path):
+        """
+        Add a path to the set and record it in the store.
+
+        Args:
+            path: Processed file or folder path
+        """
+        self.store.add(path)
+        with self._lock:
+            hashed = _path_hash(path)
+            if self._might_contain(hashed):
+                return
+            self._recent.add(hashed)
+            if len(self._recent) >= self.MERGE_THRESHOLD:
+                merged = sorted(self._recent.union(self._hashes))
+                self._hashes = array('Q', merged)
+                self._recent = set()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._hashes) + len(self._recent)
+
+    def __iter__(self):
+        return iter(self.store.load_paths())
+
+
+_store = None
+_history_set = None
+_store_lock = threading.Lock()
+
+
+def get_scan_history_store():
+    """
+    Get the shared scan history store, creating it on first use.
+
+    Returns:
+        ScanHistoryStore instance
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ScanHistoryStore()
+                atexit.register(_store.flush)
+    return _store
+
+
+def get_scan_history_set():
+    """
+    Get the shared compact scan history set, creating it on first use.
+
+    Returns:
+        ScanHistorySet instance
+    """
+    global _history_set
+    if _history_set is None:
+        store = get_scan_history_store()
+        with _store_lock:
+            if _history_set is None:
+                _history_set = ScanHistorySet(store)
+    return _history_set
+
+
+def is_path_in_scan_history(path):
+    """Return True if path is in the scan history."""
+    return get_scan_history_store().is_processed(path)
+
+
+def add_to_scan_history(path):
+    """Record a processed path in the scan history."""
+    get_scan_history_store().add(path)
+
+
+def load_scan_history_set():
+    """Load the full scan history as a set of paths."""
+    return get_scan_history_store().load_paths()
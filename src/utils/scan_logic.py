@@ -4,6 +4,8 @@ import unicodedata
 import os
 import difflib
 from .cleaning_patterns import patterns_to_remove
+from .scanner_index import SCANNERS_DIR, get_scanner_index
+from .parse_cache import memoize_parse
 
 def extract_folder_metadata(folder_name):
     clean_title = folder_name
@@ -91,14 +93,74 @@ def partial_scanner_match(search_term, scanner_title, min_overlap=1):
     overlap = search_words & scanner_words
     return len(overlap) >= min_overlap
 
+def _words_wo_and(text):
+    """Word set of a normalized title, ignoring "&"."""
+    return set(w for w in text.split() if w != "&")
+
+def _score_scanner_entry(norm_search, entry, content_type, year=None):
+    """Score one scanner entry against a normalized search term (0 = no match)."""
+    scan_year = entry.year
+    norm_scan = entry.norm_title
+    # Exact title and year match
+    if norm_search == norm_scan and (not year or (scan_year and str(year) == scan_year)):
+        return 100
+    # Exact title match, year mismatch or missing
+    if norm_search == norm_scan:
+        # For TV Series or Anime Series, ignore year mismatch
+        if content_type in ("TV Series", "Anime Series"):
+            return 100
+        if not year or (scan_year and str(year) == scan_year):
+            return 100
+        return 90
+    # Partial match (all words in search are in scanner title, ignoring "&")
+    if _words_wo_and(norm_search) == _words_wo_and(norm_scan):
+        return 80
+    # Partial match (all words in search are in scanner title)
+    if set(norm_search.split()).issubset(set(norm_scan.split())):
+        return 70
+    # Fuzzy/partial overlap
+    if partial_scanner_match(norm_search, norm_scan, min_overlap=2):
+        return 50
+    return 0
+
+def _scanner_tokens(norm_title):
+    """Tokens under which an entry is indexed for candidate lookup."""
+    tokens = _words_wo_and(norm_title)
+    tokens.update(_split_words(norm_title))
+    return tokens
+
+def _build_token_postings(index):
+    postings = {}
+    for entry in index.entries:
+        for token in _scanner_tokens(entry.norm_title):
+            postings.setdefault(token, []).append(entry.index)
+    return postings
+
+def scanner_match_candidates(index, norm_search):
+    """
+    Entries that can score above zero for a normalized search term.
+
+    Every scoring tier requires the entry to share at least one token with
+    the search term, so only entries from the matching postings lists are
+    returned, in file order. Search terms without any word (e.g. "" or "&")
+    can match by subset alone and fall back to every entry.
+    """
+    if not _words_wo_and(norm_search):
+        return index.entries
+    postings = index.derive('token_postings', _build_token_postings)
+    ids = set()
+    for token in _scanner_tokens(norm_search):
+        ids.update(postings.get(token, ()))
+    entries = index.entries
+    return [entries[i] for i in sorted(ids)]
+
 def find_scanner_matches(search_term, content_type, year=None, threshold=0.75):
     """
     Return a list of scanner matches that closely match the search_term and year.
     Uses normalization and a weighted scoring system.
     """
     scanner_file = SCANNER_FILES.get(content_type, "movies.txt")
-    scanners_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'scanners')
-    scanner_path = os.path.join(scanners_dir, scanner_file)
+    scanner_path = os.path.join(SCANNERS_DIR, scanner_file)
     matches = []
 
     if not os.path.exists(scanner_path):
@@ -108,56 +170,21 @@ def find_scanner_matches(search_term, content_type, year=None, threshold=0.75):
     best_score = 0
     best_match = None
 
-    # Helper to get word set without "&"
-    def words_wo_and(text):
-        return set(w for w in text.split() if w != "&")
-
-    with open(scanner_path, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
-            # Extract title, year, and TMDB ID
-            match = re.match(r'^(.+?)(?:\s+\((\d{4})\))?(?:\s+\{tmdb-(\d+)\})?$', line)
-            if not match:
-                continue
-            scan_title = match.group(1).strip()
-            scan_year = match.group(2)
-            scan_tmdb = match.group(3)
-            norm_scan = normalize_title(scan_title)
-
-            score = 0
-            # Exact title and year match
-            if norm_search == norm_scan and (not year or (scan_year and str(year) == scan_year)):
-                score = 100
-            # Exact title match, year mismatch or missing
-            elif norm_search == norm_scan:
-                # For TV Series or Anime Series, ignore year mismatch
-                if content_type in ("TV Series", "Anime Series"):
-                    score = 100
-                elif not year or (scan_year and str(year) == scan_year):
-                    score = 100
-                else:
-                    score = 90
-            # Partial match (all words in search are in scanner title, ignoring "&")
-            elif words_wo_and(norm_search) == words_wo_and(norm_scan):
-                score = 80
-            # Partial match (all words in search are in scanner title)
-            elif set(norm_search.split()).issubset(set(norm_scan.split())):
-                score = 70
-            # Fuzzy/partial overlap
-            elif partial_scanner_match(norm_search, norm_scan, min_overlap=2):
-                score = 50
-
-            if score > best_score:
-                best_score = score
-                best_match = {
-                    "line": line,
-                    "title": scan_title,
-                    "year": scan_year,
-                    "tmdb_id": scan_tmdb,
-                    "score": score
-                }
+    index = get_scanner_index(scanner_path)
+    for entry in scanner_match_candidates(index, norm_search):
+        score = _score_scanner_entry(norm_search, entry, content_type, year)
+        if score > best_score:
+            best_score = score
+            best_match = {
+                "line": entry.line,
+                "title": entry.title,
+                "year": entry.year,
+                "tmdb_id": entry.tmdb_id,
+                "score": score
+            }
+            if best_score == 100:
+                # Nothing can beat an exact match, and ties keep the first one
+                break
 
     if best_match:
         matches.append(best_match)
@@ -201,12 +228,14 @@ def _extract_folder_metadata(folder_name):
     clean_title = re.sub(r'\s+', ' ', clean_title).strip()
     return clean_title
 
+@memoize_parse('normalize_unicode')
 def normalize_unicode(text):
     """Normalize unicode characters to closest ASCII equivalent."""
     if not isinstance(text, str):
         return text
     return unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode('ASCII')
 
+@memoize_parse('normalize_title')
 def normalize_title(title):
     # Remove apostrophes entirely (don't replace with space)
     title = re.sub(r"[’']", '', title)
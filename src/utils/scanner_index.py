@@ -0,0 +1,390 @@
+"""
+In-memory scanner list index for Scanly.
+
+This module parses each scanner list once and keeps the parsed entries in
+memory, keyed by normalized title and year. An index reloads itself only
+when the underlying file's mtime or size changes, so repeated lookups for
+every folder (and every menu redraw) no longer re-read the file.
+
+Lists compiled with scanners/fix_scanner_ids.py also get a SQLite sidecar
+(``<list>.compiled.db``) holding the already-normalized entries. It is used
+instead of re-parsing the text file as long as it matches the file's
+current mtime and size and was written by the current normalization code.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+SCANNERS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'scanners')
+
+# Same line format used by find_scanner_matches: "Title (YYYY) {tmdb-ID}"
+_ENTRY_RE = re.compile(r'^(.+?)(?:\s+\((\d{4})\))?(?:\s+\{tmdb-(\d+)\})?$')
+_TMDB_TAG_RE = re.compile(r'\s*\{tmdb-\d+\}')
+_TITLE_YEAR_RE = re.compile(r'^(.*?)\s+\((\d{4})\)$')
+
+# Bump when the sidecar layout changes
+COMPILED_FORMAT_VERSION = '1'
+
+_SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Source files whose code decides the normalized keys stored in the sidecar
+_NORMALIZER_FILES = (
+    os.path.join(_SRC_DIR, 'utils', 'scan_logic.py'),
+    os.path.join(_SRC_DIR, 'utils', 'scanner_index.py'),
+)
+_normalizer_version = None
+
+
+def normalizer_version():
+    """
+    Hash identifying the sidecar format and the current normalization code.
+
+    Returns:
+        Hex digest string
+    """
+    global _normalizer_version
+    if _normalizer_version is None:
+        digest = hashlib.sha1(COMPILED_FORMAT_VERSION.encode())
+        for path in _NORMALIZER_FILES:
+            try:
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+            except OSError:
+                pass
+        _normalizer_version = digest.hexdigest()
+    return _normalizer_version
+
+
+def compiled_path(path):
+    """Path of the compiled sidecar for a scanner list."""
+    return os.path.splitext(path)[0] + '.compiled.db'
+
+
+class ScannerEntry:
+    """A single parsed scanner list line."""
+
+    __slots__ = ('index', 'line', 'title', 'year', 'tmdb_id', 'norm_title', 'key_title', 'key_year')
+
+    def __init__(self, index, line, title, year, tmdb_id, norm_title, key_title, key_year):
+        self.index = index
+        self.line = line
+        self.title = title
+        self.year = year
+        self.tmdb_id = tmdb_id
+        self.norm_title = norm_title
+        # Normalized title and year used for exact lookups
+        self.key_title = key_title
+        self.key_year = key_year
+
+
+class ScannerIndex:
+    """
+    Parsed view of one scanner list file.
+
+    Attributes:
+        path: Path to the scanner list
+        lines: Every non-empty, stripped line in file order
+        entries: Parsed entries (comments excluded) in file order
+        by_title: normalized title -> year (or None) -> list of entries
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the index. Nothing is read until the first lookup.
+
+        Args:
+            path: Path to the scanner list file
+        """
+        self.path = path
+        self.lines = []
+        self.entries = []
+        self.by_title = {}
+        self._signature = None
+        self._derived = {}
+        self._lock = threading.RLock()
+
+    @property
+    def signature(self):
+        """(mtime_ns, size) of the file the entries were loaded from, or None."""
+        return self._signature
+
+    def _file_signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def refresh(self):
+        """
+        Reload the list if the file changed since it was last parsed.
+
+        Returns:
+            The index itself, for chaining
+        """
+        signature = self._file_signature()
+        if signature == self._signature:
+            return self
+        with self._lock:
+            if signature != self._signature:
+                self._load(signature)
+        return self
+
+    def _load(self, signature):
+        lines, entries = None, None
+        sidecar = compiled_path(self.path)
+        sidecar_exists = signature is not None and os.path.exists(sidecar)
+        if sidecar_exists:
+            lines, entries = self._read_compiled(sidecar, signature)
+        if entries is None:
+            lines, entries = self._parse_text(signature)
+            if sidecar_exists and lines:
+                # The sidecar is stale; refresh it for the next start
+                try:
+                    write_compiled(self.path, lines, entries, signature)
+                except Exception as e:
+                    logger.warning(f"Could not refresh compiled scanner list {sidecar}: {e}")
+
+        by_title = {}
+        for entry in entries:
+            by_title.setdefault(entry.key_title, {}).setdefault(entry.key_year, []).append(entry)
+
+        self.lines = lines
+        self.entries = entries
+        self.by_title = by_title
+        self._derived = {}
+        self._signature = signature
+        logger.debug(f"Indexed {len(entries)} scanner entries from {self.path}")
+
+    def _parse_text(self, signature):
+        """Parse the text list. Returns (lines, entries)."""
+        lines = []
+        if signature is not None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    lines = [line.strip() for line in f if line.strip()]
+            except OSError as e:
+                logger.error(f"Failed to read scanner list {self.path}: {e}")
+        return lines, parse_entries(lines)
+
+    def _read_compiled(self, sidecar, signature):
+        """Load entries from the compiled sidecar, or (None, None) if it is stale."""
+        try:
+            conn = sqlite3.connect(sidecar)
+            try:
+                conn.execute('PRAGMA mmap_size=268435456')
+                meta = dict(conn.execute('SELECT key, value FROM meta'))
+                if (meta.get('format_version') != COMPILED_FORMAT_VERSION
+                        or meta.get('normalizer_version') != normalizer_version()
+                        or meta.get('source_mtime_ns') != str(signature[0])
+                        or meta.get('source_size') != str(signature[1])):
+                    logger.debug(f"Compiled scanner list {sidecar} is stale, parsing text file")
+                    return None, None
+                lines = [row[0] for row in conn.execute('SELECT line FROM lines ORDER BY pos')]
+                entries = [
+                    ScannerEntry(i, *row) for i, row in enumerate(conn.execute(
+                        'SELECT line, title, year, tmdb_id, norm_title, key_title, key_year '
+                        'FROM entries ORDER BY id'
+                    ))
+                ]
+            finally:
+                conn.close()
+            return lines, entries
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read compiled scanner list {sidecar}: {e}")
+            return None, None
+
+    def lookup(self, normalized_title, year=None):
+        """
+        Find entries whose normalized title matches exactly.
+
+        Entries match when the years are equal or either side has no year.
+
+        Args:
+            normalized_title: Title already passed through normalize_title
+            year: Optional year to filter by
+
+        Returns:
+            Matching entries in file order
+        """
+        self.refresh()
+        years = self.by_title.get(normalized_title)
+        if not years:
+            return []
+        if not year:
+            found = [entry for bucket in years.values() for entry in bucket]
+        else:
+            found = list(years.get(str(year), ())) + list(years.get(None, ()))
+        found.sort(key=lambda entry: entry.index)
+        return found
+
+    def derive(self, key, builder):
+        """
+        Cache a value computed from the parsed list until the file changes.
+
+        Args:
+            key: Cache key for the derived value
+            builder: Callable taking the index and returning the value
+
+        Returns:
+            The cached or freshly built value
+        """
+        self.refresh()
+        with self._lock:
+            if key not in self._derived:
+                self._derived[key] = builder(self)
+            return self._derived[key]
+
+
+def parse_entries(lines):
+    """
+    Parse scanner list lines into entries, skipping comments.
+
+    Args:
+        lines: Non-empty, stripped lines
+
+    Returns:
+        List of ScannerEntry in file order
+    """
+    from .scan_logic import normalize_title
+
+    entries = []
+    for line in lines:
+        if line.startswith('#'):
+            continue
+        match = _ENTRY_RE.match(line)
+        title = match.group(1).strip()
+        norm_title = normalize_title(title)
+
+        # Exact lookups strip the TMDB tag wherever it appears before
+        # reading the year, which differs from the line regex only on
+        # malformed lines.
+        wo_tmdb = _TMDB_TAG_RE.sub('', line)
+        m = _TITLE_YEAR_RE.match(wo_tmdb)
+        if m:
+            key_title, key_year = m.group(1), m.group(2)
+        else:
+            key_title, key_year = wo_tmdb.strip(), None
+        key_title = norm_title if key_title == title else normalize_title(key_title)
+
+        entries.append(ScannerEntry(len(entries), line, title, match.group(2), match.group(3),
+                                    norm_title, key_title, key_year))
+    return entries
+
+
+def write_compiled(path, lines, entries, signature):
+    """
+    Write the compiled sidecar for a scanner list.
+
+    The sidecar is written to a temporary file and moved into place so a
+    concurrent reader never sees a half-written database.
+
+    Args:
+        path: Path to the scanner list the entries came from
+        lines: Non-empty, stripped lines of the list
+        entries: Parsed entries in file order
+        signature: (mtime_ns, size) of the list the entries were parsed from
+    """
+    sidecar = compiled_path(path)
+    tmp_path = sidecar + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript('''
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE lines (pos INTEGER PRIMARY KEY, line TEXT NOT NULL);
+            CREATE TABLE entries (
+                id INTEGER PRIMARY KEY,
+                line TEXT NOT NULL,
+                title TEXT NOT NULL,
+                year TEXT,
+                tmdb_id TEXT,
+                norm_title TEXT NOT NULL,
+                key_title TEXT NOT NULL,
+                key_year TEXT
+            );
+        ''')
+        conn.executemany('INSERT INTO lines (pos, line) VALUES (?, ?)', enumerate(lines))
+        conn.executemany(
+            'INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            ((e.index, e.line, e.title, e.year, e.tmdb_id, e.norm_title, e.key_title, e.key_year)
+             for e in entries)
+        )
+        # Sorted key for exact title lookups straight from the sidecar
+        conn.execute('CREATE INDEX idx_entries_key ON entries (key_title, key_year)')
+        conn.executemany('INSERT INTO meta (key, value) VALUES (?, ?)', [
+            ('format_version', COMPILED_FORMAT_VERSION),
+            ('normalizer_version', normalizer_version()),
+            ('source_mtime_ns', str(signature[0])),
+            ('source_size', str(signature[1])),
+            ('entry_count', str(len(entries))),
+        ])
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, sidecar)
+
+
+def compile_scanner_list(path):
+    """
+    Parse a scanner list and write its compiled sidecar.
+
+    Args:
+        path: Path to the scanner list
+
+    Returns:
+        Number of entries compiled
+    """
+    st = os.stat(path)
+    signature = (st.st_mtime_ns, st.st_size)
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = [line.strip() for line in f if line.strip()]
+    entries = parse_entries(lines)
+    write_compiled(path, lines, entries, signature)
+    return len(entries)
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_scanner_index(path):
+    """
+    Get the shared index for a scanner list file.
+
+    Args:
+        path: Path to the scanner list, or a bare file name inside scanners/
+
+    Returns:
+        ScannerIndex, refreshed if the file changed
+    """
+    if not os.path.dirname(path):
+        path = os.path.join(SCANNERS_DIR, path)
+    key = os.path.normpath(os.path.abspath(path))
+    index = _indexes.get(key)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.setdefault(key, ScannerIndex(key))
+    return index.refresh()
+
+
+def scanner_lists_signature():
+    """
+    Signature of every scanner list loaded so far, refreshed from disk.
+
+    It changes whenever one of the lists is edited, so values computed from
+    lookups can be cached against it.
+
+    Returns:
+        Tuple of (path, (mtime_ns, size)) pairs
+    """
+    with _indexes_lock:
+        indexes = list(_indexes.values())
+    return tuple((index.path, index.refresh().signature) for index in indexes)
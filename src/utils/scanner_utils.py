@@ -11,6 +11,8 @@ import logging
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 
+from .scanner_index import get_scanner_index
+
 logger = logging.getLogger(__name__)
 
 class ScannerUtils:
@@ -127,14 +129,13 @@ class ScannerUtils:
         try:
             if not os.path.exists(scanner_file):
                 return entries
-                
-            with open(scanner_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                
-            for line in lines:
-                if line.strip():
-                    entry = ScannerUtils.parse_entry(line.strip())
-                    entries.append(entry)
+
+            # Parsed entries are cached on the shared index until the file changes
+            parsed = get_scanner_index(scanner_file).derive(
+                'scanner_utils_entries',
+                lambda index: [ScannerUtils.parse_entry(line) for line in index.lines]
+            )
+            entries = [dict(entry) for entry in parsed]
                     
             return entries
         except Exception as e:
@@ -2,7 +2,10 @@
 
 This module handles sending notifications to Discord webhooks for various events.
 """
+import atexit
 import os
+import queue
+import threading
 import requests
 from datetime import datetime
 from discord_webhook import DiscordWebhook
@@ -10,6 +13,12 @@ from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Seconds to wait at exit for queued notifications to be sent
+NOTIFICATION_DRAIN_TIMEOUT = float(os.environ.get('NOTIFICATION_DRAIN_TIMEOUT', '10'))
+
+_notification_queue = None
+_notification_lock = threading.Lock()
+
 def get_webhook_url(event_type=None):
     """Get the appropriate webhook URL based on event type.
     
@@ -81,6 +90,70 @@ def send_symlink_creation_notification(title, year, poster, description, symlink
         return False
     return True
 
+def _notification_worker(pending):
+    from src.api.tmdb import get_tmdb
+
+    while True:
+        metadata, symlink_path = pending.get()
+        try:
+            try:
+                metadata.complete(get_tmdb())
+            except Exception as e:
+                logger.warning(f"Could not fetch TMDB metadata for {metadata.title}: {e}")
+            send_symlink_creation_notification(
+                metadata.title,
+                metadata.year,
+                metadata.poster,
+                metadata.overview or '',
+                symlink_path,
+                metadata.tmdb_id
+            )
+        except Exception as e:
+            logger.error(f"Failed to send symlink creation webhook: {e}")
+        finally:
+            pending.task_done()
+
+def flush_notifications(timeout=NOTIFICATION_DRAIN_TIMEOUT):
+    """Wait for queued notifications to be sent.
+    
+    Args:
+        timeout (float): Maximum number of seconds to wait
+        
+    Returns:
+        bool: True if the queue is empty, False if the timeout expired
+    """
+    pending = _notification_queue
+    if pending is None:
+        return True
+    with pending.all_tasks_done:
+        return pending.all_tasks_done.wait_for(lambda: not pending.unfinished_tasks, timeout)
+
+def queue_symlink_creation_notification(metadata, symlink_path):
+    """Send a symlink creation notification from a background thread.
+    
+    Missing metadata fields (poster, overview) are looked up on TMDB by the
+    background thread, so the caller never waits on the network.
+    
+    Args:
+        metadata (MediaMetadata): Metadata of the chosen TMDB entry
+        symlink_path (str): Path to the created symlink
+        
+    Returns:
+        bool: True if the notification was queued, False if no webhook is configured
+    """
+    global _notification_queue
+    if not get_webhook_url("SYMLINK_CREATION"):
+        logger.warning("No webhook URL configured for symlink creation")
+        return False
+    with _notification_lock:
+        if _notification_queue is None:
+            _notification_queue = queue.Queue()
+            threading.Thread(target=_notification_worker, args=(_notification_queue,),
+                             name='webhook-notifications', daemon=True).start()
+            atexit.register(flush_notifications)
+    _notification_queue.put((metadata, symlink_path))
+    return True
+
 def send_symlink_deletion_notification(title, year, poster, description, symlink_path):
     """Send a notification for a symlink deletion event.
     
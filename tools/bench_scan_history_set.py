@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark the compact scan history set against a plain Python set.
+
+Builds a temporary scan history database with synthetic paths, then
+compares memory use and lookup speed of a set of full path strings with
+ScanHistorySet.
+
+Usage: python tools/bench_scan_history_set.py [entries]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.scan_history_utils import ScanHistoryStore, ScanHistorySet
+
+
+def make_paths(count):
+    paths = []
+    for i in range(count):
+        show = f"Show Name {i // 200:05d} (20{i % 20:02d})"
+        paths.append(f"/mnt/media/downloads/{show}/Season {i % 10 + 1}/"
+                     f"{show}.S{i % 10 + 1:02d}E{i % 200:03d}.1080p.WEB-DL.x264-GROUP.mkv")
+    return paths
+
+
+def measure(build):
+    tracemalloc.start()
+    start = time.time()
+    obj = build()
+    elapsed = time.time() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, current, elapsed
+
+
+def time_lookups(container, probes):
+    start = time.time()
+    hits = sum(1 for p in probes if p in container)
+    return hits, time.time() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    paths = make_paths(count)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ScanHistoryStore(os.path.join(tmp, 'history.db'), None, batch_size=10000)
+        for path in paths:
+            store.add(path)
+        store.flush()
+
+        plain, plain_mem, plain_time = measure(store.load_paths)
+        compact, compact_mem, compact_time = measure(lambda: ScanHistorySet(store))
+
+        random.seed(1)
+        hits = random.sample(paths, min(10000, count))
+        misses = [p.replace('/downloads/', '/incoming/') for p in hits]
+
+        print(f"Entries: {count}")
+        print(f"{'':<18}{'set':>14}{'ScanHistorySet':>18}")
+        print(f"{'memory (MB)':<18}{plain_mem / 1e6:>14.1f}{compact_mem / 1e6:>18.1f}")
+        print(f"{'build (s)':<18}{plain_time:>14.2f}{compact_time:>18.2f}")
+        for label, probes in (('hits', hits), ('misses', misses)):
+            plain_hits, plain_t = time_lookups(plain, probes)
+            compact_hits, compact_t = time_lookups(compact, probes)
+            assert plain_hits == compact_hits, f"{label}: {plain_hits} != {compact_hits}"
+            print(f"{label + ' (us/op)':<18}{plain_t / len(probes) * 1e6:>14.2f}"
+                  f"{compact_t / len(probes) * 1e6:>18.2f}")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Golden-output check and micro-benchmark for the title cleaning engine.
+
+Checks that cleaning_engine.clean_title gives exactly the same output as
+applying every cleaning pattern with re.sub. It compares against:
+  - the golden file tools/data/cleaning_golden.tsv (folder name -> expected title)
+  - the live reference implementation, over the folder-name corpus plus
+    scanner list titles decorated with common release tags
+and then times both implementations.
+
+Usage:
+    python tools/cleaning_benchmark.py            # check and benchmark
+    python tools/cleaning_benchmark.py --update   # regenerate the golden file
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.utils.cleaning_engine import clean_title
+from src.utils.cleaning_patterns import patterns_to_remove, case_sensitive_patterns
+
+DATA_DIR = os.path.join(ROOT, 'tools', 'data')
+CORPUS_FILE = os.path.join(DATA_DIR, 'folder_names.txt')
+GOLDEN_FILE = os.path.join(DATA_DIR, 'cleaning_golden.tsv')
+
+RELEASE_TAGS = [
+    '1080p', '2160p', '720p', 'WEB-DL', 'WEBRip', 'BluRay', 'REMUX', 'x264', 'x265', 'HEVC',
+    'H.264', 'DDP5.1', 'AAC2.0', 'Atmos', 'DV', 'HDR', '10bit', 'AMZN', 'NF', 'DSNP', 'MULTi',
+    'GERMAN', 'FRENCH', 'ITA', 'Eng', 'Lektor PL', 'Dual Audio', 'ESubs', 'S01', 'S02E05',
+    'Season 1-3', 'Complete', 'Extended', 'Part 2', 'CD1', '-FLUX', '-NTb', '-RARBG', '[YTS.MX]',
+    '(2019)', '2021', '12GB',
+]
+
+
+def reference_clean(title):
+    """The original implementation: one re.sub per pattern."""
+    for pattern in patterns_to_remove:
+        title = re.sub(pattern, ' ', title, flags=re.IGNORECASE)
+    for pattern in case_sensitive_patterns:
+        title = re.sub(pattern, ' ', title)
+    title = re.sub(r'\s+', ' ', title).strip()
+    return title
+
+
+def load_corpus():
+    with open(CORPUS_FILE, 'r', encoding='utf-8') as f:
+        return [line.rstrip('\n') for line in f if line.strip()]
+
+
+def synthetic_corpus(count=3000):
+    """Scanner titles decorated with random release tags and separators."""
+    random.seed(7)
+    titles = []
+    scanners_dir = os.path.join(ROOT, 'scanners')
+    for name in sorted(os.listdir(scanners_dir)):
+        if name.endswith('.txt'):
+            with open(os.path.join(scanners_dir, name), 'r', encoding='utf-8') as f:
+                titles.extend(re.sub(r'\s*\{tmdb-\d+\}.*', '', line.strip()) for line in f if line.strip())
+    names = []
+    for title in random.sample(titles, min(count, len(titles))):
+        tags = random.sample(RELEASE_TAGS, random.randint(1, 6))
+        separator = random.choice(['.', ' ', '_'])
+        names.append(separator.join([title.replace(' ', separator)] + tags))
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--update', action='store_true', help='Regenerate the golden file')
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    if args.update:
+        with open(GOLDEN_FILE, 'w', encoding='utf-8') as f:
+            for name in corpus:
+                f.write(f"{name}\t{reference_clean(name)}\n")
+        print(f"Wrote {len(corpus)} golden entries to {GOLDEN_FILE}")
+        return 0
+
+    failures = 0
+    with open(GOLDEN_FILE, 'r', encoding='utf-8') as f:
+        golden = [line.rstrip('\n').split('\t') for line in f if line.strip()]
+    for name, expected in golden:
+        actual = clean_title(name)
+        if actual != expected:
+            failures += 1
+            print(f"GOLDEN MISMATCH {name!r}: expected {expected!r}, got {actual!r}")
+    print(f"Golden file: {len(golden) - failures}/{len(golden)} identical")
+
+    names = corpus + synthetic_corpus()
+    reference_failures = 0
+    for name in names:
+        expected = reference_clean(name)
+        actual = clean_title(name)
+        if actual != expected:
+            reference_failures += 1
+            print(f"REFERENCE MISMATCH {name!r}: expected {expected!r}, got {actual!r}")
+    print(f"Reference: {len(names) - reference_failures}/{len(names)} identical")
+    failures += reference_failures
+
+    for label, func in (('re.sub per pattern', reference_clean), ('cleaning engine', clean_title)):
+        start = time.perf_counter()
+        for name in names:
+            func(name)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<20} {elapsed / len(names) * 1e6:9.1f} us/title")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Golden-output check for the release name parser.
+
+Parses every name in tools/data/release_golden.tsv with parse_release and
+compares the title, year, season, episodes, resolution, remux flag and
+release group with the recorded values. The golden file holds the folder
+name corpus (tools/data/folder_names.txt) plus edge cases that once parsed
+wrongly, e.g. possessives read as a season ("Ocean's 8") and file sizes read
+as absolute episode numbers ("Show - 1.2GB").
+
+Usage:
+    python tools/release_parser_check.py            # check
+    python tools/release_parser_check.py --update   # regenerate the golden file
+"""
+
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.extractors.release_parser import parse_release
+
+DATA_DIR = os.path.join(ROOT, 'tools', 'data')
+CORPUS_FILE = os.path.join(DATA_DIR, 'folder_names.txt')
+GOLDEN_FILE = os.path.join(DATA_DIR, 'release_golden.tsv')
+
+# Names that exercise the token boundaries, kept in the golden file on --update
+EDGE_CASES = [
+    "Ocean's 8 (2018) 1080p",
+    "Ocean's.8.2018.1080p.BluRay.x264-SPARKS",
+    "Grey's Anatomy Season 2",
+    "Grey's.Anatomy.S03E04.720p.HDTV.x264",
+    "[SubsPlease] Show - 1.2GB",
+    "Show - 1.2GB",
+    "[SubsPlease] Show - 24 (1080p)",
+    "Show.S01E01-E03.1080p.WEB-DL",
+    "Show.1x05.HDTV",
+    "Blade.Runner.2049.2017.2160p.UHD.BluRay.REMUX-FGT",
+    "2012.2009.1080p.BluRay",
+]
+
+
+def fields(parsed):
+    """Golden file columns of a ParsedRelease."""
+    return [
+        parsed.title,
+        parsed.year or '',
+        '' if parsed.season is None else str(parsed.season),
+        ','.join(str(e) for e in parsed.episodes),
+        parsed.resolution or '',
+        'remux' if parsed.remux else '',
+        parsed.group or '',
+    ]
+
+
+def load_corpus():
+    with open(CORPUS_FILE, 'r', encoding='utf-8') as f:
+        names = [line.rstrip('\n') for line in f if line.strip()]
+    return names + [name for name in EDGE_CASES if name not in names]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--update', action='store_true', help='Regenerate the golden file')
+    args = parser.parse_args()
+
+    if args.update:
+        corpus = load_corpus()
+        with open(GOLDEN_FILE, 'w', encoding='utf-8') as f:
+            for name in corpus:
+                f.write('\t'.join([name] + fields(parse_release(name))) + '\n')
+        print(f"Wrote {len(corpus)} golden entries to {GOLDEN_FILE}")
+        return 0
+
+    failures = 0
+    with open(GOLDEN_FILE, 'r', encoding='utf-8') as f:
+        golden = [line.rstrip('\n').split('\t') for line in f if line.strip()]
+    for name, *expected in golden:
+        actual = fields(parse_release(name))
+        if actual != expected:
+            failures += 1
+            print(f"GOLDEN MISMATCH {name!r}: expected {expected!r}, got {actual!r}")
+    print(f"Golden file: {len(golden) - failures}/{len(golden)} identical")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
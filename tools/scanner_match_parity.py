@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Parity check for indexed scanner matching.
+
+Runs find_scanner_matches (token-indexed candidates over the shared
+ScannerIndex) against a verbatim copy of the find_scanner_matches loop
+from before the index existed: it reads the raw list lines, applies the
+line regex, normalizes every line with the original normalize_title and
+scores it with the 100/90/80/70/50 tiers. Any difference in the returned
+match is reported, along with the time taken by each.
+
+The baseline normalizes every line of the list for every query, so each
+query takes about a second on a large list. Queries are therefore drawn
+from a small random sample of titles per list; raise --titles and
+--max-queries for a longer run.
+
+Usage:
+    python tools/scanner_match_parity.py [--titles 4] [--max-queries 24] [--seed 42]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+import unicodedata
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.scan_logic import SCANNER_FILES, SCANNERS_DIR, find_scanner_matches
+from src.utils.scanner_index import get_scanner_index
+
+
+# --- Baseline implementation, copied verbatim (apart from the scanners path) ---
+
+def _split_words(text):
+    return set(re.findall(r'\w+', text.lower()))
+
+def partial_scanner_match(search_term, scanner_title, min_overlap=1):
+    search_words = _split_words(search_term)
+    scanner_words = _split_words(scanner_title)
+    overlap = search_words & scanner_words
+    return len(overlap) >= min_overlap
+
+def normalize_unicode(text):
+    """Normalize unicode characters to closest ASCII equivalent."""
+    if not isinstance(text, str):
+        return text
+    return unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode('ASCII')
+
+def normalize_title(title):
+    # Remove apostrophes entirely (don't replace with space)
+    title = re.sub(r"[’']", '', title)
+    # Replace dots, underscores, and dashes with space
+    title = re.sub(r'[._\-]+', ' ', title)
+    # Remove all other punctuation except spaces and &
+    title = re.sub(r'[^\w\s&]', '', title)
+    # Normalize unicode (remove accents), lowercase, and strip
+    title = normalize_unicode(title)
+    title = title.lower().strip()
+    # Collapse whitespace
+    title = re.sub(r'\s+', ' ', title)
+    # DO NOT remove all spaces!
+    return title
+
+def baseline_find_scanner_matches(search_term, content_type, year=None, threshold=0.75):
+    """
+    Return a list of scanner matches that closely match the search_term and year.
+    Uses normalization and a weighted scoring system.
+    """
+    scanner_file = SCANNER_FILES.get(content_type, "movies.txt")
+    scanner_path = os.path.join(SCANNERS_DIR, scanner_file)
+    matches = []
+
+    if not os.path.exists(scanner_path):
+        return matches
+
+    norm_search = normalize_title(search_term)
+    best_score = 0
+    best_match = None
+
+    # Helper to get word set without "&"
+    def words_wo_and(text):
+        return set(w for w in text.split() if w != "&")
+
+    with open(scanner_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            # Extract title, year, and TMDB ID
+            match = re.match(r'^(.+?)(?:\s+\((\d{4})\))?(?:\s+\{tmdb-(\d+)\})?$', line)
+            if not match:
+                continue
+            scan_title = match.group(1).strip()
+            scan_year = match.group(2)
+            scan_tmdb = match.group(3)
+            norm_scan = normalize_title(scan_title)
+
+            score = 0
+            # Exact title and year match
+            if norm_search == norm_scan and (not year or (scan_year and str(year) == scan_year)):
+                score = 100
+            # Exact title match, year mismatch or missing
+            elif norm_search == norm_scan:
+                # For TV Series or Anime Series, ignore year mismatch
+                if content_type in ("TV Series", "Anime Series"):
+                    score = 100
+                elif not year or (scan_year and str(year) == scan_year):
+                    score = 100
+                else:
+                    score = 90
+            # Partial match (all words in search are in scanner title, ignoring "&")
+            elif words_wo_and(norm_search) == words_wo_and(norm_scan):
+                score = 80
+            # Partial match (all words in search are in scanner title)
+            elif set(norm_search.split()).issubset(set(norm_scan.split())):
+                score = 70
+            # Fuzzy/partial overlap
+            elif partial_scanner_match(norm_search, norm_scan, min_overlap=2):
+                score = 50
+
+            if score > best_score:
+                best_score = score
+                best_match = {
+                    "line": line,
+                    "title": scan_title,
+                    "year": scan_year,
+                    "tmdb_id": scan_tmdb,
+                    "score": score
+                }
+
+    if best_match:
+        matches.append(best_match)
+    return matches
+
+# --- End of baseline implementation ---
+
+
+EDGE_CASES = ['', '&', '& &', 'the', 'a b', 'The Office', 'Star Trek', '...']
+YEARS = (None, '2005', '2020')
+
+
+def build_queries(index, rng, titles, max_queries):
+    """Exact titles, partial titles, shuffled words and edge cases, as (query, year) pairs."""
+    sample = rng.sample(index.entries, min(titles, len(index.entries)))
+    queries = []
+    for entry in sample:
+        words = entry.title.split()
+        queries.append(entry.title)
+        if len(words) > 1:
+            queries.append(' '.join(words[:-1]))
+            queries.append(' '.join(reversed(words)))
+            queries.append(f"{words[0]} & {words[-1]}")
+        queries.append(re.sub(r'\s+', '.', entry.title) + '.extra')
+    runs = [(query, year) for query in queries + EDGE_CASES for year in YEARS]
+    if len(runs) > max_queries:
+        runs = rng.sample(runs, max_queries)
+    return runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare indexed scanner matching with the baseline loop")
+    parser.add_argument('--titles', type=int, default=4, help="scanner titles sampled per list")
+    parser.add_argument('--max-queries', type=int, default=24, help="(query, year) runs per list")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    failures = 0
+    total = 0
+    for content_type, file_name in SCANNER_FILES.items():
+        path = os.path.join(SCANNERS_DIR, file_name)
+        if not os.path.exists(path):
+            continue
+        index = get_scanner_index(path)
+        if not index.entries:
+            continue
+        runs = build_queries(index, rng, args.titles, args.max_queries)
+        find_scanner_matches('warm up', content_type)
+        baseline_time = indexed_time = 0.0
+        for query, year in runs:
+            start = time.time()
+            expected = baseline_find_scanner_matches(query, content_type, year)
+            baseline_time += time.time() - start
+            start = time.time()
+            actual = find_scanner_matches(query, content_type, year)
+            indexed_time += time.time() - start
+            total += 1
+            if expected != actual:
+                failures += 1
+                print(f"MISMATCH [{content_type}] {query!r} year={year}: {expected} != {actual}")
+        print(f"{content_type:<14} {len(runs):>5} queries  baseline {baseline_time / len(runs) * 1000:8.2f} ms/query"
+              f"  indexed {indexed_time / len(runs) * 1000:8.2f} ms/query")
+
+    print(f"\n{total - failures}/{total} queries identical")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Check the async TMDB client against a local fake TMDB server.
+
+Starts a small HTTP server that answers search and detail requests like
+TMDB does (with an artificial delay, and a 429 + Retry-After on the first
+request), then verifies that:
+  - search_batch/details_batch return results in input order
+  - the client's token bucket keeps the request rate at or below the limit,
+    for the async batches and for plain threads using the sync client alike
+  - the 429 is retried after Retry-After
+  - a second identical batch is answered from the cache
+  - identical requests made at the same time from several threads are
+    sent once (single-flight coalescing)
+  - get_full_tv() fetches details, external IDs and seasons in one request
+    and answers the individual endpoints from the cache afterwards, and
+    fill_tmdb_details() names every episode of a season from that request
+and compares the batch time with sequential lookups.
+
+Usage:
+    python tools/tmdb_async_check.py [--count 200] [--rate 40] [--burst 10] [--concurrency 8] [--delay 0.05]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.api.tmdb import TMDB, RateLimiter, fill_tmdb_details
+from src.api.tmdb_async import AsyncTMDB
+from src.api.tmdb_cache import TMDBCache
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    """http.server.ThreadingHTTPServer, which needs Python 3.7."""
+
+    daemon_threads = True
+
+
+class FakeTMDBHandler(BaseHTTPRequestHandler):
+    """Answers /3/search/{movie,tv}, /3/{movie,tv}/{id} (with append_to_response) and its sub-resources."""
+
+    delay = 0.0
+    lock = threading.Lock()
+    request_times = []
+    throttle_next = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        parts = url.path.strip('/').split('/')
+        with FakeTMDBHandler.lock:
+            FakeTMDBHandler.request_times.append(time.monotonic())
+            throttle = FakeTMDBHandler.throttle_next
+            FakeTMDBHandler.throttle_next = False
+        if throttle:
+            self._send(429, {'status_code': 25}, {'Retry-After': '1'})
+            return
+        time.sleep(self.delay)
+
+        if parts[:2] == ['3', 'search'] and len(parts) == 3:
+            query = params.get('query', [''])[0]
+            key = 'name' if parts[2] == 'tv' else 'title'
+            self._send(200, {'page': 1, 'results': [{'id': abs(hash(query)) % 10**6, key: query}],
+                             'total_results': 1, 'total_pages': 1})
+        elif len(parts) == 3 and parts[1] in ('movie', 'tv') and parts[2].isdigit():
+            payload = {'id': int(parts[2]), 'media_type': parts[1]}
+            appended = params.get('append_to_response', [''])[0]
+            for item in filter(None, appended.split(',')):
+                payload[item] = self._sub_resource(int(parts[2]), item)
+            self._send(200, payload)
+        elif len(parts) > 3 and parts[1] in ('movie', 'tv') and parts[2].isdigit():
+            self._send(200, self._sub_resource(int(parts[2]), '/'.join(parts[3:])))
+        else:
+            self._send(404, {'status_code': 34})
+
+
+    @staticmethod
+    def _sub_resource(tmdb_id, item):
+        if item == 'external_ids':
+            return {'id': tmdb_id, 'imdb_id': f'tt{tmdb_id:07d}', 'tvdb_id': tmdb_id + 1000}
+        season = int(item.split('/')[1])
+        return {'season_number': season, 'episodes': [{'episode_number': 1, 'name': f'Episode {season}x01'}]}
+
+
+def max_rate(times, window=1.0):
+    """Largest number of requests seen in any window of `window` seconds."""
+    best = 0
+    start = 0
+    for end in range(len(times)):
+        while times[end] - times[start] > window:
+            start += 1
+        best = max(best, end - start + 1)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--count', type=int, default=200, help='Number of queries per batch')
+    parser.add_argument('--rate', type=float, default=40, help='Token bucket rate (requests/second)')
+    parser.add_argument('--burst', type=int, default=10, help='Token bucket capacity')
+    parser.add_argument('--concurrency', type=int, default=8, help='Maximum requests in flight')
+    parser.add_argument('--delay', type=float, default=0.05, help='Fake server latency in seconds')
+    args = parser.parse_args()
+
+    FakeTMDBHandler.delay = args.delay
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeTMDBHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        client = TMDB(api_key='test', cache=TMDBCache(os.path.join(tmp, 'cache.db')),
+                      limiter=RateLimiter(args.rate, args.burst))
+        client.base_url = f"http://127.0.0.1:{server.server_address[1]}/3"
+        queries = [(f"Movie {i}", str(1990 + i % 30)) for i in range(args.count)]
+
+        async def run():
+            async with AsyncTMDB(client, concurrency=args.concurrency) as async_client:
+                start = time.perf_counter()
+                results = await async_client.search_batch(queries)
+                elapsed = time.perf_counter() - start
+                details = await async_client.details_batch(list(range(1, 21)), media_type='tv')
+                start = time.perf_counter()
+                cached = await async_client.search_batch(queries)
+                cached_elapsed = time.perf_counter() - start
+            return results, elapsed, details, cached, cached_elapsed
+
+        # A private loop rather than asyncio.run(), which needs Python 3.7
+        loop = asyncio.new_event_loop()
+        try:
+            results, elapsed, details, cached, cached_elapsed = loop.run_until_complete(run())
+        finally:
+            loop.close()
+        network_requests = len(FakeTMDBHandler.request_times)
+
+        for (query, _), result in zip(queries, results):
+            if not result or result[0].get('title') != query:
+                failures += 1
+                print(f"ORDER MISMATCH for {query!r}: {result!r}")
+        if [d.get('id') for d in details] != list(range(1, 21)):
+            failures += 1
+            print("Details batch returned results out of order")
+        if cached != results:
+            failures += 1
+            print("Cached batch differs from the first batch")
+
+        observed = max_rate(sorted(FakeTMDBHandler.request_times[1:]))
+        # The bucket starts full, so one window may see up to burst + rate requests
+        if observed > args.rate + args.burst + 1:
+            failures += 1
+            print(f"Rate limit exceeded: {observed} requests in one second")
+
+        # Identical concurrent requests share one upstream call
+        before = len(FakeTMDBHandler.request_times)
+        threads = [threading.Thread(target=client.search_tv, args=('Coalesced Show',)) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        coalesced_requests = len(FakeTMDBHandler.request_times) - before
+        if coalesced_requests != 1:
+            failures += 1
+            print(f"Coalescing failed: {coalesced_requests} upstream requests for 10 identical calls")
+
+        # One append_to_response request fills the cache for each sub-resource
+        before = len(FakeTMDBHandler.request_times)
+        full = client.get_full_tv(77, seasons=[1, 2])
+        parts = (client.get_tv_details(77), client.get_tv_external_ids(77), client.get_tv_season(77, 2))
+        again = client.get_full_tv(77, seasons=[2])
+        full_requests = len(FakeTMDBHandler.request_times) - before
+        if full_requests != 1:
+            failures += 1
+            print(f"Full TV lookup took {full_requests} upstream requests instead of 1")
+        if (full.get('external_ids', {}).get('tvdb_id') != 1077 or parts[1] != full['external_ids']
+                or parts[2] != full.get('season/2') or 'season/1' in parts[0] or again.get('season/2') != parts[2]):
+            failures += 1
+            print("Full TV lookup and sub-resource cache entries disagree")
+
+        # Link names get the TVDb ID and episode title from one request per show season
+        os.environ['TVDB_FOLDER_ID'] = 'true'
+        before = len(FakeTMDBHandler.request_times)
+        episodes = [fill_tmdb_details({'tmdb_id': 88, 'season': 3, 'episode': 1}, 'tv', client=client)
+                    for _ in range(3)]
+        detail_requests = len(FakeTMDBHandler.request_times) - before
+        if detail_requests != 1 or any(e.get('tvdb_id') != 1088 or e.get('episode_title') != 'Episode 3x01'
+                                       for e in episodes):
+            failures += 1
+            print(f"Link name details took {detail_requests} upstream requests: {episodes[0]}")
+
+        # Threads using the sync client share the same token bucket
+        before = len(FakeTMDBHandler.request_times)
+        threads = [threading.Thread(target=client.search_movie, args=(f"Threaded {i}",))
+                   for i in range(int(args.rate * 2))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        threaded_peak = max_rate(sorted(FakeTMDBHandler.request_times[before:]))
+        if threaded_peak > args.rate + args.burst + 1:
+            failures += 1
+            print(f"Rate limit exceeded by threads: {threaded_peak} requests in one second")
+
+        # Sequential baseline over fresh queries (cache misses)
+        sample = [(f"Sequential {i}", None) for i in range(min(args.count, 40))]
+        start = time.perf_counter()
+        for query, year in sample:
+            client.search_movie(query, year=year)
+        sequential = (time.perf_counter() - start) / len(sample) * args.count
+
+    server.shutdown()
+    print(f"Batch of {args.count}: {elapsed:.2f}s (sequential estimate {sequential:.2f}s), "
+          f"cached rerun {cached_elapsed:.3f}s")
+    print(f"Network requests: {network_requests} (including one 429), peak {observed} req/s, "
+          f"threaded peak {threaded_peak} req/s")
+    print(f"Client stats: {client.stats()}")
+    print("OK" if not failures else f"{failures} FAILURES")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())